@@ -5,14 +5,15 @@ import sys
 import typing
 
 if typing.TYPE_CHECKING:
-    if sys.version_info < (3, 10):
-        from importlib.metadata import EntryPoint
+    from collections.abc import Iterable
+    from importlib.metadata import EntryPoint
 
+    if sys.version_info < (3, 10):
         EntryPoints = typing.List[EntryPoint]
     else:
         from importlib.metadata import EntryPoints
 
-__all__ = ["entry_points"]
+__all__ = ["entry_points", "entry_points_by_group"]
 
 
 def entry_points(*, group: str) -> EntryPoints:
@@ -23,5 +24,18 @@ def entry_points(*, group: str) -> EntryPoints:
     return epg.get(group, [])  # pylint: disable=no-member
 
 
+def entry_points_by_group(groups: Iterable[str]) -> dict[str, list[EntryPoint]]:
+    """
+    Get the entry points of several groups, reading the installed
+    distributions only once.
+    """
+    if sys.version_info >= (3, 10):
+        eps = importlib.metadata.entry_points()
+        return {group: list(eps.select(group=group)) for group in groups}
+
+    epg = importlib.metadata.entry_points()
+    return {group: list(epg.get(group, [])) for group in groups}  # pylint: disable=no-member
+
+
 def __dir__() -> list[str]:
     return __all__
@@ -1,32 +1,136 @@
 from __future__ import annotations
 
+import contextlib
 import dataclasses
 import os
+import shutil
 import stat
 import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
 from typing import TYPE_CHECKING, ClassVar
 
-from ._logging import logger
+from ._logging import logger, rich_print
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Generator, Iterable
 
-__all__ = ["Run"]
+if sys.platform != "win32":
+    import resource
+
+__all__ = ["ProcessStats", "ResourceLog", "Run"]
 
 
 def __dir__() -> list[str]:
     return __all__
 
 
+def _maxrss_bytes(maxrss: int) -> int:
+    # Bytes on macOS, kilobytes elsewhere
+    return maxrss if sys.platform.startswith("darwin") else maxrss * 1024
+
+
+def _children_usage() -> resource.struct_rusage | None:
+    if sys.platform == "win32":
+        return None
+    return resource.getrusage(resource.RUSAGE_CHILDREN)
+
+
+def _format_bytes(size: int | None) -> str:
+    if size is None:
+        return "-"
+    return f"{size / 2**20:.0f} MiB"
+
+
+@dataclasses.dataclass(frozen=True)
+class ProcessStats:
+    """
+    The cost of one external command. The CPU times and peak RSS cover the
+    command and everything it runs. They are None if they are not available
+    (Windows), or if other commands were running at the same time. The peak
+    RSS is also None if it was below the peak of an earlier command, since
+    the operating system only reports the largest child so far. On Linux, it
+    is never below the size of the Python process that started the command.
+    """
+
+    command: str
+    phase: str
+    wall: float
+    user: float | None
+    sys: float | None
+    peak_rss: int | None
+
+
+@dataclasses.dataclass
+class ResourceLog:
+    """
+    Collects the cost of the external commands, and the peak memory use of
+    the Python process at the end of each phase of the build.
+    """
+
+    processes: list[ProcessStats] = dataclasses.field(default_factory=list)
+    python_peak_rss: dict[str, int] = dataclasses.field(default_factory=dict)
+    phase: str = ""
+
+    @contextlib.contextmanager
+    def track_phase(self, phase: str) -> Generator[None, None, None]:
+        """
+        Attribute the commands run inside the block to ``phase``.
+        """
+        self.phase = phase
+        try:
+            yield
+        finally:
+            self.phase = ""
+            if sys.platform != "win32":
+                maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                self.python_peak_rss[phase] = _maxrss_bytes(maxrss)
+
+    def print_summary(self) -> None:
+        if not self.processes:
+            return
+        rich_print("{green}***", "{bold}Resource usage:")
+        rich_print("      wall      user       sys   peak RSS  command")
+        for stats in self.processes:
+            cpu = [
+                f"{t:8.2f}s" if t is not None else f"{'-':>9}"
+                for t in (stats.user, stats.sys)
+            ]
+            phase = f" ({stats.phase})" if stats.phase else ""
+            rich_print(
+                f"  {stats.wall:8.2f}s {cpu[0]} {cpu[1]} "
+                f"{_format_bytes(stats.peak_rss):>10}  {{command}}{phase}",
+                command=stats.command,
+            )
+        if self.python_peak_rss:
+            phases = ", ".join(
+                f"{phase} {_format_bytes(rss)}"
+                for phase, rss in self.python_peak_rss.items()
+            )
+            rich_print(f"  Python peak RSS after: {phases}")
+
+
 @dataclasses.dataclass
 class Run:
     env: dict[str, str] | None = None
     cwd: os.PathLike[str] | None = None
     timeout: None | float = None
+    pass_fds: tuple[int, ...] = ()
 
     # Stores last printout, for cleaner debug logging
     _prev_env: ClassVar[dict[str, str]] = {}
 
+    # The cost of the commands run so far
+    resource_log: ClassVar[ResourceLog] = ResourceLog()
+
+    # Tracks commands running at the same time (from threads), since their
+    # CPU times can't be told apart
+    _lock: ClassVar[threading.Lock] = threading.Lock()
+    _active: ClassVar[int] = 0
+    _started: ClassVar[int] = 0
+
     def live(self, *args: str | os.PathLike[str]) -> None:
         """
         Runs code and prints the results live.
@@ -67,15 +171,59 @@ class Run:
 
         logger.info("RUN: {}", " ".join(options))
 
-        return subprocess.run(
-            options,
-            text=True,
-            check=True,
-            capture_output=capture,
-            env=self.env,
-            cwd=self.cwd,
-            timeout=self.timeout,
+        cls = type(self)
+        with cls._lock:
+            shared = cls._active > 0
+            cls._active += 1
+            cls._started += 1
+            started = cls._started
+        before = _children_usage()
+        start = time.perf_counter()
+        try:
+            return subprocess.run(
+                options,
+                text=True,
+                check=True,
+                capture_output=capture,
+                env=self.env,
+                cwd=self.cwd,
+                timeout=self.timeout,
+                pass_fds=self.pass_fds,
+            )
+        finally:
+            wall = time.perf_counter() - start
+            with cls._lock:
+                cls._active -= 1
+                shared = shared or cls._started != started
+            self._record(options, wall, before, shared=shared)
+
+    def _record(
+        self,
+        options: list[str],
+        wall: float,
+        before: resource.struct_rusage | None,
+        *,
+        shared: bool,
+    ) -> None:
+        user = sys_time = peak_rss = None
+        after = _children_usage()
+        if before is not None and after is not None and not shared:
+            user = after.ru_utime - before.ru_utime
+            sys_time = after.ru_stime - before.ru_stime
+            if after.ru_maxrss > before.ru_maxrss:
+                peak_rss = _maxrss_bytes(after.ru_maxrss)
+
+        command = " ".join([Path(options[0]).name, *options[1:2]])
+        stats = ProcessStats(
+            command=command,
+            phase=self.resource_log.phase,
+            wall=wall,
+            user=user,
+            sys=sys_time,
+            peak_rss=peak_rss,
         )
+        self.resource_log.processes.append(stats)
+        logger.info("RUN STATS: {stats.command} took {stats.wall:.2f}s", stats=stats)
 
     def _key_diff(self, k: str) -> str:
         assert self.env
@@ -98,3 +246,53 @@ def _fix_all_permissions(directory: str) -> None:
             mode = stat.S_IMODE(entry.stat().st_mode)
             if not mode & stat.S_IWRITE:
                 os.chmod(entry.path, mode | stat.S_IWRITE)  # noqa: PTH101
+
+
+def _is_linked(path: Path) -> bool:
+    """
+    True if the file is a symlink or has other hard links, so writing to it
+    would also change another file (like with ``install.mode``).
+    """
+    return path.is_symlink() or (path.is_file() and path.stat().st_nlink > 1)
+
+
+def _unlink_if_linked(path: Path) -> None:
+    """
+    Remove a linked file, so it can be replaced without changing the file it
+    is linked to.
+    """
+    if _is_linked(path):
+        path.unlink()
+
+
+def _hardlink_symlinks(directory: Path) -> None:
+    """
+    Replace all symlinks to files in a directory (recursively) with hard
+    links, or copies if a hard link can't be made (like across filesystems).
+    """
+    for dirpath, _, filenames in os.walk(directory):
+        for filename in filenames:
+            path = Path(dirpath, filename)
+            if not path.is_symlink() or not path.is_file():
+                continue
+            target = path.resolve()
+            tmp_path = path.with_name(f".{path.name}.skbuild-link")
+            try:
+                os.link(target, tmp_path)
+            except OSError:
+                shutil.copy2(target, tmp_path)
+            tmp_path.replace(path)
+
+
+def _write_if_changed(path: Path, contents: str) -> bool:
+    """
+    Write a text file only if its contents changed, so the modification time
+    of an unchanged file is kept and nothing depending on it is rebuilt.
+    Returns True if the file was written.
+    """
+    with contextlib.suppress(OSError, UnicodeDecodeError):
+        if path.read_text(encoding="utf-8") == contents:
+            return False
+    _unlink_if_linked(path)
+    path.write_text(contents, encoding="utf-8")
+    return True
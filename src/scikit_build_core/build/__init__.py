@@ -25,6 +25,14 @@ def build_wheel(
     config_settings: dict[str, list[str] | str] | None = None,
     metadata_directory: str | None = None,
 ) -> str:
+    from ..server import delegate
+
+    result: str | None = delegate(
+        "build_wheel", wheel_directory, config_settings, metadata_directory
+    )
+    if result is not None:
+        return result
+
     from .._logging import rich_print
     from ..errors import FailedLiveProcessError
     from .wheel import _build_wheel_impl
@@ -49,6 +57,14 @@ def build_editable(
     config_settings: dict[str, list[str] | str] | None = None,
     metadata_directory: str | None = None,
 ) -> str:
+    from ..server import delegate
+
+    result: str | None = delegate(
+        "build_editable", wheel_directory, config_settings, metadata_directory
+    )
+    if result is not None:
+        return result
+
     from .._logging import rich_print
     from ..errors import FailedLiveProcessError
     from .wheel import _build_wheel_impl
@@ -91,6 +107,14 @@ if _has_safe_metadata():
         config_settings: dict[str, list[str] | str] | None = None,
     ) -> str:
         """Prepare metadata for building a wheel. Does not build the wheel. Returns the dist-info directory."""
+        from ..server import delegate
+
+        result: str | None = delegate(
+            "prepare_metadata_for_build_wheel", metadata_directory, config_settings
+        )
+        if result is not None:
+            return result
+
         from .wheel import _build_wheel_impl
 
         return _build_wheel_impl(
@@ -103,6 +127,14 @@ if _has_safe_metadata():
     ) -> str:
         """Prepare metadata for building a wheel. Does not build the wheel. Returns the dist-info directory."""
 
+        from ..server import delegate
+
+        result: str | None = delegate(
+            "prepare_metadata_for_build_editable", metadata_directory, config_settings
+        )
+        if result is not None:
+            return result
+
         from .wheel import _build_wheel_impl
 
         return _build_wheel_impl(
@@ -119,6 +151,12 @@ def build_sdist(
     sdist_directory: str,
     config_settings: dict[str, list[str] | str] | None = None,
 ) -> str:
+    from ..server import delegate
+
+    result: str | None = delegate("build_sdist", sdist_directory, config_settings)
+    if result is not None:
+        return result
+
     from .._logging import rich_print
     from ..errors import FailedLiveProcessError
     from .sdist import build_sdist as skbuild_build_sdist
@@ -136,6 +174,12 @@ def build_sdist(
 def get_requires_for_build_sdist(
     config_settings: dict[str, str | list[str]] | None = None,
 ) -> list[str]:
+    from ..server import delegate
+
+    result: list[str] | None = delegate("get_requires_for_build_sdist", config_settings)
+    if result is not None:
+        return result
+
     from ..builder.get_requires import GetRequires
 
     requires = GetRequires.from_config_settings(config_settings)
@@ -154,6 +198,12 @@ def get_requires_for_build_sdist(
 def get_requires_for_build_wheel(
     config_settings: dict[str, str | list[str]] | None = None,
 ) -> list[str]:
+    from ..server import delegate
+
+    result: list[str] | None = delegate("get_requires_for_build_wheel", config_settings)
+    if result is not None:
+        return result
+
     from ..builder.get_requires import GetRequires
 
     requires = GetRequires.from_config_settings(config_settings)
@@ -172,6 +222,14 @@ def get_requires_for_build_wheel(
 def get_requires_for_build_editable(
     config_settings: dict[str, str | list[str]] | None = None,
 ) -> list[str]:
+    from ..server import delegate
+
+    result: list[str] | None = delegate(
+        "get_requires_for_build_editable", config_settings
+    )
+    if result is not None:
+        return result
+
     from ..builder.get_requires import GetRequires
 
     requires = GetRequires.from_config_settings(config_settings)
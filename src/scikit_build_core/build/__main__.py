@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+__all__ = ["main"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+def _parse_config_settings(items: Sequence[str]) -> dict[str, list[str] | str]:
+    """
+    Parse ``KEY=VALUE`` config settings like pip and build do: a repeated key
+    becomes a list.
+    """
+    config_settings: dict[str, list[str] | str] = {}
+    for item in items:
+        key, _, value = item.partition("=")
+        if key in config_settings:
+            previous = config_settings[key]
+            config_settings[key] = [
+                *(previous if isinstance(previous, list) else [previous]),
+                value,
+            ]
+        else:
+            config_settings[key] = value
+    return config_settings
+
+
+def _format_size(size: float) -> str:
+    for unit in ("B", "K", "M", "G"):
+        if size < 1024:
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}T"
+
+
+def _cache_command(args: argparse.Namespace) -> None:
+    from .._logging import rich_print
+    from ..builder.build_cache import (
+        get_artifact_root,
+        get_cache_root,
+        list_entries,
+        prune,
+        verify_entry,
+    )
+    from ..builder.parallel import parse_size
+
+    root = get_artifact_root(args.root) if args.artifacts else get_cache_root(args.root)
+    kind = "artifact cache" if args.artifacts else "build cache"
+
+    if args.cache_command == "list":
+        rich_print("{bold}{kind}:{normal} {root}", kind=kind.capitalize(), root=root)
+        total = 0
+        for entry in list_entries(root):
+            size = entry.size()
+            total += size
+            details = (
+                [entry.info.get("fingerprint", "?")[:16]]
+                if args.artifacts
+                else [
+                    entry.info.get("wheel_tag", "?"),
+                    entry.info.get("build_type", "?"),
+                ]
+            )
+            rich_print(
+                "{green}{size:>7}{default} {last_used:%Y-%m-%d %H:%M} "
+                "{bold}{name}{normal} {details} {state} {blue}{path}",
+                size=_format_size(size),
+                last_used=dt.datetime.fromtimestamp(entry.last_used),
+                name=entry.info.get("name", "?"),
+                details=" ".join(details),
+                state=entry.info.get("state", "?"),
+                path=entry.path,
+            )
+        rich_print("{bold}Total:{normal} {total}", total=_format_size(total))
+    elif args.cache_command == "prune":
+        removed = prune(root, parse_size(args.max_size))
+        rich_print("{bold}Removed {n} {kind} entries", n=len(removed), kind=kind)
+    elif args.cache_command == "verify":
+        damaged = 0
+        for entry in list_entries(root):
+            if "files" not in entry.info:
+                continue
+            problems = verify_entry(entry)
+            if problems:
+                damaged += 1
+                rich_print(
+                    "{red}Damaged:{default} {path} {problems}",
+                    path=entry.path,
+                    problems=", ".join(problems),
+                )
+        rich_print("{bold}{n} damaged {kind} entries", n=damaged, kind=kind)
+        if damaged:
+            raise SystemExit(1)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m scikit_build_core.build",
+        description="Build backend utilities, run from the project directory",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    fingerprint_parser = subparsers.add_parser(
+        "fingerprint",
+        help="Print a hash of everything that affects the wheel, for caching",
+    )
+    fingerprint_parser.add_argument(
+        "-C",
+        "--config-settings",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="Config settings, as passed to the build frontend",
+    )
+    fingerprint_parser.add_argument(
+        "--editable", action="store_true", help="Fingerprint an editable build"
+    )
+    fingerprint_parser.add_argument(
+        "--json", action="store_true", help="Also output the component hashes"
+    )
+    batch_parser = subparsers.add_parser(
+        "batch",
+        help="Build wheels for several projects in one process",
+    )
+    batch_parser.add_argument(
+        "projects", nargs="+", type=Path, help="The project directories"
+    )
+    batch_parser.add_argument(
+        "-w",
+        "--wheel-dir",
+        type=Path,
+        default=Path("dist"),
+        help="Directory for the wheels (default: dist)",
+    )
+    batch_parser.add_argument(
+        "-C",
+        "--config-settings",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="Config settings, used for every project",
+    )
+    batch_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Total build jobs for all projects (default: the usable CPUs)",
+    )
+    batch_parser.add_argument(
+        "--editable", action="store_true", help="Build editable wheels"
+    )
+    batch_parser.add_argument(
+        "--log-dir", type=Path, default=None, help="Keep the build logs here"
+    )
+    matrix_parser = subparsers.add_parser(
+        "matrix",
+        help="Build wheels for several Python interpreters, sharing the build",
+    )
+    matrix_parser.add_argument(
+        "-p",
+        "--python",
+        action="append",
+        required=True,
+        metavar="PYTHON",
+        help="An interpreter to build for, by path or name (can be repeated)",
+    )
+    matrix_parser.add_argument(
+        "-w",
+        "--wheel-dir",
+        type=Path,
+        default=Path("dist"),
+        help="Directory for the wheels (default: dist)",
+    )
+    matrix_parser.add_argument(
+        "-C",
+        "--config-settings",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="Config settings, as passed to the build frontend",
+    )
+    report_parser = subparsers.add_parser(
+        "ninja-report",
+        help="Report the slowest parts of the last Ninja build",
+    )
+    report_parser.add_argument("build_dir", type=Path, help="The Ninja build directory")
+    report_parser.add_argument(
+        "--top", type=int, default=10, help="Number of slowest steps to show"
+    )
+    report_parser.add_argument("--json", action="store_true", help="Output JSON")
+    cache_parser = subparsers.add_parser(
+        "cache",
+        help="Manage the build directory and artifact caches",
+    )
+    cache_parser.add_argument("--root", default="", help="The cache root to use")
+    cache_parser.add_argument(
+        "--artifacts",
+        action="store_true",
+        help="Use the artifact cache (cached wheels) instead of the build cache",
+    )
+    cache_subparsers = cache_parser.add_subparsers(dest="cache_command", required=True)
+    cache_subparsers.add_parser("list", help="List the cache entries")
+    cache_subparsers.add_parser(
+        "verify", help="Check the stored files of the artifact cache entries"
+    )
+    prune_parser = cache_subparsers.add_parser(
+        "prune", help="Remove least recently used entries"
+    )
+    prune_parser.add_argument(
+        "--max-size",
+        default="0",
+        help="Size to prune the cache to, like '10G' (default: remove all)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "fingerprint":
+        from .fingerprint import get_fingerprint
+
+        fingerprint = get_fingerprint(
+            _parse_config_settings(args.config_settings),
+            state="editable" if args.editable else "wheel",
+        )
+        if args.json:
+            data = {
+                "fingerprint": fingerprint.hexdigest,
+                "components": fingerprint.components,
+            }
+            print(json.dumps(data, indent=2))  # noqa: T201
+        else:
+            print(fingerprint.hexdigest)  # noqa: T201
+
+    elif args.command == "batch":
+        from .batch import build_batch
+
+        results = build_batch(
+            args.projects,
+            args.wheel_dir,
+            _parse_config_settings(args.config_settings),
+            jobs=args.jobs,
+            editable=args.editable,
+            log_dir=args.log_dir,
+        )
+        if not all(result.ok for result in results):
+            raise SystemExit(1)
+
+    elif args.command == "matrix":
+        from .._logging import rich_error, rich_print
+        from ..errors import FailedLiveProcessError, InterpreterNotFoundError
+        from .matrix import build_matrix
+
+        try:
+            build_matrix(
+                args.wheel_dir,
+                args.python,
+                _parse_config_settings(args.config_settings),
+            )
+        except InterpreterNotFoundError as err:
+            rich_error("{err}", err=err)
+        except FailedLiveProcessError as err:
+            sys.stdout.flush()
+            rich_print("\n{bold}***", *err.args, color="red", file=sys.stderr)
+            if err.msg:
+                rich_print(err.msg)
+            raise SystemExit(1) from None
+
+    elif args.command == "ninja-report":
+        from .._logging import rich_error
+        from ..builder.ninja_report import analyze
+
+        report = analyze(args.build_dir, top=args.top, update_history=False)
+        if report is None:
+            rich_error("No Ninja build log in {build_dir}", build_dir=args.build_dir)
+        if args.json:
+            print(json.dumps(report.to_dict(), indent=2))  # noqa: T201
+        else:
+            report.print()
+
+    elif args.command == "cache":
+        _cache_command(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,8 @@ import contextlib
 import re
 from typing import TYPE_CHECKING
 
+from .._shutil import _unlink_if_linked
+
 if TYPE_CHECKING:
     from pathlib import Path
 
@@ -31,5 +33,9 @@ def process_script_dir(script_dir: Path) -> None:
             if match:
                 content = [f"#!python{match.group(1) or ''}\n", *file_iter]
         if content:
+            # Don't write through a link made by install.mode
+            mode = item.stat().st_mode
+            _unlink_if_linked(item)
             with item.open("w", encoding="utf-8") as f:
                 f.writelines(content)
+            item.chmod(mode)
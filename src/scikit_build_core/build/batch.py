@@ -0,0 +1,452 @@
+from __future__ import annotations
+
+import contextlib
+import dataclasses
+import json
+import os
+import select
+import signal
+import sys
+import tempfile
+import time
+import traceback
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .._compat import tomllib
+from .._logging import logger, rich_error, rich_print
+from .._shutil import ResourceLog, Run
+from ..builder.jobserver import Jobserver
+from ..builder.parallel import get_cpu_count
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Mapping, Sequence
+    from typing import NoReturn
+
+__all__ = ["BatchResult", "build_batch"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+# How often the scheduler checks for finished builds and free job tokens
+POLL_INTERVAL = 0.05
+
+# Lines of the log shown for a failed build
+LOG_TAIL = 20
+
+
+@dataclasses.dataclass
+class BatchResult:
+    """
+    The outcome of building one project of a batch.
+    """
+
+    project: Path
+    log: Path | None = None
+    wheel: str | None = None
+    error: str | None = None
+    duration: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.wheel is not None
+
+
+@dataclasses.dataclass
+class _Worker:
+    index: int
+    result: BatchResult
+    result_fd: int
+    token: contextlib.ExitStack | None
+    start: float = dataclasses.field(default_factory=time.perf_counter)
+
+
+def _warm_up() -> None:
+    """
+    Do the work every build repeats once, before the workers are forked: the
+    imports, the CMake and Ninja probes, the entry point scans, and the
+    interpreter snapshot.
+    """
+    from ..builder.builder import _entry_point_search_paths, _sys_path_key
+    from ..builder.python_snapshot import PythonSnapshot
+    from ..hooks import BuildHooks
+    from ..program_search import cache_probes, get_cmake_programs, get_ninja_programs
+    from . import wheel  # noqa: F401
+
+    cache_probes()
+    list(get_cmake_programs())
+    list(get_ninja_programs())
+    _entry_point_search_paths(_sys_path_key())
+    BuildHooks.load("wheel")
+    PythonSnapshot.current()
+    # The probes are not part of any build
+    Run.resource_log = ResourceLog()
+
+
+def _project_key(
+    project: Path,
+    config_settings: Mapping[str, list[str] | str] | None,
+    *,
+    editable: bool,
+) -> tuple[str, str] | None:
+    """
+    The normalized name and version of the wheel a project builds, or None if
+    they can't be read (the build will report why).
+    """
+    from ..settings.skbuild_read_settings import SettingsReader
+    from .metadata import get_standard_metadata
+
+    cwd = Path.cwd()
+    try:
+        os.chdir(project)
+        with Path("pyproject.toml").open("rb") as f:
+            pyproject = tomllib.load(f)
+        settings = SettingsReader(
+            pyproject,
+            config_settings or {},
+            state="editable" if editable else "wheel",
+        ).settings
+        metadata = get_standard_metadata(pyproject, settings)
+    except Exception:  # noqa: BLE001
+        return None
+    finally:
+        os.chdir(cwd)
+    if metadata.version is None:
+        return None
+    return metadata.canonical_name, str(metadata.version)
+
+
+def _check_duplicates(
+    projects: Sequence[Path],
+    config_settings: Mapping[str, list[str] | str] | None,
+    *,
+    editable: bool,
+) -> None:
+    """
+    Fail if two projects would write a wheel with the same name.
+    """
+    seen: dict[tuple[str, str], Path] = {}
+    for project in projects:
+        key = _project_key(project, config_settings, editable=editable)
+        if key is None:
+            continue
+        if key in seen:
+            rich_error(
+                "{first} and {second} both build {name} {version}",
+                first=seen[key],
+                second=project,
+                name=key[0],
+                version=key[1],
+            )
+        seen[key] = project
+
+
+def _stop_workers(running: Mapping[int, _Worker]) -> None:
+    """
+    Terminate the builds that are still running, with the processes they
+    started, and return their job tokens.
+    """
+    for pid in running:
+        with contextlib.suppress(ProcessLookupError):
+            os.killpg(pid, signal.SIGTERM)
+    for pid, worker in running.items():
+        with contextlib.suppress(ChildProcessError):
+            os.waitpid(pid, 0)
+        os.close(worker.result_fd)
+        if worker.token is not None:
+            worker.token.close()
+
+
+def _build_project(
+    project: Path,
+    wheel_directory: Path,
+    config_settings: Mapping[str, list[str] | str] | None,
+    *,
+    editable: bool,
+) -> str:
+    from . import build_editable, build_wheel
+
+    hook = build_editable if editable else build_wheel
+    os.chdir(project)
+    return hook(str(wheel_directory), dict(config_settings or {}))
+
+
+def _run_worker(
+    result: BatchResult,
+    result_fd: int,
+    wheel_directory: Path,
+    config_settings: Mapping[str, list[str] | str] | None,
+    *,
+    editable: bool,
+    env: Mapping[str, str],
+) -> NoReturn:
+    """
+    Build a project in a forked worker, with the output going to its log,
+    and write the result to ``result_fd``.
+    """
+    data: dict[str, Any] = {}
+    try:
+        # A process group of its own, so the batch can stop the whole build
+        os.setpgid(0, 0)
+        assert result.log is not None
+        with result.log.open("wb") as log:
+            os.dup2(log.fileno(), 1)
+            os.dup2(log.fileno(), 2)
+        # Python's streams might not write to the file descriptors (pytest
+        # replaces them, for example)
+        sys.stdout = sys.stderr = os.fdopen(1, "w", buffering=1, closefd=False)
+        os.environ.update(env)
+        data["wheel"] = _build_project(
+            result.project, wheel_directory, config_settings, editable=editable
+        )
+    except SystemExit as err:
+        data["error"] = f"exited with {err.code}"
+    except BaseException as err:  # noqa: BLE001
+        traceback.print_exc()
+        data["error"] = f"{type(err).__name__}: {err}"
+
+    sys.stdout.flush()
+    sys.stderr.flush()
+    with contextlib.suppress(OSError):
+        os.write(result_fd, json.dumps(data).encode("utf-8"))
+    os._exit(0 if "wheel" in data else 1)
+
+
+def _finish(worker: _Worker, *, keep_log: bool) -> BatchResult:
+    result = worker.result
+    result.duration = time.perf_counter() - worker.start
+    with os.fdopen(worker.result_fd, "rb") as f:
+        raw = f.read()
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        data = {"error": "the build process died"}
+    result.wheel = data.get("wheel")
+    result.error = data.get("error")
+    if worker.token is not None:
+        worker.token.close()
+    _print_result(result, keep_log=keep_log)
+    if not keep_log:
+        result.log = None
+    return result
+
+
+def _print_result(result: BatchResult, *, keep_log: bool) -> None:
+    if result.ok:
+        rich_print(
+            "{green}***",
+            "{bold}Built {wheel}{normal} from {project} ({duration:.1f}s)",
+            wheel=result.wheel,
+            project=result.project,
+            duration=result.duration,
+        )
+        return
+
+    rich_print(
+        "{red}***",
+        "{bold}Failed to build {project}:{normal} {error}",
+        project=result.project,
+        error=result.error,
+        color="red",
+    )
+    if result.log is not None:
+        lines = result.log.read_text(encoding="utf-8", errors="replace").splitlines()
+        for line in lines[-LOG_TAIL:]:
+            sys.stdout.write(f"    {line}\n")
+        if keep_log:
+            rich_print("    Full log: {log}", log=result.log)
+
+
+@contextlib.contextmanager
+def _make_jobserver(jobs: int) -> Generator[tuple[Jobserver, str], None, None]:
+    """
+    Run a GNU make style jobserver with ``jobs`` tokens, one of them
+    implicit. Yields it and the ``MAKEFLAGS`` for the builds. The tokens are
+    kept in a pipe the workers inherit, which any GNU make can join (the
+    named pipe style needs make 4.4+).
+    """
+    read_fd, write_fd = os.pipe()
+    try:
+        os.write(write_fd, b"+" * (jobs - 1))
+        yield (
+            Jobserver(fds=(read_fd, write_fd)),
+            f"-j{jobs} --jobserver-auth={read_fd},{write_fd}",
+        )
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
+
+
+@contextlib.contextmanager
+def _token_fd(jobserver: Jobserver) -> Generator[int, None, None]:
+    """
+    A file descriptor of the jobserver that is readable while a token is free.
+    """
+    if jobserver.fifo is None:
+        assert jobserver.fds is not None
+        yield jobserver.fds[0]
+        return
+    fd = os.open(jobserver.fifo, os.O_RDWR | os.O_NONBLOCK)
+    try:
+        yield fd
+    finally:
+        os.close(fd)
+
+
+def _readable(fd: int) -> bool:
+    ready, _, _ = select.select([fd], [], [], 0)
+    return bool(ready)
+
+
+def _take_token(jobserver: Jobserver) -> contextlib.ExitStack | None:
+    """
+    Take a token from the jobserver without waiting, held until the returned
+    stack is closed. Returns None if no token is free.
+    """
+    stack = contextlib.ExitStack()
+    if stack.enter_context(jobserver.acquire(2)) < 2:
+        stack.close()
+        return None
+    return stack
+
+
+def _build_sequential(
+    projects: Sequence[Path],
+    wheel_directory: Path,
+    config_settings: Mapping[str, list[str] | str] | None,
+    *,
+    editable: bool,
+) -> list[BatchResult]:
+    results = []
+    cwd = Path.cwd()
+    for project in projects:
+        result = BatchResult(project)
+        start = time.perf_counter()
+        try:
+            result.wheel = _build_project(
+                project, wheel_directory, config_settings, editable=editable
+            )
+        except SystemExit as err:
+            result.error = f"exited with {err.code}"
+        except Exception as err:  # noqa: BLE001
+            traceback.print_exc()
+            result.error = f"{type(err).__name__}: {err}"
+        finally:
+            os.chdir(cwd)
+        result.duration = time.perf_counter() - start
+        _print_result(result, keep_log=False)
+        results.append(result)
+    return results
+
+
+def build_batch(
+    projects: Sequence[Path],
+    wheel_directory: Path,
+    config_settings: Mapping[str, list[str] | str] | None = None,
+    *,
+    jobs: int | None = None,
+    editable: bool = False,
+    log_dir: Path | None = None,
+) -> list[BatchResult]:
+    """
+    Build wheels for several projects from one process. The common work of a
+    build is done once and shared by forked workers, one per project. Each
+    worker holds a job token, and the builds take their extra jobs from the
+    same jobserver (or the one of a parent ``make -j``), so no more than
+    ``jobs`` jobs (the usable CPUs by default) run at once: many projects
+    configure concurrently while the tokens are free, and fewer start as the
+    builds use them. The output of each build goes to a log in ``log_dir``
+    (a temporary directory if not given), and the end of the log is shown if
+    the build fails. Projects that would write wheels with the same name and
+    version are an error. On Windows, the projects are built one at a time.
+    """
+    projects = [Path(p).resolve() for p in projects]
+    wheel_directory = Path(wheel_directory).resolve()
+    wheel_directory.mkdir(parents=True, exist_ok=True)
+    _check_duplicates(projects, config_settings, editable=editable)
+
+    if not hasattr(os, "fork"):
+        return _build_sequential(
+            projects, wheel_directory, config_settings, editable=editable
+        )
+
+    _warm_up()
+
+    jobs = jobs or get_cpu_count()
+    results: dict[int, BatchResult] = {}
+    with tempfile.TemporaryDirectory() as tmpdir, contextlib.ExitStack() as stack:
+        logs = Path(log_dir or tmpdir).resolve()
+        logs.mkdir(parents=True, exist_ok=True)
+
+        # A build server would not get the job tokens
+        env = {"SKBUILD_SERVER": "0"}
+        jobserver = Jobserver.from_env(os.environ)
+        if jobserver is None:
+            jobserver, env["MAKEFLAGS"] = stack.enter_context(_make_jobserver(jobs))
+        else:
+            logger.info("Sharing the jobserver of the parent build")
+        token_fd = stack.enter_context(_token_fd(jobserver))
+
+        pending = list(enumerate(projects, start=1))
+        running: dict[int, _Worker] = {}
+        implicit_free = True
+        try:
+            while pending or running:
+                for pid, worker in list(running.items()):
+                    done, _ = os.waitpid(pid, os.WNOHANG)
+                    if done:
+                        del running[pid]
+                        results[worker.index] = _finish(
+                            worker, keep_log=log_dir is not None
+                        )
+                        if worker.token is None:
+                            implicit_free = True
+
+                while pending and (implicit_free or _readable(token_fd)):
+                    token = None
+                    if not implicit_free:
+                        token = _take_token(jobserver)
+                        if token is None:
+                            break
+                    implicit_free = False
+
+                    index, project = pending.pop(0)
+                    result = BatchResult(
+                        project, log=logs / f"{index}-{project.name}.log"
+                    )
+                    read_fd, write_fd = os.pipe()
+                    sys.stdout.flush()
+                    sys.stderr.flush()
+                    pid = os.fork()
+                    if pid == 0:
+                        os.close(read_fd)
+                        _run_worker(
+                            result,
+                            write_fd,
+                            wheel_directory,
+                            config_settings,
+                            editable=editable,
+                            env=env,
+                        )
+                    os.close(write_fd)
+                    with contextlib.suppress(OSError):
+                        os.setpgid(pid, pid)
+                    rich_print("{bold}Building{normal} {project}", project=project)
+                    running[pid] = _Worker(index, result, read_fd, token)
+
+                time.sleep(POLL_INTERVAL)
+        finally:
+            # An error or ^C must not leave the builds running without us
+            _stop_workers(running)
+
+    ordered = [results[i] for i in sorted(results)]
+    failed = sum(not r.ok for r in ordered)
+    rich_print(
+        "{bold}Built {built} of {total} projects{normal}",
+        built=len(ordered) - failed,
+        total=len(ordered),
+        color="red" if failed else "green",
+    )
+    return ordered
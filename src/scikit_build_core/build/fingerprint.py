@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import sysconfig
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal
+
+from .. import __version__
+from .._compat import tomllib
+from .._shutil import Run
+from ..builder.build_cache import FINGERPRINT_ENV
+from ..builder.builder import archs_to_tags, get_archs
+from ..builder.sysconfig import get_soabi
+from ..builder.toolchain_cache import TOOLCHAIN_ENV
+from ..builder.wheel_tag import WheelTag
+from ..cmake import CMake
+from ..errors import CMakeNotFoundError
+from ..program_search import best_program, get_ninja_programs
+from ..settings.skbuild_read_settings import SettingsReader
+from ._file_processor import each_unignored_file
+from .metadata import get_standard_metadata
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+    from ..settings.skbuild_model import ScikitBuildSettings
+
+__all__ = ["Fingerprint", "compute_fingerprint", "get_fingerprint"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+# Settings that don't change the wheel that is produced
+IGNORED_SETTINGS = ("logging", "messages", "build_dir", "build_cache")
+
+# Compilers checked if not set in the environment (CMake's first choices)
+DEFAULT_COMPILERS = {"CC": "cc", "CXX": "c++"}
+
+
+def _hash(data: Any) -> str:
+    text = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _hash_files(paths: Iterable[Path]) -> str:
+    digest = hashlib.sha256()
+    for path in sorted(paths, key=lambda p: p.as_posix()):
+        digest.update(path.as_posix().encode("utf-8") + b"\0")
+        with path.open("rb") as f:
+            for chunk in iter(lambda: f.read(2**20), b""):
+                digest.update(chunk)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _program_version(command: str) -> str | None:
+    """
+    The first line of ``<command> --version``, or None if it can't be run.
+    """
+    args = shlex.split(command)
+    if not args or shutil.which(args[0]) is None:
+        return None
+    try:
+        result = Run().capture(*args, "--version")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    lines = (result.stdout or "").strip().splitlines()
+    return lines[0] if lines else ""
+
+
+def _compilers(env: Mapping[str, str]) -> dict[str, str | None]:
+    """
+    The versions of the compilers CMake would pick up. MSVC is found by CMake
+    itself, so only compilers from the environment are checked on Windows.
+    """
+    defaults = {} if sys.platform.startswith("win") else DEFAULT_COMPILERS
+    compilers = {**defaults, **{k: env[k] for k in ("CC", "CXX", "FC") if k in env}}
+    return {
+        name: _program_version(command) for name, command in sorted(compilers.items())
+    }
+
+
+def _tools(settings: ScikitBuildSettings, env: Mapping[str, str]) -> dict[str, Any]:
+    try:
+        cmake = CMake.default_search(version=settings.cmake.version, env=env)
+        cmake_version: str | None = str(cmake.version)
+    except CMakeNotFoundError:
+        cmake_version = None
+    ninja = best_program(get_ninja_programs(), version=settings.ninja.version)
+    return {
+        "cmake": cmake_version,
+        "ninja": str(ninja.version) if ninja is not None else None,
+        "compilers": _compilers(env),
+    }
+
+
+def _python(settings: ScikitBuildSettings, env: Mapping[str, str]) -> dict[str, Any]:
+    targetlib_purelib = (
+        not settings.wheel.cmake
+        if settings.wheel.platlib is None
+        else not settings.wheel.platlib
+    )
+    tags = WheelTag.compute_best(
+        archs_to_tags(get_archs(env)),
+        settings.wheel.py_api,
+        expand_macos=settings.wheel.expand_macos_universal_tags,
+        root_is_purelib=targetlib_purelib,
+        build_tag=settings.wheel.build_tag,
+    )
+    return {
+        "implementation": sys.implementation.cache_tag,
+        "version": sys.version,
+        "abiflags": getattr(sys, "abiflags", ""),
+        "soabi": get_soabi(env),
+        "platform": sysconfig.get_platform(),
+        "wheel_tag": str(tags),
+    }
+
+
+@dataclasses.dataclass(frozen=True)
+class Fingerprint:
+    """
+    The hashes of the inputs of a wheel build. Two builds with the same
+    fingerprint produce the same wheel.
+    """
+
+    components: dict[str, str]
+
+    @property
+    def hexdigest(self) -> str:
+        return _hash(self.components)
+
+
+def compute_fingerprint(
+    pyproject: Mapping[str, Any],
+    settings: ScikitBuildSettings,
+    *,
+    state: Literal["wheel", "editable"],
+    env: Mapping[str, str],
+) -> Fingerprint:
+    """
+    Compute the fingerprint of the project in the current directory from its
+    resolved settings. Editable wheels point at the project directory, so it
+    is included for them.
+    """
+    metadata = get_standard_metadata(pyproject, settings)
+
+    # Files generated into the source tree come from the metadata and the
+    # templates, which are hashed already. A build adds them to sdist.include,
+    # so they are left out to get the same result before and during a build.
+    generated = {
+        Path(gen.path) for gen in settings.generate if gen.location == "source"
+    }
+    include = [i for i in settings.sdist.include if Path(i) not in generated]
+    settings_dict = {
+        k: v
+        for k, v in dataclasses.asdict(settings).items()
+        if k not in IGNORED_SETTINGS
+    }
+    settings_dict["sdist"]["include"] = include
+    sources = (
+        path
+        for path in each_unignored_file(
+            Path(),
+            include=include,
+            exclude=settings.sdist.exclude,
+            build_dir=settings.build_dir,
+        )
+        if path not in generated
+    )
+    env_names = sorted({*FINGERPRINT_ENV, *TOOLCHAIN_ENV})
+
+    components = {
+        "scikit-build-core": _hash(__version__),
+        "sources": _hash_files(sources),
+        "settings": _hash(settings_dict),
+        "metadata": _hash([metadata.name, str(metadata.version)]),
+        "env": _hash({k: env[k] for k in env_names if k in env}),
+        "tools": _hash(_tools(settings, env)),
+        "python": _hash(_python(settings, env)),
+    }
+    if state == "editable":
+        components["project_dir"] = _hash(str(Path.cwd().resolve()))
+    return Fingerprint(components)
+
+
+def get_fingerprint(
+    config_settings: Mapping[str, list[str] | str] | None = None,
+    *,
+    state: Literal["wheel", "editable"] = "wheel",
+    env: Mapping[str, str] | None = None,
+) -> Fingerprint:
+    """
+    Compute the fingerprint of the project in the current directory, without
+    configuring or building it: the unignored source files, the settings
+    (after overrides), the project metadata, the environment variables that
+    change the build, the versions of CMake, Ninja and the compilers, and the
+    interpreter and wheel tag.
+    """
+    if env is None:
+        env = os.environ
+
+    with Path("pyproject.toml").open("rb") as f:
+        pyproject = tomllib.load(f)
+
+    settings_reader = SettingsReader(
+        pyproject, dict(config_settings or {}), state=state
+    )
+    settings_reader.validate_may_exit()
+
+    return compute_fingerprint(
+        pyproject, settings_reader.settings, state=state, env=env
+    )
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import sysconfig
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .._compat import tomllib
+from .._logging import rich_error, rich_print
+from ..builder.interpreter import Interpreter
+from ..builder.wheel_tag import WheelTag
+from ..settings.skbuild_read_settings import SettingsReader
+from .wheel import _build_wheel_impl
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Mapping, Sequence
+
+__all__ = ["build_matrix"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+def _unique(interpreters: Sequence[Interpreter], py_api: str) -> list[Interpreter]:
+    """
+    Drop interpreters that would make the same wheel as an earlier one (like
+    all of them for an ``abi3`` wheel).
+    """
+    unique: dict[tuple[str, str], Interpreter] = {}
+    for interpreter in interpreters:
+        tag = WheelTag.compute_best([], py_api, interpreter=interpreter)
+        key = (tag.pyver, tag.abi)
+        if key in unique:
+            rich_print(
+                "{yellow}***",
+                "{executable} makes the same wheel as {other}, skipping",
+                executable=interpreter.executable,
+                other=unique[key].executable,
+            )
+        else:
+            unique[key] = interpreter
+    return list(unique.values())
+
+
+def build_matrix(
+    wheel_directory: os.PathLike[str] | str,
+    interpreters: Sequence[os.PathLike[str] | str],
+    config_settings: Mapping[str, list[str] | str] | None = None,
+) -> list[str]:
+    """
+    Build a wheel of the project in the current directory for each of
+    several interpreters, and return their names. The wheels are built one
+    after the other in a single build directory (a temporary one if
+    ``build-dir`` is not set), reconfigured for each interpreter: only the
+    Python parts of the configuration change, so the targets that don't use
+    Python are compiled once, and only the ones that do (the bindings) are
+    compiled and installed again for each interpreter.
+
+    The settings, including overrides, are read with the running
+    interpreter, and the platform tag is its platform; the interpreters must
+    all be for this platform.
+    """
+    with Path("pyproject.toml").open("rb") as f:
+        pyproject = tomllib.load(f)
+    config = dict(config_settings or {})
+    settings = SettingsReader(pyproject, config, state="wheel", retry=False).settings
+
+    found = _unique(
+        [Interpreter.from_executable(exe) for exe in interpreters],
+        settings.wheel.py_api,
+    )
+    platform = sysconfig.get_platform()
+    for interpreter in found:
+        if interpreter.platform != platform:
+            rich_error(
+                "{executable} is for {other}, not {platform}",
+                executable=interpreter.executable,
+                other=interpreter.platform,
+                platform=platform,
+            )
+
+    wheels = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        if not settings.build_dir:
+            config["build-dir"] = str(Path(tmpdir) / "build")
+        elif "{wheel_tag}" in settings.build_dir:
+            rich_print(
+                "{yellow}***",
+                "build-dir contains {{wheel_tag}}, nothing is shared between interpreters",
+            )
+
+        for interpreter in found:
+            rich_print(
+                "{green}***",
+                "{bold}Building for Python {version}{normal} ({executable})",
+                version=".".join(str(v) for v in interpreter.version),
+                executable=interpreter.executable,
+            )
+            result = _build_wheel_impl(
+                str(wheel_directory),
+                config,
+                None,
+                editable=False,
+                interpreter=interpreter,
+            )
+            wheels.append(result.wheel_filename)
+
+    rich_print(
+        "{green}***",
+        "{bold}Built {count} wheels:{normal} {wheels}",
+        count=len(wheels),
+        wheels=", ".join(wheels),
+    )
+    return wheels
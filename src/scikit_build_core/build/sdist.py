@@ -15,6 +15,8 @@ from packaging.version import Version
 from .. import __version__
 from .._compat import tomllib
 from .._logging import rich_print
+from .._shutil import _write_if_changed
+from ..hooks import BuildHooks
 from ..settings.skbuild_read_settings import SettingsReader
 from ._file_processor import each_unignored_file
 from ._init import setup_logging
@@ -99,11 +101,16 @@ def build_sdist(
     with Path("pyproject.toml").open("rb") as f:
         pyproject = tomllib.load(f)
 
-    settings_reader = SettingsReader(pyproject, config_settings or {}, state="sdist")
-    settings = settings_reader.settings
-    setup_logging(settings.logging.level)
+    hooks = BuildHooks.load("sdist")
+    with hooks.phase("settings"):
+        settings_reader = SettingsReader(
+            pyproject, config_settings or {}, state="sdist"
+        )
+        settings = settings_reader.settings
+        setup_logging(settings.logging.level)
 
-    settings_reader.validate_may_exit()
+        settings_reader.validate_may_exit()
+        hooks.settings = settings
 
     sdist_dir = Path(sdist_directory)
 
@@ -136,11 +143,14 @@ def build_sdist(
     for gen in settings.generate:
         if gen.location == "source":
             contents = generate_file_contents(gen, metadata)
-            gen.path.write_text(contents)
+            _write_if_changed(gen.path, contents)
             settings.sdist.include.append(str(gen.path))
 
     sdist_dir.mkdir(parents=True, exist_ok=True)
     with contextlib.ExitStack() as stack:
+        stack.enter_context(
+            hooks.phase("package", files=lambda: [sdist_dir / filename])
+        )
         gzip_container = stack.enter_context(
             gzip.GzipFile(
                 sdist_dir / filename, mode="wb", compresslevel=9, mtime=timestamp
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import contextlib
 import dataclasses
 import os
 import shutil
 import sysconfig
 import tempfile
+import zipfile
 from collections.abc import Mapping
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Literal
@@ -15,11 +17,30 @@ from packaging.utils import canonicalize_name
 from .._compat import tomllib
 from .._compat.typing import assert_never
 from .._logging import LEVEL_VALUE, logger, rich_error, rich_print
+from .._shutil import (
+    ResourceLog,
+    Run,
+    _hardlink_symlinks,
+    _unlink_if_linked,
+    _write_if_changed,
+)
+from ..builder.build_cache import (
+    configure_fingerprint,
+    get_artifact_root,
+    get_build_dir,
+    get_cache_root,
+    prune,
+    restore_artifact,
+    store_artifact,
+)
+from ..builder.build_lock import lock_build_dir
 from ..builder.builder import Builder, archs_to_tags, get_archs
+from ..builder.parallel import parse_size
 from ..builder.wheel_tag import WheelTag
 from ..cmake import CMake, CMaker
 from ..errors import FailedLiveProcessError
 from ..format import pyproject_format
+from ..hooks import BuildHooks
 from ..settings.skbuild_read_settings import SettingsReader
 from ._editable import editable_redirect, libdir_to_installed, mapping_to_modules
 from ._init import setup_logging
@@ -28,12 +49,15 @@ from ._pathutil import (
 )
 from ._scripts import process_script_dir
 from ._wheelfile import WheelMetadata, WheelWriter
+from .fingerprint import compute_fingerprint
 from .generate import generate_file_contents
 from .metadata import get_standard_metadata
 
 if TYPE_CHECKING:
     from collections.abc import Iterable, Sequence
 
+    from .._vendor.pyproject_metadata import StandardMetadata
+    from ..builder.interpreter import Interpreter
     from ..settings.skbuild_model import ScikitBuildSettings
 
 __all__ = ["_build_wheel_impl"]
@@ -112,6 +136,23 @@ def _get_packages(
     return packages
 
 
+def _metadata_matches(wheel_path: Path, metadata_directory: Path) -> bool:
+    """
+    Check the dist-info in a wheel against the one prepared earlier, the same
+    files a fresh build checks.
+    """
+    with zipfile.ZipFile(wheel_path) as zf:
+        names = set(zf.namelist())
+        for key in ("METADATA", "WHEEL", "entry_points.txt"):
+            name = f"{metadata_directory.name}/{key}"
+            if name not in names:
+                continue
+            path = metadata_directory / key
+            if not path.is_file() or path.read_bytes() != zf.read(name):
+                return False
+    return True
+
+
 @dataclasses.dataclass
 class WheelImplReturn:
     wheel_filename: str
@@ -119,6 +160,68 @@ class WheelImplReturn:
     mapping: dict[str, str] = dataclasses.field(default_factory=dict)
 
 
+def _build_companion_wheel(
+    builder: Builder,
+    build_type: str,
+    *,
+    install_dir: Path,
+    wheel_dirs: Mapping[str, Path],
+    mapping: Mapping[str, str],
+    metadata: StandardMetadata,
+    tags: WheelTag,
+    settings: ScikitBuildSettings,
+    root_is_purelib: bool,
+    wheel_directory: Path,
+    hooks: BuildHooks,
+) -> Path:
+    """
+    Install another configuration of a multi-config build in place of the
+    one just packaged, and package it the same way, into a subdirectory of
+    the wheel directory named after the configuration.
+    """
+    for key, path in wheel_dirs.items():
+        if key != "metadata":
+            shutil.rmtree(path)
+            path.mkdir()
+
+    # The generated files went with the rest of the first install
+    libdir = wheel_dirs["purelib" if root_is_purelib else "platlib"]
+    for gen in settings.generate:
+        if gen.location == "install":
+            path = libdir / gen.path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            _write_if_changed(path, generate_file_contents(gen, metadata))
+
+    rich_print(
+        "{green}***",
+        "{bold}Installing the {build_type} configuration into a wheel...",
+        build_type=build_type,
+    )
+    with hooks.phase("install", files=builder.installed_files):
+        builder.install(install_dir, build_type=build_type)
+    if settings.install.mode == "hardlink":
+        _hardlink_symlinks(wheel_dirs["metadata"].parent)
+
+    for filepath, package_dir in mapping.items():
+        Path(package_dir).parent.mkdir(exist_ok=True, parents=True)
+        _unlink_if_linked(Path(package_dir))
+        shutil.copyfile(filepath, package_dir)
+    process_script_dir(wheel_dirs["scripts"])
+
+    with WheelWriter(
+        metadata,
+        wheel_directory / build_type.lower(),
+        tags.as_tags_set(),
+        WheelMetadata(
+            root_is_purelib=root_is_purelib,
+            build_tag=settings.wheel.build_tag,
+        ),
+        wheel_dirs["metadata"],
+    ) as wheel:
+        wheel.build(wheel_dirs, exclude=settings.wheel.exclude)
+    return wheel.wheelpath
+
+
 def _build_wheel_impl(
     wheel_directory: str | None,
     config_settings: dict[str, list[str] | str] | None,
@@ -126,10 +229,12 @@ def _build_wheel_impl(
     *,
     exit_after_config: bool = False,
     editable: bool,
+    interpreter: Interpreter | None = None,
 ) -> WheelImplReturn:
     """
     Build a wheel or just prepare metadata (if wheel dir is None). Can be editable.
-    Handles one retry attempt if "failed" override present.
+    Handles one retry attempt if "failed" override present. The wheel is for
+    ``interpreter`` if given, instead of the running interpreter.
     """
     state: Literal["sdist", "wheel", "editable", "metadata_wheel", "metadata_editable"]
     if exit_after_config:
@@ -143,12 +248,15 @@ def _build_wheel_impl(
     with pyproject_path.open("rb") as ft:
         pyproject = tomllib.load(ft)
 
-    settings_reader = SettingsReader(
-        pyproject, config_settings or {}, state=state, retry=False
-    )
-    setup_logging(settings_reader.settings.logging.level)
+    hooks = BuildHooks.load(state)
+    with hooks.phase("settings"):
+        settings_reader = SettingsReader(
+            pyproject, config_settings or {}, state=state, retry=False
+        )
+        setup_logging(settings_reader.settings.logging.level)
 
-    settings_reader.validate_may_exit()
+        settings_reader.validate_may_exit()
+        hooks.settings = settings_reader.settings
 
     if settings_reader.settings.fail:
         if settings_reader.settings.messages.after_failure:
@@ -179,6 +287,8 @@ def _build_wheel_impl(
             state=state,
             settings=settings_reader.settings,
             pyproject=pyproject,
+            hooks=hooks,
+            interpreter=interpreter,
         )
     except FailedLiveProcessError as err:
         settings_reader = SettingsReader(
@@ -198,6 +308,7 @@ def _build_wheel_impl(
         logger.setLevel(LEVEL_VALUE[settings_reader.settings.logging.level])
 
         settings_reader.validate_may_exit()
+        hooks.settings = settings_reader.settings
 
         try:
             return _build_wheel_impl_impl(
@@ -208,6 +319,8 @@ def _build_wheel_impl(
                 state=state,
                 settings=settings_reader.settings,
                 pyproject=pyproject,
+                hooks=hooks,
+                interpreter=interpreter,
             )
         except FailedLiveProcessError as err2:
             err2.msg = settings_reader.settings.messages.after_failure.format()
@@ -223,11 +336,17 @@ def _build_wheel_impl_impl(
     state: Literal["sdist", "wheel", "editable", "metadata_wheel", "metadata_editable"],
     settings: ScikitBuildSettings,
     pyproject: dict[str, Any],
+    hooks: BuildHooks,
+    interpreter: Interpreter | None = None,
 ) -> WheelImplReturn:
     """
     Build a wheel or just prepare metadata (if wheel dir is None). Can be editable.
     """
 
+    # Only the commands of this build are reported (the build server and the
+    # batch builder run many builds in one process)
+    resource_log = Run.resource_log = ResourceLog()
+
     metadata = get_standard_metadata(pyproject, settings)
 
     if metadata.version is None:
@@ -249,6 +368,30 @@ def _build_wheel_impl_impl(
         cmake = None
         cmake_msg = []
 
+    # The other configurations of a multi-config build get their own wheels
+    extra_build_types: list[str] = []
+    if cmake is not None and settings.cmake.extra_build_types:
+        if state == "wheel":
+            extra_build_types = [
+                build_type
+                for build_type in dict.fromkeys(settings.cmake.extra_build_types)
+                if build_type != settings.cmake.build_type
+            ]
+        else:
+            logger.info("cmake.extra-build-types is only used for wheels, ignoring")
+    if extra_build_types and wheel_directory is not None:
+        # pip builds into a temporary directory and only keeps the wheel the
+        # hook returns
+        temp_root = Path(tempfile.gettempdir()).resolve()
+        if temp_root in Path(wheel_directory).resolve().parents:
+            logger.warning(
+                "The wheel directory {} is temporary, the build frontend (like "
+                "pip) only keeps the {} wheel; use python -m build to keep the "
+                "wheels of cmake.extra-build-types",
+                wheel_directory,
+                settings.cmake.build_type,
+            )
+
     if settings.wheel.platlib is None:
         targetlib = "platlib" if settings.wheel.cmake else "purelib"
     else:
@@ -260,7 +403,7 @@ def _build_wheel_impl_impl(
         f"{{red}}({state})",
     )
 
-    with tempfile.TemporaryDirectory() as tmpdir:
+    with tempfile.TemporaryDirectory() as tmpdir, contextlib.ExitStack() as build_lock:
         build_tmp_folder = Path(tmpdir)
         wheel_dir = build_tmp_folder / "wheel"
 
@@ -270,9 +413,15 @@ def _build_wheel_impl_impl(
             expand_macos=settings.wheel.expand_macos_universal_tags,
             root_is_purelib=targetlib == "purelib",
             build_tag=settings.wheel.build_tag,
+            interpreter=interpreter,
         )
 
-        # A build dir can be specified, otherwise use a temporary directory
+        # A build dir can be specified, otherwise use a temporary directory, or
+        # a managed one in the build cache
+        build_cache_root: Path | None = None
+        build_cache_max_size = 0
+        build_cache_entry: dict[str, Any] = {}
+        shared_build_dir = False
         if cmake is not None and editable and settings.editable.mode == "inplace":
             build_dir = settings.cmake.source_dir
         else:
@@ -289,6 +438,23 @@ def _build_wheel_impl_impl(
                 if settings.build_dir
                 else build_tmp_folder / "build"
             )
+            if (
+                cmake is not None
+                and not settings.build_dir
+                and settings.build_cache.enabled
+            ):
+                build_cache_root = get_cache_root(settings.build_cache.root)
+                build_cache_max_size = parse_size(settings.build_cache.max_size)
+                build_cache_entry = {
+                    "name": normalized_name,
+                    "project_dir": None if settings.build.relocatable else Path.cwd(),
+                    "wheel_tag": str(tags),
+                    "build_type": settings.cmake.build_type,
+                    "state": state,
+                    "fingerprint": configure_fingerprint(settings, os.environ),
+                }
+                build_dir = get_build_dir(build_cache_root, **build_cache_entry)
+            shared_build_dir = bool(settings.build_dir) or build_cache_root is not None
             logger.info("Build directory: {}", build_dir.resolve())
 
         wheel_dirs = {
@@ -354,7 +520,7 @@ def _build_wheel_impl_impl(
         for gen in settings.generate:
             if gen.location == "source":
                 contents = generate_file_contents(gen, metadata)
-                gen.path.write_text(contents)
+                _write_if_changed(gen.path, contents)
                 settings.sdist.include.append(str(gen.path))
 
         if wheel_directory is None and not exit_after_config:
@@ -381,6 +547,87 @@ def _build_wheel_impl_impl(
                 path.write_bytes(data)
             return WheelImplReturn(wheel_filename=dist_info.name, settings=settings)
 
+        # Reuse the result of an earlier build with the same inputs: the wheel,
+        # or the installed files for an editable wheel (it has to be made
+        # again, it points at the project directory). The fingerprint is of
+        # the running interpreter, so not for builds for another one.
+        artifact_root = get_artifact_root(settings.build_cache.artifacts_root)
+        artifact_key: str | None = None
+        restored = False
+        if (
+            settings.build_cache.artifacts
+            and interpreter is None
+            and wheel_directory is not None
+            and (
+                (state == "wheel" and not extra_build_types)
+                or (
+                    state == "editable"
+                    and settings.editable.mode == "redirect"
+                    and not settings.editable.rebuild
+                )
+            )
+        ):
+            artifact_key = compute_fingerprint(
+                pyproject, settings, state=state, env=os.environ
+            ).hexdigest
+            artifact = restore_artifact(
+                artifact_root,
+                name=normalized_name,
+                state=state,
+                fingerprint=artifact_key,
+            )
+            if artifact is not None and state == "wheel":
+                (cached_wheel,) = artifact.glob("*.whl")
+                if metadata_directory is not None and not _metadata_matches(
+                    cached_wheel, Path(metadata_directory)
+                ):
+                    logger.warning(
+                        "Cached wheel {} does not match {}, building it again",
+                        cached_wheel.name,
+                        metadata_directory,
+                    )
+                    artifact = None
+            if artifact is not None and state == "wheel":
+                Path(wheel_directory).mkdir(parents=True, exist_ok=True)
+                wheel_path = Path(wheel_directory) / cached_wheel.name
+                # Nothing is configured, built or installed, but hooks that
+                # handle the wheel still get it
+                with hooks.phase("package", files=lambda: [wheel_path]):
+                    shutil.copyfile(cached_wheel, wheel_path)
+                rich_print(
+                    "{green}***", f"{{bold}}Reused cached{{normal}} {cached_wheel.name}"
+                )
+                if settings.messages.after_success:
+                    rich_print(settings.messages.after_success)
+                return WheelImplReturn(
+                    wheel_filename=cached_wheel.name, settings=settings
+                )
+            if artifact is not None:
+                rich_print("{green}***", "{bold}Reusing cached installed files...")
+                shutil.copytree(artifact, wheel_dir, dirs_exist_ok=True)
+                restored = True
+
+        # Other builds can use the same build directory at the same time (like
+        # tox or pytest-xdist); the wheel staging directory is per build
+        if shared_build_dir and cmake is not None and not restored:
+            build_lock.enter_context(lock_build_dir(build_dir))
+            if build_cache_root is not None:
+                # A prune in another build could have removed the entry
+                # before it was locked
+                get_build_dir(build_cache_root, **build_cache_entry)
+
+        # Set up first: a relocatable build directory might be cleaned
+        config = None
+        if cmake is not None and not restored:
+            config = CMaker(
+                cmake,
+                source_dir=settings.cmake.source_dir,
+                build_dir=build_dir,
+                build_type=settings.cmake.build_type,
+                extra_build_types=extra_build_types,
+                relocatable=settings.build.relocatable,
+            )
+
         for gen in settings.generate:
             contents = generate_file_contents(gen, metadata)
             if gen.location == "source":
@@ -392,19 +639,12 @@ def _build_wheel_impl_impl(
             else:
                 assert_never(gen.location)
             path.parent.mkdir(parents=True, exist_ok=True)
-            path.write_text(contents, encoding="utf-8")
+            _write_if_changed(path, contents)
 
         build_options = []
         install_options = []
 
-        if cmake is not None:
-            config = CMaker(
-                cmake,
-                source_dir=settings.cmake.source_dir,
-                build_dir=build_dir,
-                build_type=settings.cmake.build_type,
-            )
-
+        if config is not None:
             builder = Builder(
                 settings=settings,
                 config=config,
@@ -418,12 +658,15 @@ def _build_wheel_impl_impl(
                 f"SKBUILD_{k.upper()}_DIR": v for k, v in wheel_dirs.items()
             }
             cache_entries["SKBUILD_STATE"] = state
-            builder.configure(
-                defines=defines,
-                cache_entries=cache_entries,
-                name=metadata.name,
-                version=metadata.version,
-            )
+            hooks.build_dir = build_dir
+            with resource_log.track_phase("configure"), hooks.phase("configure"):
+                builder.configure(
+                    defines=defines,
+                    cache_entries=cache_entries,
+                    name=metadata.name,
+                    version=metadata.version,
+                    interpreter=interpreter,
+                )
 
             if exit_after_config:
                 return WheelImplReturn("", settings=settings)
@@ -439,14 +682,32 @@ def _build_wheel_impl_impl(
                 f"{{bold}}Building project with {{blue}}{generator}{{default}}...",
             )
             build_args: list[str] = []
-            builder.build(build_args=build_args)
+            with resource_log.track_phase("build"), hooks.phase("build"):
+                builder.build(build_args=build_args)
 
             if not (editable and settings.editable.mode == "inplace"):
                 rich_print(
                     "{green}***",
                     "{bold}Installing project into wheel...",
                 )
-                builder.install(install_dir)
+                with resource_log.track_phase("install"), hooks.phase(
+                    "install", files=builder.installed_files
+                ):
+                    builder.install(install_dir)
+                if settings.install.mode == "hardlink":
+                    # Also covers files installed outside the prefix
+                    _hardlink_symlinks(wheel_dir)
+                if settings.install.mode == "copy" and not extra_build_types:
+                    # Linked files still point into the build directory, so
+                    # the lock is kept until the wheel is written for those
+                    # (and the other configurations are installed)
+                    build_lock.close()
+
+            if settings.build.report:
+                resource_log.print_summary()
+
+            if build_cache_root is not None:
+                prune(build_cache_root, build_cache_max_size, keep=[build_dir])
 
             if not builder.config.single_config and builder.config.build_type:
                 build_options += ["--config", builder.config.build_type]
@@ -454,6 +715,16 @@ def _build_wheel_impl_impl(
             if builder.settings.cmake.verbose:
                 build_options.append("-v")
 
+        if artifact_key is not None and state == "editable" and not restored:
+            store_artifact(
+                artifact_root,
+                wheel_dir,
+                name=normalized_name,
+                state=state,
+                fingerprint=artifact_key,
+            )
+            prune(artifact_root, parse_size(settings.build_cache.artifacts_max_size))
+
         assert wheel_directory is not None
 
         rich_print("{green}***", f"{{bold}}Making {state}...")
@@ -473,11 +744,13 @@ def _build_wheel_impl_impl(
         if not editable:
             for filepath, package_dir in mapping.items():
                 Path(package_dir).parent.mkdir(exist_ok=True, parents=True)
+                # Don't write through a link made by install.mode
+                _unlink_if_linked(Path(package_dir))
                 shutil.copyfile(filepath, package_dir)
 
             process_script_dir(wheel_dirs["scripts"])
 
-        with WheelWriter(
+        with hooks.phase("package", files=lambda: [wheel.wheelpath]), WheelWriter(
             metadata,
             Path(wheel_directory),
             tags.as_tags_set(),
@@ -516,6 +789,26 @@ def _build_wheel_impl_impl(
                     "\n".join(str_pkgs).encode(),
                 )
 
+        for build_type in extra_build_types:
+            companion = _build_companion_wheel(
+                builder,
+                build_type,
+                install_dir=install_dir,
+                wheel_dirs=wheel_dirs,
+                mapping=mapping,
+                metadata=metadata,
+                tags=tags,
+                settings=settings,
+                root_is_purelib=targetlib == "purelib",
+                wheel_directory=Path(wheel_directory),
+                hooks=hooks,
+            )
+            rich_print(
+                "{green}***",
+                "{bold}Created{normal} {companion}",
+                companion=companion.relative_to(wheel_directory),
+            )
+
     if metadata_directory is not None:
         dist_info_contents = wheel.dist_info_contents()
         dist_info = Path(metadata_directory)
@@ -529,6 +822,15 @@ def _build_wheel_impl_impl(
 
     wheel_filename: str = wheel.wheelpath.name
     rich_print("{green}***", f"{{bold}}Created{{normal}} {wheel_filename}")
+    if artifact_key is not None and state == "wheel":
+        store_artifact(
+            artifact_root,
+            wheel.wheelpath,
+            name=normalized_name,
+            state=state,
+            fingerprint=artifact_key,
+        )
+        prune(artifact_root, parse_size(settings.build_cache.artifacts_max_size))
     if settings.messages.after_success:
         rich_print(settings.messages.after_success)
     return WheelImplReturn(
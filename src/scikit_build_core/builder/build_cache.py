@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+import contextlib
+import dataclasses
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .._logging import logger
+from .build_lock import try_lock_build_dir
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+    from ..settings.skbuild_model import ScikitBuildSettings
+
+__all__ = [
+    "CacheEntry",
+    "configure_fingerprint",
+    "get_artifact_root",
+    "get_build_dir",
+    "get_cache_root",
+    "list_entries",
+    "prune",
+    "restore_artifact",
+    "store_artifact",
+    "user_cache_dir",
+    "verify_entry",
+]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+ENTRY_INFO = "skbuild-cache.json"
+
+# Environment variables that change the configure result
+FINGERPRINT_ENV = (
+    "CMAKE_ARGS",
+    "CMAKE_GENERATOR",
+    "CMAKE_GENERATOR_PLATFORM",
+    "CMAKE_TOOLCHAIN_FILE",
+    "CC",
+    "CXX",
+    "FC",
+    "CUDACXX",
+    "ARCHFLAGS",
+    "MACOSX_DEPLOYMENT_TARGET",
+)
+
+
+def user_cache_dir() -> Path:
+    """
+    The per-user cache directory for the platform.
+    """
+    if sys.platform.startswith("win"):
+        return Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData/Local"))
+    if sys.platform.startswith("darwin"):
+        return Path.home() / "Library/Caches"
+    return Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+
+
+def get_cache_root(root: str = "") -> Path:
+    """
+    The root of the build directory cache, ``root`` if given.
+    """
+    if root:
+        return Path(root).expanduser()
+    return user_cache_dir() / "scikit-build-core" / "build"
+
+
+def get_artifact_root(root: str = "") -> Path:
+    """
+    The root of the artifact cache, ``root`` if given.
+    """
+    if root:
+        return Path(root).expanduser()
+    return user_cache_dir() / "scikit-build-core" / "artifacts"
+
+
+def configure_fingerprint(settings: ScikitBuildSettings, env: Mapping[str, str]) -> str:
+    """
+    A hash of the inputs that select a different CMake configuration, so that
+    incompatible configurations don't share a build directory.
+    """
+    data = {
+        "python": sys.executable,
+        "cmake_args": settings.cmake.args,
+        "cmake_define": sorted(settings.cmake.define.items()),
+        "env": {k: env[k] for k in FINGERPRINT_ENV if k in env},
+    }
+    text = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def _dir_size(path: Path) -> int:
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            with contextlib.suppress(OSError):
+                total += Path(dirpath, filename).lstat().st_size
+    return total
+
+
+@dataclasses.dataclass(frozen=True)
+class CacheEntry:
+    path: Path
+    info: dict[str, Any]
+
+    @property
+    def build_dir(self) -> Path:
+        return self.path / "build"
+
+    @property
+    def artifact(self) -> Path:
+        return self.path / "artifact"
+
+    @property
+    def last_used(self) -> float:
+        return float(self.info.get("last_used", 0))
+
+    def size(self) -> int:
+        return _dir_size(self.path)
+
+
+def get_build_dir(
+    root: Path,
+    *,
+    name: str,
+    project_dir: Path | None,
+    wheel_tag: str,
+    build_type: str,
+    state: str,
+    fingerprint: str,
+) -> Path:
+    """
+    Get (and mark as used) the cached build directory for this build. The
+    entry is keyed by the project directory, wheel tag, build type, and
+    configure fingerprint. Pass None for the project directory to share the
+    entry between copies of the project (relocatable builds). The state is
+    only recorded: editable and regular wheel builds share a build directory,
+    since they only differ in ``SKBUILD_STATE`` and the install location,
+    which don't cause a recompile.
+    """
+    info: dict[str, Any] = {
+        "name": name,
+        "project_dir": str(project_dir.resolve()) if project_dir else "",
+        "wheel_tag": wheel_tag,
+        "build_type": build_type,
+        "fingerprint": fingerprint,
+    }
+    key = hashlib.sha256(json.dumps(info, sort_keys=True).encode("utf-8"))
+    entry = root / f"{name}-{key.hexdigest()[:16]}"
+    entry.mkdir(parents=True, exist_ok=True)
+
+    info["state"] = state
+    info["last_used"] = time.time()
+    entry.joinpath(ENTRY_INFO).write_text(json.dumps(info, indent=2), encoding="utf-8")
+    return entry / "build"
+
+
+def _file_hashes(path: Path) -> dict[str, str]:
+    hashes = {}
+    for file in sorted(p for p in path.rglob("*") if p.is_file()):
+        digest = hashlib.sha256()
+        with file.open("rb") as f:
+            for chunk in iter(lambda: f.read(2**20), b""):
+                digest.update(chunk)
+        hashes[file.relative_to(path).as_posix()] = digest.hexdigest()
+    return hashes
+
+
+def _artifact_entry(root: Path, *, name: str, state: str, fingerprint: str) -> Path:
+    return root / f"{name}-{state}-{fingerprint[:16]}"
+
+
+def store_artifact(
+    root: Path, source: Path, *, name: str, state: str, fingerprint: str
+) -> Path:
+    """
+    Store a copy of ``source`` (a wheel or a staged install tree) for the
+    build with this fingerprint, with the hashes of its files. The entry is
+    written next to its final location and moved there when complete.
+    """
+    entry = _artifact_entry(root, name=name, state=state, fingerprint=fingerprint)
+    root.mkdir(parents=True, exist_ok=True)
+    tmp_entry = Path(tempfile.mkdtemp(prefix=f".{entry.name}-", dir=root))
+    try:
+        artifact = tmp_entry / "artifact"
+        if source.is_dir():
+            shutil.copytree(source, artifact)
+        else:
+            artifact.mkdir()
+            shutil.copy2(source, artifact / source.name)
+        info = {
+            "name": name,
+            "state": state,
+            "fingerprint": fingerprint,
+            "files": _file_hashes(artifact),
+            "last_used": time.time(),
+        }
+        tmp_entry.joinpath(ENTRY_INFO).write_text(
+            json.dumps(info, indent=2), encoding="utf-8"
+        )
+        shutil.rmtree(entry, ignore_errors=True)
+        tmp_entry.rename(entry)
+    finally:
+        shutil.rmtree(tmp_entry, ignore_errors=True)
+    return entry / "artifact"
+
+
+def verify_entry(entry: CacheEntry) -> list[str]:
+    """
+    The stored files of an artifact cache entry that are missing, changed or
+    unexpected. Empty if the entry is intact.
+    """
+    expected: dict[str, str] = entry.info.get("files", {})
+    actual = _file_hashes(entry.artifact) if entry.artifact.is_dir() else {}
+    return sorted(
+        name
+        for name in expected.keys() | actual.keys()
+        if expected.get(name) != actual.get(name)
+    )
+
+
+def restore_artifact(
+    root: Path, *, name: str, state: str, fingerprint: str
+) -> Path | None:
+    """
+    Get (and mark as used) the stored artifact for the build with this
+    fingerprint, or None if there is none. A damaged entry is removed.
+    """
+    path = _artifact_entry(root, name=name, state=state, fingerprint=fingerprint)
+    try:
+        info = json.loads(path.joinpath(ENTRY_INFO).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    entry = CacheEntry(path, info)
+    if info.get("fingerprint") != fingerprint:
+        return None
+
+    damaged = verify_entry(entry)
+    if damaged:
+        logger.warning(
+            "Artifact cache entry {} is damaged ({}), removing", path, damaged
+        )
+        shutil.rmtree(path, ignore_errors=True)
+        return None
+
+    info["last_used"] = time.time()
+    path.joinpath(ENTRY_INFO).write_text(json.dumps(info, indent=2), encoding="utf-8")
+    return entry.artifact
+
+
+def list_entries(root: Path) -> list[CacheEntry]:
+    """
+    All cache entries, most recently used first.
+    """
+    entries = []
+    if root.is_dir():
+        for path in root.iterdir():
+            info_file = path / ENTRY_INFO
+            try:
+                info = json.loads(info_file.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            entries.append(CacheEntry(path, info))
+    return sorted(entries, key=lambda e: e.last_used, reverse=True)
+
+
+def prune(root: Path, max_size: int, *, keep: Sequence[Path] = ()) -> list[CacheEntry]:
+    """
+    Remove the least recently used entries until the cache is no larger than
+    ``max_size`` bytes. Entries containing a path in ``keep`` are never
+    removed, and neither are entries a running build has locked. Returns the
+    removed entries.
+    """
+    keep_resolved = {p.resolve() for p in keep}
+    entries = [(e, e.size()) for e in list_entries(root)]
+    total = sum(size for _, size in entries)
+    removed = []
+
+    for entry, size in reversed(entries):
+        if total <= max_size:
+            break
+        entry_path = entry.path.resolve()
+        if any(entry_path in (k, *k.parents) for k in keep_resolved):
+            continue
+        with try_lock_build_dir(entry.build_dir) as locked:
+            if not locked:
+                logger.info("Skipping build cache entry {} (in use)", entry.path)
+                continue
+            logger.info("Removing build cache entry {} ({} bytes)", entry.path, size)
+            shutil.rmtree(entry.path, ignore_errors=True)
+        total -= size
+        removed.append(entry)
+
+    return removed
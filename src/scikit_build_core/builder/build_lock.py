@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import contextlib
+import os
+import sys
+import time
+from typing import IO, TYPE_CHECKING
+
+from .._logging import logger, rich_print
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from pathlib import Path
+
+__all__ = ["lock_build_dir", "try_lock_build_dir"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+LOCK_FILE = ".skbuild-lock"
+
+
+if sys.platform == "win32":
+    import msvcrt
+
+    def _try_lock(f: IO[bytes]) -> bool:
+        # Locks the first byte
+        f.seek(0)
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+
+    def _lock(f: IO[bytes], *, blocking: bool) -> bool:
+        # LK_LOCK would give up after 10 seconds, so this polls instead
+        while not _try_lock(f):
+            if not blocking:
+                return False
+            time.sleep(0.1)
+        return True
+
+    def _unlock(f: IO[bytes]) -> None:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _lock(f: IO[bytes], *, blocking: bool) -> bool:
+        flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+        try:
+            fcntl.flock(f.fileno(), flags)
+        except BlockingIOError:
+            return False
+        return True
+
+    def _unlock(f: IO[bytes]) -> None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _is_current(f: IO[bytes], path: Path) -> bool:
+    try:
+        return os.path.samestat(os.fstat(f.fileno()), path.stat())
+    except FileNotFoundError:
+        return False
+
+
+@contextlib.contextmanager
+def lock_build_dir(build_dir: Path) -> Generator[None, None, None]:
+    """
+    Hold an exclusive lock on a build directory, waiting for other builds
+    (in any process) using it to finish. The operating system releases the
+    lock if a build is killed, so a lock is never left behind. If the
+    directory is removed while waiting (a build cache prune), it is created
+    and locked again.
+    """
+    while True:
+        build_dir.mkdir(parents=True, exist_ok=True)
+        lock_file = build_dir / LOCK_FILE
+        with lock_file.open("a+b") as f:
+            if not _lock(f, blocking=False):
+                rich_print(
+                    "{yellow}***",
+                    "{bold}Waiting for another build using {build_dir}...",
+                    build_dir=build_dir,
+                )
+                start = time.perf_counter()
+                _lock(f, blocking=True)
+                logger.info(
+                    "Waited {:.1f}s for the build directory lock",
+                    time.perf_counter() - start,
+                )
+            if not _is_current(f, lock_file):
+                _unlock(f)
+                continue
+            try:
+                yield
+            finally:
+                _unlock(f)
+            return
+
+
+@contextlib.contextmanager
+def try_lock_build_dir(build_dir: Path) -> Generator[bool, None, None]:
+    """
+    Take the lock on a build directory if no other build holds it, without
+    waiting. Yields whether the lock was taken; a directory that doesn't
+    exist has no build using it, so it counts as taken.
+    """
+    if not build_dir.is_dir():
+        yield True
+        return
+    with build_dir.joinpath(LOCK_FILE).open("a+b") as f:
+        if not _lock(f, blocking=False):
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            _unlock(f)
@@ -1,34 +1,57 @@
 from __future__ import annotations
 
 import dataclasses
+import functools
+import importlib
+import importlib.util
+import json
 import os
 import re
 import shlex
+import shutil
 import sys
 import sysconfig
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from packaging.version import Version
+
 from .. import __version__
 from .._compat.importlib import metadata, resources
-from .._logging import logger
+from .._logging import logger, rich_print
+from .._shutil import _hardlink_symlinks
+from ..errors import FailedLiveProcessError
 from ..resources import find_python
+from .build_cache import user_cache_dir
+from .compiler_launcher import get_compiler_launcher
+from .configure_profile import PROFILE_FILE, read_profile
 from .generator import set_environment_for_gen
+from .jobserver import Jobserver, read_build_tool
+from .ninja_report import analyze, ninja_log_offset
+from .parallel import get_cpu_count, get_parallel_level
+from .python_snapshot import get_python_snapshot
 from .sysconfig import (
-    get_numpy_include_dir,
     get_platform,
-    get_python_include_dir,
     get_python_library,
     get_soabi,
 )
+from .toolchain_cache import (
+    compiler_checks_failed,
+    configure_log_offsets,
+    get_toolchain_root,
+    save_toolchain,
+    seed_toolchain,
+    toolchain_key,
+)
 
 if TYPE_CHECKING:
     from collections.abc import Generator, Iterable, Mapping, Sequence
-
-    from packaging.version import Version
+    from importlib.metadata import EntryPoint
 
     from ..cmake import CMaker
     from ..settings.skbuild_model import ScikitBuildSettings
+    from .compiler_launcher import CompilerLauncher
+    from .interpreter import Interpreter
 
 __all__ = ["Builder", "archs_to_tags", "get_archs"]
 
@@ -97,6 +120,103 @@ def _sanitize_path(path: os.PathLike[str]) -> list[Path]:
     return [Path(os.fspath(path))]
 
 
+ENTRY_POINT_GROUPS = ("cmake.module", "cmake.prefix", "cmake.root")
+
+
+def _entry_point_dirs(ep: EntryPoint) -> list[Path] | None:
+    """
+    Find the directories of an entry point package without importing it, from
+    the files of its distribution or (for a top-level package) the import
+    system. Returns None if they can't be found this way.
+    """
+    module, _, attr = (part.strip() for part in ep.value.partition(":"))
+    if attr:
+        return None
+
+    dist = getattr(ep, "dist", None)
+    files = dist.files if dist is not None else None
+    if dist is not None and files:
+        rel_dir = module.replace(".", "/")
+        if any(f.as_posix().startswith(f"{rel_dir}/") for f in files):
+            path = Path(os.fspath(dist.locate_file(rel_dir)))
+            if path.is_dir():
+                return [path]
+
+    # Finding a submodule would import the parent package
+    if "." not in module:
+        spec = importlib.util.find_spec(module)
+        if spec is not None and spec.submodule_search_locations:
+            return [Path(p) for p in spec.submodule_search_locations]
+
+    return None
+
+
+def _sys_path_key() -> tuple[tuple[str, int], ...]:
+    """
+    ``sys.path`` with the modification times of its entries, which change when
+    a distribution is installed or removed there.
+    """
+    key = []
+    for path in sys.path:
+        try:
+            mtime = Path(path or ".").stat().st_mtime_ns
+        except OSError:
+            mtime = 0
+        key.append((path, mtime))
+    return tuple(key)
+
+
+@functools.lru_cache(maxsize=None)
+def _entry_point_search_paths(
+    sys_path_key: tuple[tuple[str, int], ...],
+) -> dict[str, dict[str, list[Path]]]:
+    """
+    Get the search paths from the entry points of all groups, for the
+    environment given by ``sys_path_key`` (see :func:`_sys_path_key`).
+    """
+    logger.debug("Reading search path entry-points for {}", sys_path_key)
+    # Something was installed or removed since the last scan
+    importlib.invalidate_caches()
+    all_paths: dict[str, dict[str, list[Path]]] = {}
+    for group, eps in metadata.entry_points_by_group(ENTRY_POINT_GROUPS).items():
+        search_paths = {}
+        if eps:
+            logger.debug(
+                "Loading search paths {} from entry-points: {}", group, len(eps)
+            )
+        for ep in eps:
+            ep_value = _entry_point_dirs(ep)
+            if ep_value is None:
+                ep_value = _sanitize_path(resources.files(ep.load()))
+            logger.debug("{}: {} -> {}", ep.name, ep.value, ep_value)
+            if ep_value:
+                search_paths[ep.name] = ep_value
+        all_paths[group] = search_paths
+    return all_paths
+
+
+# Install steps CMake skips for files installed as symlinks
+_LINKED_RPATH_RE = re.compile(r"file\(RPATH_(?:CHANGE|REMOVE|SET)\b|install_name_tool")
+
+
+def _linked_install_changes(build_dir: Path, *, strip: bool) -> str:
+    """
+    Describe the edits the install scripts make to installed files, which
+    CMake skips for symlinks (the hardlink mode makes its links afterwards).
+    Empty if a linked install gives the same files as a copy.
+    """
+    for script in build_dir.rglob("cmake_install.cmake"):
+        try:
+            text = script.read_text(encoding="utf-8")
+        except OSError:
+            continue
+        if _LINKED_RPATH_RE.search(text):
+            return "changes RPATHs"
+        if strip and "CMAKE_INSTALL_DO_STRIP" in text:
+            return "strips binaries"
+    return ""
+
+
 @dataclasses.dataclass
 class Builder:
     settings: ScikitBuildSettings
@@ -120,20 +240,18 @@ class Builder:
     def get_generator(self, *args: str) -> str | None:
         return self.config.get_generator(*self.get_cmake_args(), *args)
 
+    @functools.cached_property
+    def compiler_launcher(self) -> CompilerLauncher | None:
+        """
+        The compiler launcher from ``build.compiler-launcher``, looked up once
+        for the configure and the build.
+        """
+        return get_compiler_launcher(self.settings.build.compiler_launcher)
+
     def _get_entry_point_search_path(self, entry_point: str) -> dict[str, list[Path]]:
         """Get the search path dict from the entry points"""
-        search_paths = {}
-        eps = metadata.entry_points(group=entry_point)
-        if eps:
-            logger.debug(
-                "Loading search paths {} from entry-points: {}", entry_point, len(eps)
-            )
-            for ep in eps:
-                ep_value = _sanitize_path(resources.files(ep.load()))
-                logger.debug("{}: {} -> {}", ep.name, ep.value, ep_value)
-                if ep_value:
-                    search_paths[ep.name] = ep_value
-        return search_paths
+        search_paths = _entry_point_search_paths(_sys_path_key())[entry_point]
+        return {name: list(paths) for name, paths in search_paths.items()}
 
     def configure(
         self,
@@ -144,7 +262,15 @@ class Builder:
         version: Version | None = None,
         limited_api: bool | None = None,
         configure_args: Iterable[str] = (),
+        interpreter: Interpreter | None = None,
     ) -> None:
+        """
+        Configure the project. The build is for ``interpreter`` if given,
+        instead of the running interpreter; only the Python parts of the
+        configuration change, so a build directory can be configured for
+        several interpreters in turn and only the targets that use Python
+        are compiled again.
+        """
         cmake_defines = {
             k: ("TRUE" if v else "FALSE") if isinstance(v, bool) else str(v)
             for k, v in defines.items()
@@ -182,14 +308,21 @@ class Builder:
                 logger.debug("PATH: {}", sys.path)
 
         # Add the FindPython backport if needed
-        if self.config.cmake.version < self.settings.backport.find_python:
+        find_python_backport = (
+            self.config.cmake.version < self.settings.backport.find_python
+        )
+        if find_python_backport:
             fp_dir = Path(find_python.__file__).parent.resolve()
             self.config.module_dirs.append(fp_dir)
             logger.debug("FindPython backport activated at {}", fp_dir)
 
         current_gen = self.get_generator(*configure_args)
         local_def = set_environment_for_gen(
-            current_gen, self.config.cmake, self.config.env, self.settings.ninja
+            current_gen,
+            self.config.cmake,
+            self.config.env,
+            self.settings.ninja,
+            multi_config=bool(self.config.extra_build_types),
         )
         cmake_defines.update(local_def)
 
@@ -207,51 +340,121 @@ class Builder:
             )
             cache_config["SKBUILD_PROJECT_VERSION_FULL"] = str(version)
 
+        # A build directory shared by several interpreters keeps the values
+        # of the last one, so the ones this interpreter doesn't have are unset
+        shared_interpreters = interpreter is not None
+
+        # Another interpreter is described by a probe, not by this process
+        if interpreter is not None and interpreter.is_current:
+            interpreter = None
+        if interpreter is not None:
+            logger.info("Configuring for Python {}", interpreter.executable)
+            implementation = interpreter.implementation
+            current_minor = interpreter.version[1]
+            free_threaded = interpreter.free_threaded
+        else:
+            implementation = sys.implementation.name
+            current_minor = sys.version_info.minor
+            free_threaded = bool(sysconfig.get_config_var("Py_GIL_DISABLED"))
+
         if limited_api is None:
             if self.settings.wheel.py_api.startswith("cp3"):
                 target_minor_version = int(self.settings.wheel.py_api[3:])
-                limited_api = target_minor_version <= sys.version_info.minor
+                limited_api = target_minor_version <= current_minor
             else:
                 limited_api = False
 
-        if limited_api and sys.implementation.name != "cpython":
+        if limited_api and implementation != "cpython":
             limited_api = False
             logger.info("PyPy doesn't support the Limited API, ignoring")
 
-        if limited_api and sysconfig.get_config_var("Py_GIL_DISABLED"):
+        if limited_api and free_threaded:
             limited_api = False
             logger.info(
                 "Free-threaded Python doesn't support the Limited API currently, ignoring"
             )
 
-        python_library = get_python_library(self.config.env, abi3=False)
-        python_sabi_library = (
-            get_python_library(self.config.env, abi3=True) if limited_api else None
-        )
-        python_include_dir = get_python_include_dir()
-        numpy_include_dir = get_numpy_include_dir()
+        snapshot = None
+        if interpreter is not None:
+            python_executable = interpreter.executable
+            python_prefix = interpreter.prefix
+            python_library = Path(interpreter.library) if interpreter.library else None
+            python_sabi_library = (
+                Path(interpreter.sabi_library)
+                if limited_api and interpreter.sabi_library
+                else None
+            )
+            python_include_dir = Path(interpreter.include_dir)
+            numpy_include_dir = (
+                Path(interpreter.numpy_include_dir)
+                if interpreter.numpy_include_dir
+                else None
+            )
+            if limited_api:
+                soabi = get_soabi(self.config.env, abi3=True)
+            else:
+                soabi = interpreter.soabi
+        else:
+            python_executable = sys.executable
+            python_prefix = sys.prefix
+            python_library = get_python_library(self.config.env, abi3=False)
+            python_sabi_library = (
+                get_python_library(self.config.env, abi3=True) if limited_api else None
+            )
+            snapshot = get_python_snapshot(self.config.build_dir)
+            python_include_dir = Path(snapshot.include_dir)
+            numpy_include_dir = (
+                Path(snapshot.numpy_include_dir) if snapshot.numpy_include_dir else None
+            )
+            soabi = get_soabi(self.config.env, abi3=limited_api)
 
         # Classic Find Python
-        cache_config["PYTHON_EXECUTABLE"] = sys.executable
+        cache_config["PYTHON_EXECUTABLE"] = python_executable
         cache_config["PYTHON_INCLUDE_DIR"] = python_include_dir
+
+        # CMake searches again for a find result set to <VAR>-NOTFOUND
+        def unset(key: str) -> None:
+            if shared_interpreters:
+                cache_config[key] = f"{key}-NOTFOUND"
+
         if python_library:
             cache_config["PYTHON_LIBRARY"] = python_library
+        else:
+            unset("PYTHON_LIBRARY")
 
         # Modern Find Python
         for prefix in ("Python", "Python3"):
-            cache_config[f"{prefix}_EXECUTABLE"] = sys.executable
-            cache_config[f"{prefix}_ROOT_DIR"] = sys.prefix
+            cache_config[f"{prefix}_EXECUTABLE"] = python_executable
+            cache_config[f"{prefix}_ROOT_DIR"] = python_prefix
             cache_config[f"{prefix}_INCLUDE_DIR"] = python_include_dir
             cache_config[f"{prefix}_FIND_REGISTRY"] = "NEVER"
             # FindPython may break if this is set - only useful on Windows
-            if python_library and sysconfig.get_platform().startswith("win"):
-                cache_config[f"{prefix}_LIBRARY"] = python_library
-            if python_sabi_library and sysconfig.get_platform().startswith("win"):
-                cache_config[f"{prefix}_SABI_LIBRARY"] = python_sabi_library
+            if sysconfig.get_platform().startswith("win"):
+                if python_library:
+                    cache_config[f"{prefix}_LIBRARY"] = python_library
+                else:
+                    unset(f"{prefix}_LIBRARY")
+                if python_sabi_library:
+                    cache_config[f"{prefix}_SABI_LIBRARY"] = python_sabi_library
+                else:
+                    unset(f"{prefix}_SABI_LIBRARY")
             if numpy_include_dir:
                 cache_config[f"{prefix}_NumPy_INCLUDE_DIR"] = numpy_include_dir
-
-        cache_config["SKBUILD_SOABI"] = get_soabi(self.config.env, abi3=limited_api)
+            else:
+                unset(f"{prefix}_NumPy_INCLUDE_DIR")
+            # Seed the results of the interpreter queries, which are only
+            # known to match the bundled FindPython
+            if (
+                find_python_backport
+                and snapshot is not None
+                and snapshot.interpreter_properties
+            ):
+                cache_config[f"_{prefix}_EXECUTABLE"] = sys.executable
+                cache_config[f"_{prefix}_INTERPRETER_PROPERTIES"] = (
+                    snapshot.interpreter_properties
+                )
+
+        cache_config["SKBUILD_SOABI"] = soabi
 
         # Allow CMakeLists to detect this is supposed to be a limited ABI build
         cache_config["SKBUILD_SABI_COMPONENT"] = (
@@ -266,6 +469,9 @@ class Builder:
             else ""
         )
 
+        if self.settings.search.fetchcontent_cache:
+            self._setup_fetchcontent_cache(cache_config)
+
         if cache_entries:
             cache_config.update(cache_entries)
 
@@ -277,28 +483,200 @@ class Builder:
             if archs:
                 cmake_defines["CMAKE_OSX_ARCHITECTURES"] = ";".join(archs)
 
+        launcher = self.compiler_launcher
+        if launcher is not None:
+            launcher.setup_env(
+                self.config.env,
+                name=(name or "default").replace("-", "_").replace(".", "_"),
+                source_dir=self.config.source_dir,
+                build_dir=self.config.build_dir,
+            )
+            # Don't override launchers set in the environment or CMake args
+            user_args = " ".join(self.get_cmake_args())
+            cmake_defines.update(
+                {
+                    k: v
+                    for k, v in launcher.defines().items()
+                    if k not in self.config.env and k not in user_args
+                }
+            )
+
         # Add the pre-defined or passed CMake defines
         cmake_defines.update(self.settings.cmake.define)
 
-        self.config.configure(
-            defines=cmake_defines,
-            cmake_args=[*self.get_cmake_args(), *configure_args],
+        cmake_args = [*self.get_cmake_args(), *configure_args]
+
+        toolchain_entry = None
+        seeded = False
+        if self.settings.build.toolchain_cache:
+            toolchain_entry = get_toolchain_root() / toolchain_key(
+                self.config.cmake,
+                generator=current_gen,
+                env=self.config.env,
+                defines=cmake_defines,
+                cmake_args=cmake_args,
+            )
+            seeded = seed_toolchain(
+                self.config.build_dir, toolchain_entry, env=self.config.env
+            )
+
+        profile_trace = None
+        if self.settings.cmake.profile:
+            if self.config.cmake.version < Version("3.18"):
+                logger.warning("cmake.profile requires CMake 3.18+, not profiling")
+            else:
+                profile_trace = self.config.build_dir / PROFILE_FILE
+                cmake_args = [
+                    *cmake_args,
+                    "--profiling-format=google-trace",
+                    f"--profiling-output={profile_trace}",
+                ]
+
+        log_offsets = configure_log_offsets(self.config.build_dir) if seeded else {}
+        try:
+            self.config.configure(defines=cmake_defines, cmake_args=cmake_args)
+        except FailedLiveProcessError:
+            if not seeded or not compiler_checks_failed(
+                self.config.build_dir, log_offsets
+            ):
+                raise
+            assert toolchain_entry is not None
+            # The cached detection is outdated, so start over without it
+            logger.warning(
+                "Configure failed compiler checks with the cached toolchain, retrying"
+            )
+            shutil.rmtree(toolchain_entry, ignore_errors=True)
+            self.config.build_dir.joinpath("CMakeCache.txt").unlink(missing_ok=True)
+            shutil.rmtree(self.config.build_dir / "CMakeFiles", ignore_errors=True)
+            self.config.configure(defines=cmake_defines, cmake_args=cmake_args)
+            seeded = False
+
+        if toolchain_entry is not None and not seeded and not toolchain_entry.exists():
+            save_toolchain(
+                self.config.build_dir,
+                toolchain_entry,
+                version=str(self.config.cmake.version),
+            )
+
+        if profile_trace is not None:
+            profile = read_profile(profile_trace)
+            if profile is None:
+                logger.warning("Could not read the CMake profile {}", profile_trace)
+            else:
+                profile.print(self.config.source_dir)
+
+    def _setup_fetchcontent_cache(
+        self, cache_config: dict[str, str | Path | bool]
+    ) -> None:
+        if self.config.cmake.version < Version("3.24"):
+            logger.warning("search.fetchcontent-cache requires CMake 3.24+, ignoring")
+            return
+        user_args = " ".join([*self.get_cmake_args(), *self.settings.cmake.define])
+        if "CMAKE_PROJECT_TOP_LEVEL_INCLUDES" in user_args:
+            logger.warning(
+                "search.fetchcontent-cache sets CMAKE_PROJECT_TOP_LEVEL_INCLUDES, "
+                "which is already set, ignoring"
+            )
+            return
+
+        fetchcontent_cache = user_cache_dir() / "scikit-build-core" / "fetchcontent"
+        logger.info("FetchContent cache: {}", fetchcontent_cache)
+        cache_config["CMAKE_PROJECT_TOP_LEVEL_INCLUDES"] = (
+            DIR.parent / "resources/fetchcontent_provider.cmake"
         )
+        cache_config["SKBUILD_FETCHCONTENT_CACHE"] = fetchcontent_cache
+        disconnected = self.settings.search.fetchcontent_disconnected
+        cache_config["SKBUILD_FETCHCONTENT_DISCONNECTED"] = disconnected
+        # Not turned off, that's up to the user
+        if disconnected:
+            cache_config["FETCHCONTENT_FULLY_DISCONNECTED"] = True
 
     def build(self, build_args: Sequence[str]) -> None:
         build_tool_args = self.settings.build.tool_args
         if build_tool_args:
             build_args = [*build_args, "--", *build_tool_args]
 
+        launcher = self.compiler_launcher
+        stats = launcher.get_stats(self.config.env) if launcher else None
+        log_offset = (
+            ninja_log_offset(self.config.build_dir) if self.settings.build.report else 0
+        )
+
+        # Share the jobs of a parent parallel build (make -j, etc.) instead of
+        # oversubscribing the machine, unless the user set the level explicitly
+        jobserver = Jobserver.from_env(os.environ)
+        if (
+            jobserver is not None
+            and "CMAKE_BUILD_PARALLEL_LEVEL" not in self.config.env
+        ):
+            self._build_with_jobserver(jobserver, build_args)
+        else:
+            # An explicit CMAKE_BUILD_PARALLEL_LEVEL from the user always wins
+            if (
+                self.settings.build.parallel
+                and "CMAKE_BUILD_PARALLEL_LEVEL" not in self.config.env
+            ):
+                parallel = get_parallel_level(self.settings.build.parallel)
+                if parallel is not None:
+                    self.config.env["CMAKE_BUILD_PARALLEL_LEVEL"] = str(parallel)
+
+            self._build(build_args)
+
+        if self.settings.build.report:
+            self._report(log_offset)
+
+        if launcher and stats:
+            new_stats = launcher.get_stats(self.config.env)
+            if new_stats:
+                rich_print(
+                    "{green}***",
+                    f"{{bold}}Compiler cache ({launcher.name}):{{normal}} "
+                    f"{new_stats[0] - stats[0]} hits, {new_stats[1] - stats[1]} misses",
+                )
+
+    def _report(self, log_offset: int) -> None:
+        report = analyze(self.config.build_dir, log_offset)
+        if report is None:
+            logger.info("No Ninja log found, skipping the build report")
+            return
+        report.print()
+        if self.settings.build.report_json:
+            report_json = Path(self.settings.build.report_json)
+            report_json.parent.mkdir(parents=True, exist_ok=True)
+            report_json.write_text(
+                json.dumps(report.to_dict(), indent=2), encoding="utf-8"
+            )
+
+    def _build_with_jobserver(
+        self, jobserver: Jobserver, build_args: Sequence[str]
+    ) -> None:
+        generator, make_program = read_build_tool(self.config.build_dir)
+        if jobserver.supports(generator, make_program):
+            logger.info("{} will join the jobserver", generator)
+            self._build(build_args, pass_fds=jobserver.pass_fds)
+            return
+
+        # The build tool can't talk to the jobserver, so take tokens for it
+        jobs = get_parallel_level(self.settings.build.parallel) or get_cpu_count()
+        with jobserver.acquire(jobs) as granted:
+            self.config.env["CMAKE_BUILD_PARALLEL_LEVEL"] = str(granted)
+            try:
+                self._build(build_args)
+            finally:
+                del self.config.env["CMAKE_BUILD_PARALLEL_LEVEL"]
+
+    def _build(self, build_args: Sequence[str], pass_fds: Sequence[int] = ()) -> None:
         self.config.build(
             build_args=build_args,
             targets=self.settings.build.targets,
             verbose=self.settings.build.verbose,
+            pass_fds=pass_fds,
         )
 
-    def install(self, install_dir: Path | None) -> None:
+    def install(self, install_dir: Path | None, build_type: str | None = None) -> None:
         """
-        Install to a path.
+        Install to a path. ``build_type`` picks a configuration of a
+        multi-config build (the build type by default).
 
         Warning: if a package hard-codes CMAKE_INSTALL_PREFIX in the install
         commands, this will not rewrite those; set that variable when
@@ -307,4 +685,43 @@ class Builder:
         components = self.settings.install.components
         strip = self.settings.install.strip
         assert strip is not None
-        self.config.install(install_dir, strip=strip, components=components)
+        if build_type is not None and build_type not in {"Release", "MinSizeRel"}:
+            # Keep the debug information of the other configurations
+            strip = False
+
+        mode = self.settings.install.mode
+        if mode != "copy" and self.config.cmake.version < Version("3.22"):
+            logger.warning(
+                "install.mode = {!r} requires CMake 3.22+, copying instead", mode
+            )
+            mode = "copy"
+        if mode != "copy":
+            changes = _linked_install_changes(self.config.build_dir, strip=strip)
+            if changes:
+                logger.warning(
+                    "install.mode = {!r}: the install {}, which CMake skips for "
+                    "linked files, copying instead",
+                    mode,
+                    changes,
+                )
+                mode = "copy"
+
+        linked = mode != "copy" and "CMAKE_INSTALL_MODE" not in self.config.env
+        if linked:
+            self.config.env["CMAKE_INSTALL_MODE"] = "ABS_SYMLINK_OR_COPY"
+        try:
+            self.config.install(
+                install_dir, strip=strip, components=components, build_type=build_type
+            )
+        finally:
+            if linked:
+                del self.config.env["CMAKE_INSTALL_MODE"]
+
+        if mode == "hardlink" and install_dir is not None:
+            _hardlink_symlinks(install_dir)
+
+    def installed_files(self) -> list[Path]:
+        """
+        The files written by :meth:`install`.
+        """
+        return self.config.installed_files(self.settings.install.components)
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+import os
+import shutil
+import subprocess
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .._logging import logger
+from .._shutil import Run
+from .build_cache import user_cache_dir
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, MutableMapping
+
+__all__ = ["LANGUAGES", "CompilerLauncher", "get_compiler_launcher"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+LANGUAGES = ("C", "CXX", "CUDA", "Fortran")
+KNOWN_LAUNCHERS = ("ccache", "sccache")
+
+
+@dataclasses.dataclass(frozen=True)
+class CompilerLauncher:
+    path: Path
+
+    @property
+    def name(self) -> str:
+        """
+        The kind of launcher, "ccache", "sccache", or the program name if
+        unknown.
+        """
+        return self.path.stem.lower()
+
+    def defines(self) -> dict[str, str]:
+        """
+        The CMake defines to use this launcher for all supported languages.
+        """
+        return {f"CMAKE_{lang}_COMPILER_LAUNCHER": str(self.path) for lang in LANGUAGES}
+
+    def setup_env(
+        self,
+        env: MutableMapping[str, str],
+        *,
+        name: str,
+        source_dir: Path,
+        build_dir: Path,
+    ) -> None:
+        """
+        Point the cache to a per-project directory and, for ccache, rewrite
+        absolute paths relative to the common parent of the source and build
+        directories (unless that is the filesystem root) so cache hits survive
+        a different (temporary) build directory. User settings in
+        the environment are never overridden. Note that sccache only reads
+        ``SCCACHE_DIR`` when its server starts.
+        """
+        if self.name not in KNOWN_LAUNCHERS:
+            return
+
+        cache_dir = user_cache_dir() / "scikit-build-core" / self.name / name
+        env.setdefault(f"{self.name.upper()}_DIR", str(cache_dir))
+
+        if self.name == "ccache":
+            base_dir = Path(
+                os.path.commonpath([source_dir.resolve(), build_dir.resolve()])
+            )
+            # The filesystem root would make every absolute path relative, so
+            # unrelated projects could share cache hits
+            if base_dir.parent != base_dir:
+                env.setdefault("CCACHE_BASEDIR", str(base_dir))
+            if "CCACHE_HASHDIR" not in env:
+                env.setdefault("CCACHE_NOHASHDIR", "1")
+
+        logger.debug(
+            "{} environment: {}",
+            self.name,
+            {k: v for k, v in env.items() if k.startswith(self.name.upper())},
+        )
+
+    def get_stats(self, env: Mapping[str, str]) -> tuple[int, int] | None:
+        """
+        Get the total (hits, misses) from the cache, or None if unavailable.
+        """
+        try:
+            if self.name == "ccache":
+                result = Run(env=dict(env)).capture(self.path, "--print-stats")
+                stats = dict(
+                    line.split("\t", 1)
+                    for line in result.stdout.splitlines()
+                    if "\t" in line
+                )
+                hits = sum(
+                    int(v)
+                    for k, v in stats.items()
+                    if k
+                    in {
+                        "direct_cache_hit",
+                        "preprocessed_cache_hit",
+                        "cache_hit_direct",
+                        "cache_hit_preprocessed",
+                    }
+                )
+                return hits, int(stats.get("cache_miss", 0))
+
+            if self.name == "sccache":
+                result = Run(env=dict(env)).capture(
+                    self.path, "--show-stats", "--stats-format=json"
+                )
+                stats = json.loads(result.stdout)["stats"]
+                hits = sum(stats["cache_hits"]["counts"].values())
+                misses = sum(stats["cache_misses"]["counts"].values())
+                return hits, misses
+        except (subprocess.CalledProcessError, OSError, ValueError, KeyError):
+            logger.debug("Could not read {} statistics", self.name)
+
+        return None
+
+
+def get_compiler_launcher(setting: str) -> CompilerLauncher | None:
+    """
+    Find the compiler launcher from the ``build.compiler-launcher`` setting.
+    "auto" finds the first known launcher on the PATH; anything else is a
+    program name or path. Returns None if not set or not found.
+    """
+    if not setting:
+        return None
+
+    candidates = KNOWN_LAUNCHERS if setting == "auto" else (setting,)
+    for candidate in candidates:
+        launcher = shutil.which(candidate)
+        if launcher is not None:
+            logger.info("Compiler launcher: {}", launcher)
+            return CompilerLauncher(Path(launcher))
+
+    if setting == "auto":
+        logger.debug("No compiler launcher found")
+    else:
+        logger.warning("Compiler launcher {} not found, ignoring", setting)
+    return None
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .._logging import rich_print
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+__all__ = [
+    "Command",
+    "ConfigureProfile",
+    "read_profile",
+]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+PROFILE_FILE = ".skbuild-configure-profile.json"
+
+# Command arguments are shortened to this length in the report
+ARGS_WIDTH = 60
+
+# Faster commands and files are not worth reporting
+MIN_US = 10_000
+
+
+@dataclasses.dataclass(frozen=True)
+class Command:
+    name: str
+    args: str
+    file: str
+    line: int
+    # Times in microseconds; self_us excludes the nested commands
+    duration_us: int
+    self_us: int
+
+    @property
+    def location(self) -> str:
+        return f"{self.file}:{self.line}"
+
+    def describe(self) -> str:
+        args = " ".join(self.args.split())
+        if len(args) > ARGS_WIDTH:
+            args = args[: ARGS_WIDTH - 3] + "..."
+        return f"{self.name}({args})"
+
+
+def _parse_events(events: Iterable[dict[str, Any]]) -> list[Command]:
+    """
+    Turn CMake's google-trace events into commands. CMake writes a begin and
+    an end event per command (nested for includes, function calls and the
+    like); complete events with a duration are supported too.
+    """
+    commands: list[Command] = []
+    # The open commands (name, args, start) and the time spent in their
+    # nested commands so far
+    stack: list[tuple[str, dict[str, Any], int]] = []
+    nested: list[int] = []
+
+    def add(name: str, args: dict[str, Any], duration: int, nested_us: int) -> None:
+        file, _, line = str(args.get("location", "")).rpartition(":")
+        commands.append(
+            Command(
+                name=name,
+                args=str(args.get("functionArgs", "")),
+                file=file,
+                line=int(line) if line.isdigit() else 0,
+                duration_us=duration,
+                self_us=max(duration - nested_us, 0),
+            )
+        )
+        if nested:
+            nested[-1] += duration
+
+    for event in events:
+        phase = event.get("ph")
+        if phase == "B":
+            stack.append((event.get("name", ""), event.get("args", {}), event["ts"]))
+            nested.append(0)
+        elif phase == "E" and stack:
+            name, args, start = stack.pop()
+            add(name, args, event["ts"] - start, nested.pop())
+        elif phase == "X":
+            add(event.get("name", ""), event.get("args", {}), event.get("dur", 0), 0)
+
+    return commands
+
+
+@dataclasses.dataclass
+class ConfigureProfile:
+    commands: list[Command]
+    trace: Path
+    top: int = 10
+
+    @property
+    def total_us(self) -> int:
+        return sum(c.self_us for c in self.commands)
+
+    def slowest_commands(self, source_dir: Path) -> list[Command]:
+        """
+        The slowest commands called from the project's own files, including
+        the time spent in what they run (like the modules ``find_package``
+        loads).
+        """
+        source = str(source_dir.resolve())
+        project = [
+            c
+            for c in self.commands
+            if c.duration_us >= MIN_US
+            and (c.file == source or c.file.startswith((f"{source}/", f"{source}\\")))
+        ]
+        return sorted(project, key=lambda c: c.duration_us, reverse=True)[: self.top]
+
+    def slowest_files(self) -> list[tuple[str, int]]:
+        """
+        The files whose commands took the most time, excluding the time spent
+        in other files.
+        """
+        files: dict[str, int] = {}
+        for command in self.commands:
+            files[command.file] = files.get(command.file, 0) + command.self_us
+        slowest = sorted(files.items(), key=lambda item: item[1], reverse=True)
+        return [(file, us) for file, us in slowest[: self.top] if us >= MIN_US]
+
+    def to_dict(self, source_dir: Path) -> dict[str, Any]:
+        return {
+            "total_ms": self.total_us // 1000,
+            "commands": [
+                {
+                    "command": c.describe(),
+                    "location": c.location,
+                    "ms": c.duration_us // 1000,
+                }
+                for c in self.slowest_commands(source_dir)
+            ],
+            "files": [
+                {"file": file, "ms": us // 1000} for file, us in self.slowest_files()
+            ],
+        }
+
+    def print(self, source_dir: Path) -> None:
+        rich_print(
+            "{green}***",
+            f"{{bold}}Configure profile:{{normal}} {len(self.commands)} commands "
+            f"in {self.total_us / 1e6:.1f}s",
+        )
+        commands = self.slowest_commands(source_dir)
+        if commands:
+            rich_print(f"  {{bold}}Slowest {len(commands)} project commands:")
+            # CMake arguments can contain braces, so they are not in the format string
+            for command in commands:
+                rich_print(
+                    f"  {command.duration_us / 1e6:8.2f}s  {{location}}  {{command}}",
+                    location=f"{Path(command.file).name}:{command.line}",
+                    command=command.describe(),
+                )
+        files = self.slowest_files()
+        rich_print(f"  {{bold}}Slowest {len(files)} files (own time):")
+        for file, us in files:
+            rich_print(f"  {us / 1e6:8.2f}s  {{path}}", path=file)
+        rich_print(
+            "  {bold}Trace (for a trace viewer):{normal} {trace}", trace=self.trace
+        )
+
+
+def read_profile(trace: Path, *, top: int = 10) -> ConfigureProfile | None:
+    """
+    Read a trace written by ``cmake --profiling-format=google-trace``. Returns
+    None if it is missing or can't be read.
+    """
+    try:
+        events = json.loads(trace.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(events, list):
+        return None
+    return ConfigureProfile(_parse_events(events), trace, top=top)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m scikit_build_core.builder.configure_profile",
+        description="Report the slowest parts of a profiled CMake configure",
+    )
+    parser.add_argument("trace", type=Path, help="The google-trace profile")
+    parser.add_argument(
+        "--source-dir", type=Path, default=Path(), help="The project directory"
+    )
+    parser.add_argument("--top", type=int, default=10, help="Number of entries")
+    parser.add_argument("--json", action="store_true", help="Output JSON")
+    args = parser.parse_args()
+
+    profile = read_profile(args.trace, top=args.top)
+    if profile is None:
+        msg = f"Could not read the CMake profile {args.trace}"
+        raise SystemExit(msg)
+    if args.json:
+        print(json.dumps(profile.to_dict(args.source_dir), indent=2))  # noqa: T201
+    else:
+        profile.print(args.source_dir)
@@ -6,6 +6,8 @@ import sys
 import sysconfig
 from typing import TYPE_CHECKING
 
+from packaging.version import Version
+
 from .._logging import logger
 from ..errors import NinjaNotFoundError
 from ..program_search import best_program, get_make_programs, get_ninja_programs
@@ -79,6 +81,8 @@ def set_environment_for_gen(
     cmake: CMake,
     env: MutableMapping[str, str],
     ninja_settings: NinjaSettings,
+    *,
+    multi_config: bool = False,
 ) -> Mapping[str, str]:
     """
     This function modifies the environment as needed to safely set a generator.
@@ -88,7 +92,9 @@ def set_environment_for_gen(
     A reasonable default generator is set if the environment does not already
     have one set; if ninja is present, ninja will be used over make on Unix.
 
-    If gen is not None, then that will be the target generator.
+    If gen is not None, then that will be the target generator. If
+    ``multi_config`` is set, Ninja Multi-Config is used instead of a default
+    Ninja.
     """
     allow_make_fallback = ninja_settings.make_fallback
 
@@ -117,11 +123,15 @@ def set_environment_for_gen(
         if cxx:
             env["CXX"] = cxx
 
-    if (generator or "Ninja") == "Ninja":
+    if (generator or "Ninja") in {"Ninja", "Ninja Multi-Config"}:
         ninja = best_program(get_ninja_programs(), version=ninja_settings.version)
 
         if ninja is not None:
-            env.setdefault("CMAKE_GENERATOR", "Ninja")
+            if multi_config and cmake.version < Version("3.17"):
+                logger.warning("Ninja Multi-Config requires CMake 3.17+")
+            elif multi_config:
+                env.setdefault("CMAKE_GENERATOR", "Ninja Multi-Config")
+            env.setdefault("CMAKE_GENERATOR", generator or "Ninja")
             logger.debug("CMAKE_GENERATOR: Using ninja: {}", ninja.path)
             return {"CMAKE_MAKE_PROGRAM": str(ninja.path)}
 
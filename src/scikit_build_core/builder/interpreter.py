@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+import os
+import shutil
+import subprocess
+import sys
+from typing import Any
+
+from .._logging import logger
+from .._shutil import Run
+from ..errors import InterpreterNotFoundError
+from ..resources import resources
+from ..resources._interpreter_info import interpreter_info
+
+__all__ = ["Interpreter"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+# How long an interpreter can take to describe itself
+TIMEOUT = 30
+
+# Short names used in wheel tags, like packaging's interpreter_name
+INTERPRETER_SHORT_NAMES = {
+    "cpython": "cp",
+    "pypy": "pp",
+    "ironpython": "ip",
+    "jython": "jy",
+}
+
+
+@dataclasses.dataclass(frozen=True)
+class Interpreter:
+    """
+    A Python interpreter to build for, which doesn't have to be the one
+    running the build. Everything is read from the interpreter once, so it
+    isn't run again for each build.
+    """
+
+    executable: str
+    prefix: str
+    implementation: str
+    version: tuple[int, int, int]
+    abiflags: str
+    free_threaded: bool
+    include_dir: str
+    numpy_include_dir: str | None
+    ext_suffix: str
+    library: str | None
+    sabi_library: str | None
+    platform: str
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Interpreter:
+        return cls(**{**data, "version": tuple(data["version"])})
+
+    @classmethod
+    def current(cls) -> Interpreter:
+        """
+        The interpreter running the build.
+        """
+        return cls.from_dict(interpreter_info())
+
+    @classmethod
+    def from_executable(cls, executable: str | os.PathLike[str]) -> Interpreter:
+        """
+        Describe the interpreter at a path, or found on the PATH by name (like
+        ``python3.12``).
+        """
+        path = shutil.which(os.fspath(executable))
+        if path is None:
+            msg = f"Could not find the Python interpreter {executable}"
+            raise InterpreterNotFoundError(msg)
+
+        script = resources / "_interpreter_info.py"
+        try:
+            result = Run(timeout=TIMEOUT).capture(
+                path, "-c", script.read_text(encoding="utf-8")
+            )
+            interpreter = cls.from_dict(json.loads(result.stdout))
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as err:
+            msg = f"Could not run the Python interpreter {path}: {err}"
+            raise InterpreterNotFoundError(msg) from None
+        except (OSError, ValueError, TypeError) as err:
+            msg = f"Could not read the Python interpreter {path}: {err}"
+            raise InterpreterNotFoundError(msg) from None
+
+        logger.debug("Interpreter {}: {}", path, interpreter)
+        return interpreter
+
+    @property
+    def is_current(self) -> bool:
+        """
+        True if this is the interpreter running the build (or a virtual
+        environment's link to it).
+        """
+        return (
+            self.prefix == sys.prefix
+            and self.implementation == sys.implementation.name
+            and self.version == tuple(sys.version_info[:3])
+            and self.abiflags == getattr(sys, "abiflags", "")
+        )
+
+    @property
+    def soabi(self) -> str:
+        """
+        The ``SOABI`` of the interpreter, like ``get_soabi`` (``cpython-312-x86_64-linux-gnu``).
+        """
+        return self.ext_suffix.rsplit(".", 1)[0].lstrip(".")
+
+    @property
+    def interpreter_tag(self) -> str:
+        """
+        The interpreter part of a wheel tag, like ``cp312``.
+        """
+        name = INTERPRETER_SHORT_NAMES.get(self.implementation, self.implementation)
+        return f"{name}{self.version[0]}{self.version[1]}"
+
+    @property
+    def abi_tag(self) -> str:
+        """
+        The ABI part of a wheel tag, computed like packaging does for the
+        running interpreter (``cp313t``, ``pypy310_pp73``).
+        """
+        if self.implementation == "cpython":
+            threading = "t" if self.free_threaded else ""
+            debug = "d" if "d" in self.abiflags else ""
+            return f"cp{self.version[0]}{self.version[1]}{threading}{debug}"
+
+        parts = self.soabi.split("-")
+        if self.soabi.startswith("pypy"):
+            abi = "-".join(parts[:2])
+        elif self.soabi.startswith("graalpy"):
+            abi = "-".join(parts[:3])
+        else:
+            abi = self.soabi or "none"
+        return abi.replace(".", "_").replace("-", "_")
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import contextlib
+import dataclasses
+import os
+import re
+import shlex
+import subprocess
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from packaging.version import InvalidVersion, Version
+
+from .._logging import logger
+from .._shutil import Run
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Mapping
+
+__all__ = ["Jobserver", "read_build_tool"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+def read_build_tool(build_dir: Path) -> tuple[str, Path | None]:
+    """
+    Read the generator and the build program (make, ninja, etc.) from a
+    configured build directory's CMakeCache.txt. Returns an empty generator
+    if the cache is missing.
+    """
+    try:
+        cache = build_dir.joinpath("CMakeCache.txt").read_text(encoding="utf-8")
+    except OSError:
+        return "", None
+
+    gen_match = re.search(r"^CMAKE_GENERATOR:INTERNAL=(.*)$", cache, re.MULTILINE)
+    prog_match = re.search(r"^CMAKE_MAKE_PROGRAM:\w+=(.*)$", cache, re.MULTILINE)
+    generator = gen_match.group(1).strip() if gen_match else ""
+    program = (
+        Path(prog_match.group(1).strip())
+        if prog_match and prog_match.group(1).strip()
+        else None
+    )
+    return generator, program
+
+
+def _ninja_version(ninja: Path) -> Version | None:
+    try:
+        result = Run().capture(ninja, "--version")
+        return Version(".".join(result.stdout.strip().split(".")[:3]))
+    except (subprocess.CalledProcessError, OSError, InvalidVersion):
+        return None
+
+
+def _make_version(make: Path) -> Version | None:
+    try:
+        result = Run().capture(make, "--version")
+    except (subprocess.CalledProcessError, OSError):
+        return None
+    match = re.match(r"GNU Make (\d+(?:\.\d+)*)", result.stdout)
+    if not match:
+        return None
+    try:
+        return Version(match.group(1))
+    except InvalidVersion:
+        return None
+
+
+@dataclasses.dataclass(frozen=True)
+class Jobserver:
+    """
+    A GNU make jobserver inherited from a parent build (``make -j``, or any
+    tool implementing the protocol). Each running job holds a token; a client
+    always owns one implicit token and must read a byte from the jobserver for
+    each additional job, writing the same byte back when done.
+    """
+
+    fifo: Path | None = None
+    fds: tuple[int, int] | None = None
+
+    @classmethod
+    def from_env(cls, env: Mapping[str, str]) -> Jobserver | None:
+        """
+        Detect a jobserver from ``MAKEFLAGS``. Supports the named pipe
+        (``fifo:PATH``, GNU make 4.4+) and the inherited pipe file descriptor
+        (``R,W``) styles. Returns None if there is no usable jobserver.
+        """
+        if sys.platform.startswith("win"):
+            return None
+
+        makeflags = env.get("MAKEFLAGS", "")
+        auth = ""
+        for flag in shlex.split(makeflags):
+            for prefix in ("--jobserver-auth=", "--jobserver-fds="):
+                if flag.startswith(prefix):
+                    auth = flag[len(prefix) :]
+        if not auth:
+            return None
+
+        if auth.startswith("fifo:"):
+            fifo = Path(auth[len("fifo:") :])
+            if not fifo.exists():
+                logger.debug("Jobserver fifo {} does not exist, ignoring", fifo)
+                return None
+            logger.info("Found jobserver fifo: {}", fifo)
+            return cls(fifo=fifo)
+
+        match = re.fullmatch(r"(\d+),(\d+)", auth)
+        if not match:
+            logger.debug("Unsupported jobserver style {!r}, ignoring", auth)
+            return None
+
+        read_fd, write_fd = int(match.group(1)), int(match.group(2))
+        try:
+            os.fstat(read_fd)
+            os.fstat(write_fd)
+        except OSError:
+            # The parent did not pass the file descriptors down (recipe without
+            # a "+" prefix, or the descriptors were closed along the way)
+            logger.debug("Jobserver fds {},{} are not open, ignoring", *match.groups())
+            return None
+
+        logger.info("Found jobserver fds: {},{}", read_fd, write_fd)
+        return cls(fds=(read_fd, write_fd))
+
+    @property
+    def pass_fds(self) -> tuple[int, ...]:
+        """
+        The file descriptors that must stay open in the build process.
+        """
+        return self.fds or ()
+
+    def supports(self, generator: str, make_program: Path | None) -> bool:
+        """
+        Check if the build tool can join the jobserver by itself. GNU make
+        always supports the pipe style and needs 4.4+ for the fifo style, Ninja
+        1.13+ supports the fifo style only.
+        """
+        if "Makefiles" in generator:
+            if self.fifo is None:
+                return True
+            if make_program is None:
+                return False
+            version = _make_version(make_program)
+            return version is not None and version >= Version("4.4")
+        if generator.startswith("Ninja") and self.fifo is not None and make_program:
+            version = _ninja_version(make_program)
+            return version is not None and version >= Version("1.13")
+        return False
+
+    @contextlib.contextmanager
+    def acquire(self, jobs: int) -> Generator[int, None, None]:
+        """
+        Take up to ``jobs - 1`` extra tokens without waiting, and yield the
+        number of jobs that may run (at least one, the implicit token). All
+        tokens are returned to the jobserver on exit.
+        """
+        tokens: list[bytes] = []
+
+        # Reads must never block: another client can take a token between a
+        # check and the read. The inherited pipe is reopened to get a
+        # non-blocking description of our own; the shared one is only switched
+        # (and restored) if that is not possible.
+        fd: int | None = None
+        blocking: bool | None = None
+        if self.fifo is not None:
+            fd = os.open(self.fifo, os.O_RDWR | os.O_NONBLOCK)
+            read_fd = write_fd = fd
+        else:
+            assert self.fds is not None
+            read_fd, write_fd = self.fds
+            with contextlib.suppress(OSError):
+                fd = os.open(f"/proc/self/fd/{read_fd}", os.O_RDONLY | os.O_NONBLOCK)
+            if fd is None:
+                blocking = os.get_blocking(read_fd)
+                os.set_blocking(read_fd, False)
+            else:
+                read_fd = fd
+
+        try:
+            try:
+                while len(tokens) < jobs - 1:
+                    try:
+                        token = os.read(read_fd, 1)
+                    except BlockingIOError:
+                        break
+                    if not token:
+                        break
+                    tokens.append(token)
+            finally:
+                if blocking is not None:
+                    os.set_blocking(read_fd, blocking)
+
+            logger.info("Acquired {} jobserver tokens", len(tokens))
+            yield len(tokens) + 1
+        finally:
+            for token in tokens:
+                os.write(write_fd, token)
+            if fd is not None:
+                os.close(fd)
@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+import time
+from typing import TYPE_CHECKING, Any
+
+from .._logging import rich_print
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+    from pathlib import Path
+
+__all__ = [
+    "BuildReport",
+    "Edge",
+    "analyze",
+    "ninja_log_offset",
+    "read_ninja_log",
+]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+NINJA_LOG = ".ninja_log"
+HISTORY_FILE = ".skbuild-build-history.json"
+HISTORY_RUNS = 10
+HISTORY_EDGES = 50
+
+# An edge is flagged if it got this much slower (relative and in ms)
+REGRESSION_FACTOR = 1.5
+REGRESSION_MIN_MS = 500
+
+
+@dataclasses.dataclass(frozen=True)
+class Edge:
+    start: int
+    end: int
+    output: str
+
+    @property
+    def duration(self) -> int:
+        return self.end - self.start
+
+
+def ninja_log_offset(build_dir: Path) -> int:
+    """
+    The current size of the Ninja log, so only the edges of the next build are
+    read afterwards.
+    """
+    try:
+        return build_dir.joinpath(NINJA_LOG).stat().st_size
+    except OSError:
+        return 0
+
+
+def read_ninja_log(build_dir: Path, offset: int = 0) -> list[Edge]:
+    """
+    Read the edges of the last Ninja run from ``.ninja_log`` (v5 or later),
+    starting at ``offset`` bytes. Edges with several outputs are reported once,
+    by their first output.
+    """
+    log = build_dir / NINJA_LOG
+    # Ninja recompacts the log now and then, so the offset might be past the end
+    if offset > log.stat().st_size:
+        offset = 0
+    with log.open(encoding="utf-8", errors="replace") as f:
+        f.seek(offset)
+        lines = f.read().splitlines()
+
+    edges: dict[tuple[int, int, str], Edge] = {}
+    last_end = 0
+    for line in lines:
+        if not line or line.startswith("#"):
+            continue
+        parts = line.split("\t")
+        if len(parts) < 5:
+            continue
+        start, end, _, output, cmdhash = parts[:5]
+
+        # Edges are logged as they finish, with times relative to the start of
+        # each Ninja run; going back in time means a new run started
+        if int(end) < last_end:
+            edges.clear()
+        last_end = int(end)
+
+        key = (int(start), int(end), cmdhash)
+        edges.setdefault(key, Edge(int(start), int(end), output))
+    return list(edges.values())
+
+
+def _critical_path(edges: Sequence[Edge]) -> list[Edge]:
+    """
+    Estimate the critical path without the dependency graph: starting at the
+    last edge to finish, repeatedly step to the edge that finished last
+    before the current one started (the one it most likely waited on).
+    """
+    by_end = sorted(edges, key=lambda e: e.end)
+    if not by_end:
+        return []
+    path = [by_end[-1]]
+    while True:
+        current = path[-1]
+        preceding = [e for e in by_end if e.end <= current.start]
+        if not preceding:
+            break
+        path.append(preceding[-1])
+    return path[::-1]
+
+
+@dataclasses.dataclass
+class BuildReport:
+    edges: list[Edge]
+    top: int = 10
+    regressions: list[dict[str, Any]] = dataclasses.field(default_factory=list)
+
+    @property
+    def wall_ms(self) -> int:
+        if not self.edges:
+            return 0
+        return max(e.end for e in self.edges) - min(e.start for e in self.edges)
+
+    @property
+    def total_ms(self) -> int:
+        return sum(e.duration for e in self.edges)
+
+    @property
+    def parallelism(self) -> float:
+        return self.total_ms / self.wall_ms if self.wall_ms else 0.0
+
+    @property
+    def critical_path(self) -> list[Edge]:
+        return _critical_path(self.edges)
+
+    @property
+    def slowest(self) -> list[Edge]:
+        return sorted(self.edges, key=lambda e: e.duration, reverse=True)[: self.top]
+
+    def to_dict(self) -> dict[str, Any]:
+        critical_path = self.critical_path
+        return {
+            "edges": len(self.edges),
+            "wall_ms": self.wall_ms,
+            "total_ms": self.total_ms,
+            "parallelism": round(self.parallelism, 2),
+            "critical_path_ms": sum(e.duration for e in critical_path),
+            "critical_path": [e.output for e in critical_path],
+            "slowest": [{"output": e.output, "ms": e.duration} for e in self.slowest],
+            "regressions": self.regressions,
+        }
+
+    def compare(self, history: Iterable[dict[str, Any]]) -> None:
+        """
+        Flag the total build time and the edges that got slower than in the
+        previous run in ``history``.
+        """
+        previous = list(history)[-1:]
+        if not previous:
+            return
+        prev = previous[0]
+        self.regressions = []
+
+        prev_wall = prev.get("wall_ms", 0)
+        if (
+            prev_wall
+            and self.wall_ms > prev_wall * REGRESSION_FACTOR
+            and self.wall_ms - prev_wall > REGRESSION_MIN_MS
+        ):
+            self.regressions.append(
+                {"output": "<total>", "ms": self.wall_ms, "previous_ms": prev_wall}
+            )
+
+        prev_edges: dict[str, int] = prev.get("edges", {})
+        for edge in sorted(self.edges, key=lambda e: e.duration, reverse=True):
+            prev_ms = prev_edges.get(edge.output)
+            if (
+                prev_ms is not None
+                and edge.duration > prev_ms * REGRESSION_FACTOR
+                and edge.duration - prev_ms > REGRESSION_MIN_MS
+            ):
+                self.regressions.append(
+                    {"output": edge.output, "ms": edge.duration, "previous_ms": prev_ms}
+                )
+
+    def history_entry(self) -> dict[str, Any]:
+        return {
+            "time": int(time.time()),
+            "wall_ms": self.wall_ms,
+            "total_ms": self.total_ms,
+            "edges": {
+                e.output: e.duration
+                for e in sorted(self.edges, key=lambda e: e.duration, reverse=True)[
+                    :HISTORY_EDGES
+                ]
+            },
+        }
+
+    def print(self) -> None:
+        critical_path = self.critical_path
+        rich_print(
+            "{green}***",
+            "{bold}Build report:{normal} {edges} edges in {wall:.1f}s, "
+            "{total:.1f}s total, effective parallelism {parallelism:.1f}",
+            edges=len(self.edges),
+            wall=self.wall_ms / 1000,
+            total=self.total_ms / 1000,
+            parallelism=self.parallelism,
+        )
+        rich_print(
+            "  {bold}Critical path (estimate):{normal} {seconds:.1f}s "
+            "over {edges} edges",
+            seconds=sum(e.duration for e in critical_path) / 1000,
+            edges=len(critical_path),
+        )
+        rich_print("  {bold}Slowest {n} edges:", n=len(self.slowest))
+        for edge in self.slowest:
+            rich_print(
+                "  {seconds:8.2f}s  {output}",
+                seconds=edge.duration / 1000,
+                output=edge.output,
+            )
+        for reg in self.regressions:
+            rich_print(
+                "  {yellow}Slower than last build:{default} {output} "
+                "{previous:.2f}s -> {current:.2f}s",
+                output=reg["output"],
+                previous=reg["previous_ms"] / 1000,
+                current=reg["ms"] / 1000,
+            )
+
+
+def analyze(
+    build_dir: Path, offset: int = 0, *, top: int = 10, update_history: bool = True
+) -> BuildReport | None:
+    """
+    Produce a report for the edges in the Ninja log of ``build_dir`` past
+    ``offset``, comparing with (and updating) the history file in the build
+    dir. Returns None if there is no Ninja log or nothing was built.
+    """
+    if not build_dir.joinpath(NINJA_LOG).is_file():
+        return None
+    edges = read_ninja_log(build_dir, offset)
+    if not edges:
+        return None
+
+    report = BuildReport(edges, top=top)
+
+    history_file = build_dir / HISTORY_FILE
+    try:
+        history: list[dict[str, Any]] = json.loads(
+            history_file.read_text(encoding="utf-8")
+        )
+    except (OSError, ValueError):
+        history = []
+    report.compare(history)
+
+    if update_history:
+        history = [*history, report.history_entry()][-HISTORY_RUNS:]
+        history_file.write_text(json.dumps(history), encoding="utf-8")
+
+    return report
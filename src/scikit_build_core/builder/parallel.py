@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import contextlib
+import os
+import re
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .._logging import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+__all__ = [
+    "get_available_memory",
+    "get_cpu_count",
+    "get_parallel_level",
+    "parse_size",
+]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+# Used by "auto" if no memory budget per job is given
+DEFAULT_JOB_MEMORY = 1024**3
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+PROC_SELF_CGROUP = Path("/proc/self/cgroup")
+PROC_MEMINFO = Path("/proc/meminfo")
+
+_SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+
+def parse_size(value: str) -> int:
+    """
+    Parse a size like ``"2G"``, ``"1.5GB"``, ``"512MiB"``, or ``"1024"`` (bytes)
+    into a number of bytes. Units are powers of 1024.
+    """
+    match = re.fullmatch(
+        r"\s*(\d+(?:\.\d*)?)\s*([KMGT]?)(?:i?B)?\s*", value, re.IGNORECASE
+    )
+    if not match:
+        msg = f"Invalid size {value!r}, expected something like '2G' or '512M'"
+        raise ValueError(msg)
+    number, unit = match.groups()
+    return int(float(number) * _SIZE_UNITS[unit.upper()])
+
+
+def _read_text(path: Path) -> str | None:
+    try:
+        return path.read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+
+
+def _cgroup_dirs(controller: str) -> Generator[Path, None, None]:
+    """
+    Yield the cgroup directories that apply to this process for a controller,
+    innermost first. An empty controller selects the cgroup v2 (unified)
+    hierarchy. Works both with the full path visible and with the cgroup
+    namespaced to the root (as usual inside containers).
+    """
+    text = _read_text(PROC_SELF_CGROUP)
+    if text is None:
+        return
+
+    for line in text.splitlines():
+        _, controllers, path = line.split(":", 2)
+        if not controller and not controllers:
+            base = CGROUP_ROOT
+        elif controller and controller in controllers.split(","):
+            base = CGROUP_ROOT / controllers
+            if not base.is_dir():
+                base = CGROUP_ROOT / controller
+        else:
+            continue
+
+        current = base / path.lstrip("/")
+        if not current.is_dir():
+            current = base
+        while True:
+            yield current
+            if current == base:
+                break
+            current = current.parent
+
+
+def _cgroup_cpu_limit() -> float | None:
+    limits: list[float] = []
+
+    # cgroup v2
+    for cgroup_dir in _cgroup_dirs(""):
+        text = _read_text(cgroup_dir / "cpu.max")
+        if text and not text.startswith("max"):
+            quota, period = text.split()[:2]
+            limits.append(int(quota) / int(period))
+
+    # cgroup v1
+    for cgroup_dir in _cgroup_dirs("cpu"):
+        quota_txt = _read_text(cgroup_dir / "cpu.cfs_quota_us")
+        period_txt = _read_text(cgroup_dir / "cpu.cfs_period_us")
+        if quota_txt and period_txt and int(quota_txt) > 0:
+            limits.append(int(quota_txt) / int(period_txt))
+
+    return min(limits, default=None)
+
+
+def _cgroup_available_memory() -> int | None:
+    available: list[int] = []
+
+    # cgroup v2
+    for cgroup_dir in _cgroup_dirs(""):
+        limit = _read_text(cgroup_dir / "memory.max")
+        usage = _read_text(cgroup_dir / "memory.current")
+        if limit and limit != "max" and usage:
+            available.append(int(limit) - int(usage))
+
+    # cgroup v1 (unlimited is reported as a huge number)
+    for cgroup_dir in _cgroup_dirs("memory"):
+        limit = _read_text(cgroup_dir / "memory.limit_in_bytes")
+        usage = _read_text(cgroup_dir / "memory.usage_in_bytes")
+        if limit and usage and int(limit) < 2**60:
+            available.append(int(limit) - int(usage))
+
+    return max(min(available), 0) if available else None
+
+
+def get_cpu_count() -> int:
+    """
+    Return the number of CPUs this process may use, respecting the CPU
+    affinity mask and cgroup (container) CPU quotas.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))  # type: ignore[attr-defined,unused-ignore]
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    if sys.platform.startswith("linux"):
+        quota = _cgroup_cpu_limit()
+        if quota is not None:
+            logger.debug("cgroup CPU quota: {:.2f}", quota)
+            cpus = min(cpus, max(int(quota), 1))
+
+    return cpus
+
+
+def get_available_memory() -> int | None:
+    """
+    Return the memory (in bytes) currently available to this process, or
+    None if it cannot be determined. Respects cgroup (container) limits.
+    """
+    available: list[int] = []
+
+    meminfo = _read_text(PROC_MEMINFO)
+    if meminfo:
+        match = re.search(r"^MemAvailable:\s+(\d+) kB", meminfo, re.MULTILINE)
+        if match:
+            available.append(int(match.group(1)) * 1024)
+
+        cgroup_memory = _cgroup_available_memory()
+        if cgroup_memory is not None:
+            logger.debug("cgroup available memory: {}", cgroup_memory)
+            available.append(cgroup_memory)
+    else:
+        # Not Linux, total physical memory is the best simple estimate
+        with contextlib.suppress(AttributeError, ValueError, OSError):
+            available.append(os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE"))
+
+    return min(available, default=None)
+
+
+def get_parallel_level(parallel: str) -> int | None:
+    """
+    Compute the number of build jobs from the ``build.parallel`` setting. An
+    empty string returns None (use the generator default), an integer is used
+    as is, ``"auto"`` and a memory size (the expected memory use of a single
+    job) compute the job count from the CPUs and memory available.
+    """
+    parallel = parallel.strip()
+    if not parallel:
+        return None
+
+    if parallel.isdigit():
+        return max(int(parallel), 1)
+
+    job_memory = (
+        DEFAULT_JOB_MEMORY if parallel.lower() == "auto" else parse_size(parallel)
+    )
+
+    cpus = get_cpu_count()
+    memory = get_available_memory()
+    jobs = cpus
+    if memory is not None and job_memory > 0:
+        jobs = min(jobs, memory // job_memory)
+    jobs = max(jobs, 1)
+
+    logger.info(
+        "Parallel build jobs: {} (CPUs: {}, available memory: {}, memory per job: {})",
+        jobs,
+        cpus,
+        memory,
+        job_memory,
+    )
+    return jobs
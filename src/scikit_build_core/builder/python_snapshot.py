@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import dataclasses
+import importlib.machinery
+import json
+import re
+import sys
+import sysconfig
+import warnings
+from pathlib import Path
+from typing import Any
+
+from .._logging import logger
+from .sysconfig import get_numpy_include_dir, get_python_include_dir, get_soabi
+
+__all__ = [
+    "PythonSnapshot",
+    "get_python_snapshot",
+]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+SNAPSHOT_FILE = ".skbuild-python.json"
+
+
+def _interpreter_id() -> str | None:
+    """
+    The interpreter ID FindPython derives from ``python -V``, or None if it
+    can't be matched without running the interpreter.
+    """
+    if sys.implementation.name != "cpython":
+        return None
+    if "Anaconda" in sys.version or "Enthought" in sys.version:
+        return None
+    return "ActivePython" if "ActiveState" in sys.copyright else "Python"
+
+
+def _sosabi() -> str:
+    for suffix in importlib.machinery.EXTENSION_SUFFIXES:
+        if suffix.startswith(".abi"):
+            return re.sub(r"^\.(.+)\.[^.]+$", r"\1", suffix)
+    return ""
+
+
+def _lib_paths() -> list[str]:
+    """
+    The standard library and site-packages directories, computed like
+    FindPython does (distutils first, if available).
+    """
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            from distutils import sysconfig as du_sysconfig
+
+        return [
+            du_sysconfig.get_python_lib(plat_specific=plat, standard_lib=std)
+            for std in (True, False)
+            for plat in (False, True)
+        ]
+    except Exception:  # noqa: BLE001
+        return [
+            sysconfig.get_path(name)
+            for name in ("stdlib", "platstdlib", "purelib", "platlib")
+        ]
+
+
+def _mtime(path: str) -> int | None:
+    try:
+        return Path(path or ".").stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _key() -> dict[str, Any]:
+    """
+    Identifies the interpreter and its installed packages: any install or
+    removal changes the modification time of a directory on the path.
+    """
+    stat = Path(sys.executable).stat()
+    return {
+        "executable": sys.executable,
+        "stat": [stat.st_size, stat.st_mtime_ns],
+        "prefix": sys.prefix,
+        "paths": {path: _mtime(path) for path in sys.path},
+    }
+
+
+@dataclasses.dataclass(frozen=True)
+class PythonSnapshot:
+    """
+    Everything CMake needs to know about the running interpreter, so
+    FindPython doesn't have to run it again.
+    """
+
+    executable: str
+    include_dir: str
+    numpy_include_dir: str | None
+    interpreter_id: str | None
+    version: tuple[int, int, int]
+    arch: int
+    abiflags: str
+    soabi: str
+    sosabi: str
+    lib_paths: tuple[str, str, str, str]
+
+    @classmethod
+    def compute(cls) -> PythonSnapshot:
+        numpy_include_dir = get_numpy_include_dir()
+        stdlib, stdarch, sitelib, sitearch = _lib_paths()
+        return cls(
+            executable=sys.executable,
+            include_dir=str(get_python_include_dir()),
+            numpy_include_dir=str(numpy_include_dir) if numpy_include_dir else None,
+            interpreter_id=_interpreter_id(),
+            version=(
+                sys.version_info.major,
+                sys.version_info.minor,
+                sys.version_info.micro,
+            ),
+            arch=64 if sys.maxsize > 2**32 else 32,
+            abiflags=getattr(sys, "abiflags", ""),
+            soabi=get_soabi({}),
+            sosabi=_sosabi(),
+            lib_paths=(stdlib, stdarch, sitelib, sitearch),
+        )
+
+    @classmethod
+    def current(cls) -> PythonSnapshot:
+        """
+        The snapshot of the running interpreter, computed once per process
+        (and again if its packages change). Builds run in the same process
+        share it.
+        """
+        key = json.dumps(_key(), sort_keys=True)
+        if key not in _snapshots:
+            _snapshots[key] = cls.compute()
+        return _snapshots[key]
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> PythonSnapshot:
+        return cls(
+            **{
+                **data,
+                "version": tuple(data["version"]),
+                "lib_paths": tuple(data["lib_paths"]),
+            }
+        )
+
+    @property
+    def interpreter_properties(self) -> str | None:
+        """
+        The ``_<prefix>_INTERPRETER_PROPERTIES`` cache entry of the FindPython
+        backport, which stores the results of the interpreter queries. None
+        if the interpreter ID is unknown.
+        """
+        if self.interpreter_id is None:
+            return None
+        return ";".join(
+            [
+                self.interpreter_id,
+                *(str(v) for v in self.version),
+                str(self.arch),
+                self.abiflags,
+                self.soabi,
+                self.sosabi,
+                *self.lib_paths,
+            ]
+        )
+
+
+# Snapshots computed in this process, by key
+_snapshots: dict[str, PythonSnapshot] = {}
+
+
+def get_python_snapshot(build_dir: Path) -> PythonSnapshot:
+    """
+    Get the snapshot of the running interpreter, reusing the one stored in the
+    build directory if the interpreter and its packages didn't change.
+    """
+    snapshot_file = build_dir / SNAPSHOT_FILE
+    key = _key()
+    try:
+        data = json.loads(snapshot_file.read_text(encoding="utf-8"))
+        if data["key"] == key:
+            return PythonSnapshot.from_dict(data["snapshot"])
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    snapshot = PythonSnapshot.current()
+    logger.debug("Python snapshot: {}", snapshot)
+    try:
+        build_dir.mkdir(parents=True, exist_ok=True)
+        snapshot_file.write_text(
+            json.dumps({"key": key, "snapshot": dataclasses.asdict(snapshot)}),
+            encoding="utf-8",
+        )
+    except OSError:
+        logger.debug("Could not write {}", snapshot_file)
+    return snapshot
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import configparser
+import importlib.util
 import os
 import sys
 import sysconfig
@@ -180,6 +181,25 @@ def get_soabi(env: Mapping[str, str], *, abi3: bool = False) -> str:
 
 
 def get_numpy_include_dir() -> Path | None:
+    """
+    Return the NumPy include directory, or None if NumPy is not installed.
+    NumPy is located without importing it, which is slow; the import is only
+    a fallback if the include directory is not in one of the known places.
+    """
+    try:
+        spec = importlib.util.find_spec("numpy")
+    except (ImportError, ValueError):
+        return None
+    if spec is None:
+        return None
+
+    for location in spec.submodule_search_locations or []:
+        # NumPy 2 moved the headers from numpy/core to numpy/_core
+        for core in ("_core", "core"):
+            include_dir = Path(location, core, "include")
+            if include_dir.joinpath("numpy/arrayobject.h").is_file():
+                return include_dir
+
     try:
         import numpy as np
     except ImportError:
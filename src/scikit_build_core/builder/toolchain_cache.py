@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import re
+import shutil
+import sysconfig
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .._logging import logger
+from .build_cache import user_cache_dir
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+    from ..cmake import CMake
+
+__all__ = [
+    "compiler_checks_failed",
+    "configure_log_offsets",
+    "get_toolchain_root",
+    "save_toolchain",
+    "seed_toolchain",
+    "toolchain_key",
+]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+ENTRY_INFO = "skbuild-toolchain.json"
+
+# Marks the platform files in CMakeFiles/<version> as valid for this cache;
+# without it, CMake discards them and detects everything again
+SEED_CACHE = "CMAKE_PLATFORM_INFO_INITIALIZED:INTERNAL=1\n"
+
+# Environment variables that select or configure a compiler
+TOOLCHAIN_ENV = (
+    "CC",
+    "CXX",
+    "FC",
+    "CUDACXX",
+    "CUDAHOSTCXX",
+    "HIPCXX",
+    "OBJC",
+    "OBJCXX",
+    "ASM",
+    "CFLAGS",
+    "CXXFLAGS",
+    "FFLAGS",
+    "CUDAFLAGS",
+    "HIPFLAGS",
+    "OBJCFLAGS",
+    "OBJCXXFLAGS",
+    "ASMFLAGS",
+    "CPPFLAGS",
+    "LDFLAGS",
+    "ARCHFLAGS",
+    "SDKROOT",
+    "MACOSX_DEPLOYMENT_TARGET",
+    "CMAKE_TOOLCHAIN_FILE",
+    "CMAKE_GENERATOR_PLATFORM",
+    "CMAKE_GENERATOR_TOOLSET",
+    "CMAKE_OSX_ARCHITECTURES",
+)
+
+# CMake variables that select or configure a compiler
+TOOLCHAIN_DEFINE = re.compile(
+    r"^CMAKE_(?:\w+_COMPILER\w*|\w*FLAGS\w*|TOOLCHAIN_FILE|SYSROOT\w*|OSX_\w+"
+    r"|SYSTEM_\w+|GENERATOR_\w+|CROSSCOMPILING\w*|AR|RANLIB|LINKER\w*|NM|OBJCOPY"
+    r"|OBJDUMP|STRIP|MT|READELF|DLLTOOL|ADDR2LINE|\w+_STANDARD_LIBRARIES)$"
+)
+
+# Cache entries written by the compiler detection (the compilers and the
+# tools found next to them), which are not written again when it's skipped
+DETECTED_CACHE = re.compile(
+    r"^CMAKE_(?:\w+_COMPILER\w*|\w+_ARCHITECTURES|AR|RANLIB|STRIP|LINKER|NM"
+    r"|OBJCOPY|OBJDUMP|READELF|DLLTOOL|ADDR2LINE|TAPI|INSTALL_NAME_TOOL|MT"
+    r"|EXECUTABLE_FORMAT|UNAME)(?:-ADVANCED)?:\w+="
+)
+
+# Where CMake records its try_compile checks; the error log only has the
+# failed ones (before CMake 3.26), the configure log has all of them
+CONFIGURE_LOGS = ("CMakeFiles/CMakeError.log", "CMakeFiles/CMakeConfigureLog.yaml")
+FAILED_CHECK = re.compile(r"^\s+exitCode: [1-9]", re.MULTILINE)
+
+COMPILER_FILE = re.compile(r"^CMake\w+Compiler\.cmake$")
+COMPILER_SET = re.compile(r'^set\(CMAKE_\w+_COMPILER "(.+)"\)$', re.MULTILINE)
+
+
+def get_toolchain_root() -> Path:
+    """
+    The root of the toolchain detection cache.
+    """
+    return user_cache_dir() / "scikit-build-core" / "toolchain"
+
+
+def _define_name(arg: str) -> str | None:
+    if not arg.startswith("-D"):
+        return None
+    return arg[2:].split("=", 1)[0].split(":", 1)[0].strip()
+
+
+def toolchain_key(
+    cmake: CMake,
+    *,
+    generator: str | None,
+    env: Mapping[str, str],
+    defines: Mapping[str, str],
+    cmake_args: Sequence[str],
+) -> str:
+    """
+    A hash of everything that could change the result of CMake's compiler
+    detection: the CMake version, the generator, compilers and flags from the
+    environment, and compiler-related defines and CMake arguments.
+    """
+    data = {
+        "cmake": [str(cmake.version), str(cmake.cmake_path)],
+        "platform": sysconfig.get_platform(),
+        "generator": generator or "",
+        "env": {k: env[k] for k in TOOLCHAIN_ENV if k in env},
+        "defines": {
+            k: v for k, v in sorted(defines.items()) if TOOLCHAIN_DEFINE.match(k)
+        },
+        "args": [
+            arg
+            for arg in cmake_args
+            if not arg.startswith("-D")
+            or TOOLCHAIN_DEFINE.match(_define_name(arg) or "")
+        ],
+    }
+    text = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def _platform_dir(build_dir: Path, version: str) -> Path | None:
+    """
+    The CMakeFiles/<version> directory with the detection results.
+    """
+    platform_dirs = [p.parent for p in build_dir.glob("CMakeFiles/*/CMakeSystem.cmake")]
+    for platform_dir in platform_dirs:
+        if platform_dir.name == version:
+            return platform_dir
+    return platform_dirs[0] if len(platform_dirs) == 1 else None
+
+
+def _compiler_stat(path: Path) -> list[int]:
+    stat = path.stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _compilers_unchanged(
+    compilers: Mapping[str, list[int]], env: Mapping[str, str]
+) -> bool:
+    """
+    Check that the detected compilers were not updated, and that the same
+    program would still be found first on the PATH.
+    """
+    for compiler, stat in compilers.items():
+        path = Path(compiler)
+        try:
+            if _compiler_stat(path) != stat:
+                logger.debug("Compiler {} changed", path)
+                return False
+            found = shutil.which(path.name, path=env.get("PATH"))
+            if found is not None and not Path(found).samefile(path):
+                logger.debug("Compiler {} is now found at {}", path, found)
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def seed_toolchain(build_dir: Path, entry: Path, *, env: Mapping[str, str]) -> bool:
+    """
+    Copy cached compiler detection results into a fresh build directory.
+    Returns True if the build directory was seeded. Nothing is done if the
+    build directory is already configured, or if the cached compilers changed
+    (the entry is removed then).
+    """
+    if build_dir.joinpath("CMakeCache.txt").exists():
+        return False
+
+    try:
+        info: dict[str, Any] = json.loads(
+            entry.joinpath(ENTRY_INFO).read_text(encoding="utf-8")
+        )
+    except (OSError, ValueError):
+        return False
+
+    if not _compilers_unchanged(info.get("compilers", {}), env):
+        logger.info("Cached toolchain {} is out of date, removing", entry)
+        shutil.rmtree(entry, ignore_errors=True)
+        return False
+
+    platform_dir = build_dir / "CMakeFiles" / info["platform_dir"]
+    platform_dir.mkdir(parents=True, exist_ok=True)
+    for filename in info["files"]:
+        shutil.copyfile(entry / filename, platform_dir / filename)
+    build_dir.joinpath("CMakeCache.txt").write_text(
+        "".join([SEED_CACHE, *info["cache"]]), encoding="utf-8"
+    )
+
+    logger.info("Using cached toolchain detection from {}", entry)
+    return True
+
+
+def save_toolchain(build_dir: Path, entry: Path, *, version: str) -> None:
+    """
+    Save the compiler detection results of a configured build directory.
+    Results that refer to the build directory are not cached.
+    """
+    platform_dir = _platform_dir(build_dir, version)
+    if platform_dir is None:
+        return
+
+    files = [
+        p
+        for p in platform_dir.iterdir()
+        if p.name == "CMakeSystem.cmake" or COMPILER_FILE.match(p.name)
+    ]
+    texts = {p.name: p.read_text(encoding="utf-8") for p in files}
+    with build_dir.joinpath("CMakeCache.txt").open(encoding="utf-8") as f:
+        cache = [line for line in f if DETECTED_CACHE.match(line)]
+
+    build_dir_str = str(build_dir.resolve())
+    if any(build_dir_str in text for text in [*texts.values(), *cache]):
+        logger.debug("Toolchain detection refers to the build directory, not caching")
+        return
+
+    compilers: dict[str, list[int]] = {}
+    for name, text in texts.items():
+        if name == "CMakeSystem.cmake":
+            continue
+        for match in COMPILER_SET.finditer(text):
+            with contextlib.suppress(OSError):
+                compilers[match.group(1)] = _compiler_stat(Path(match.group(1)))
+
+    info = {
+        "platform_dir": platform_dir.name,
+        "files": sorted(texts),
+        "cache": cache,
+        "compilers": compilers,
+        "created": time.time(),
+    }
+
+    # Written to a temporary directory first, so a concurrent build never sees
+    # a partial entry
+    tmp_entry = entry.with_name(f"{entry.name}.tmp{os.getpid()}")
+    shutil.rmtree(tmp_entry, ignore_errors=True)
+    tmp_entry.mkdir(parents=True)
+    for name, text in texts.items():
+        tmp_entry.joinpath(name).write_text(text, encoding="utf-8")
+    tmp_entry.joinpath(ENTRY_INFO).write_text(
+        json.dumps(info, indent=2), encoding="utf-8"
+    )
+    shutil.rmtree(entry, ignore_errors=True)
+    try:
+        tmp_entry.rename(entry)
+    except OSError:
+        shutil.rmtree(tmp_entry, ignore_errors=True)
+        return
+    logger.info("Saved toolchain detection to {}", entry)
+
+
+def configure_log_offsets(build_dir: Path) -> dict[str, int]:
+    """
+    The current sizes of the configure logs, to read what a configure adds.
+    """
+    offsets = {}
+    for log in CONFIGURE_LOGS:
+        with contextlib.suppress(OSError):
+            offsets[log] = build_dir.joinpath(log).stat().st_size
+    return offsets
+
+
+def compiler_checks_failed(build_dir: Path, offsets: Mapping[str, int]) -> bool:
+    """
+    Check if a try_compile check failed since the offsets were taken. With a
+    seeded toolchain, this is how outdated detection results show up; other
+    configure errors (like one in the CMakeLists.txt) are not caused by it.
+    """
+    for log in CONFIGURE_LOGS:
+        try:
+            with build_dir.joinpath(log).open("rb") as f:
+                f.seek(offsets.get(log, 0))
+                text = f.read().decode("utf-8", errors="replace")
+        except OSError:
+            continue
+        if log.endswith(".yaml") and FAILED_CHECK.search(text):
+            return True
+        if log.endswith(".log") and text.strip():
+            return True
+    return False
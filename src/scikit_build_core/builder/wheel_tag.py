@@ -15,6 +15,7 @@ if TYPE_CHECKING:
     from collections.abc import Iterable, Sequence
 
     from .._compat.typing import Self
+    from .interpreter import Interpreter
 
 __all__ = ["WheelTag"]
 
@@ -40,7 +41,13 @@ class WheelTag:
         expand_macos: bool = False,
         root_is_purelib: bool = False,
         build_tag: str = "",
+        interpreter: Interpreter | None = None,
     ) -> Self:
+        """
+        The best tag for a wheel built here. The interpreter and ABI are the
+        ones of ``interpreter`` if given, instead of the running interpreter
+        (the platform still comes from the running interpreter).
+        """
         if build_tag:
             if not build_tag[0].isdigit():
                 msg = f"Unexpected build-tag, must start with a digit, {build_tag!r} invalid"
@@ -58,6 +65,15 @@ class WheelTag:
             )
         )
         interp, abi, *plats = (best_tag.interpreter, best_tag.abi, best_tag.platform)
+        if interpreter is not None:
+            interp, abi = interpreter.interpreter_tag, interpreter.abi_tag
+            implementation = interpreter.implementation
+            current_minor = interpreter.version[1]
+            free_threaded = interpreter.free_threaded
+        else:
+            implementation = sys.implementation.name
+            current_minor = sys.version_info.minor
+            free_threaded = bool(sysconfig.get_config_var("Py_GIL_DISABLED"))
         pyvers = [interp]
 
         if sys.platform.startswith("win") and archs:
@@ -103,15 +119,15 @@ class WheelTag:
 
                 minor = int(pyvers_new[0][3:])
                 if (
-                    sys.implementation.name == "cpython"
-                    and minor <= sys.version_info.minor
-                    and not sysconfig.get_config_var("Py_GIL_DISABLED")
+                    implementation == "cpython"
+                    and minor <= current_minor
+                    and not free_threaded
                 ):
                     pyvers = pyvers_new
                     abi = "abi3"
                 else:
                     msg = "Ignoring py-api, not a CPython interpreter ({}) or version (3.{}) is too high or free-threaded"
-                    logger.debug(msg, sys.implementation.name, minor)
+                    logger.debug(msg, implementation, minor)
             elif all(x.startswith("py") and x[2:].isdecimal() for x in pyvers_new):
                 pyvers = pyvers_new
                 abi = "none"
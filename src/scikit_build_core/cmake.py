@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import concurrent.futures
 import contextlib
 import dataclasses
+import hashlib
+import io
 import json
 import os
 import shutil
@@ -9,12 +12,13 @@ import subprocess
 import sys
 import sysconfig
 import textwrap
+import time
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 from . import __version__
 from ._logging import logger
-from ._shutil import Run
+from ._shutil import Run, _write_if_changed
 from .errors import CMakeConfigError, CMakeNotFoundError, FailedLiveProcessError
 from .program_search import Program, best_program, get_cmake_program, get_cmake_programs
 
@@ -35,6 +39,46 @@ def __dir__() -> list[str]:
 
 DIR = Path(__file__).parent.resolve()
 
+# Files in the build directory kept when a relocatable build is cleaned
+KEEP_ON_CLEAN = frozenset({".skbuild-stable", ".skbuild-lock"})
+
+
+def _source_manifest(
+    source_dir: Path,
+    *,
+    exclude: Path,
+    previous: Mapping[str, list[Any]],
+) -> dict[str, list[Any]]:
+    """
+    The size, modification time and content hash of every file in the
+    source directory, skipping ``exclude`` and hidden directories. Hashes in
+    ``previous`` are reused for files with the same size and time.
+    """
+    manifest: dict[str, list[Any]] = {}
+    for dirpath, dirnames, filenames in os.walk(source_dir):
+        dirnames[:] = [
+            d
+            for d in dirnames
+            if not d.startswith(".") and Path(dirpath, d).resolve() != exclude
+        ]
+        for filename in filenames:
+            path = Path(dirpath, filename)
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            rel = path.relative_to(source_dir).as_posix()
+            old = previous.get(rel)
+            if old is not None and old[:2] == [stat.st_size, stat.st_mtime_ns]:
+                manifest[rel] = old
+                continue
+            try:
+                digest = hashlib.sha256(path.read_bytes()).hexdigest()
+            except OSError:
+                continue
+            manifest[rel] = [stat.st_size, stat.st_mtime_ns, digest]
+    return manifest
+
 
 @dataclasses.dataclass(frozen=True)
 class CMake:
@@ -77,16 +121,18 @@ class CMaker:
     source_dir: Path
     build_dir: Path
     build_type: str
+    extra_build_types: Sequence[str] = ()
     module_dirs: list[Path] = dataclasses.field(default_factory=list)
     prefix_dirs: list[Path] = dataclasses.field(default_factory=list)
     prefix_roots: dict[str, list[Path]] = dataclasses.field(default_factory=dict)
     init_cache_file: Path = dataclasses.field(init=False, default=Path())
     env: dict[str, str] = dataclasses.field(init=False, default_factory=os.environ.copy)
     single_config: bool = not sysconfig.get_platform().startswith("win")
+    relocatable: bool = False
+    stable_paths: dict[Path, Path] = dataclasses.field(init=False, default_factory=dict)
 
     def __post_init__(self) -> None:
         self.init_cache_file = self.build_dir / "CMakeInit.txt"
-        source_dir = self.source_dir.resolve()
 
         if not self.source_dir.is_dir():
             msg = f"source directory {self.source_dir} does not exist"
@@ -97,6 +143,20 @@ class CMaker:
             msg = f"build directory {self.build_dir} must be a (creatable) directory"
             raise CMakeConfigError(msg)
 
+        if self.relocatable and sys.platform.startswith("win"):
+            logger.warning("Relocatable build directories need symlinks, ignoring")
+            self.relocatable = False
+
+        # In-place builds have nothing to relocate
+        if self.relocatable and self.build_dir.resolve() == self.source_dir.resolve():
+            self.relocatable = False
+
+        if self.relocatable:
+            self._setup_stable_paths()
+            self.source_dir = self.stable_path(self.source_dir)
+        source_dir = self.stable_path(self.source_dir.resolve())
+        skbuild_dir = self.stable_path(DIR)
+
         skbuild_info = self.build_dir / ".skbuild-info.json"
         stale = False
 
@@ -119,11 +179,11 @@ class CMaker:
 
             # Isolated environments can cause this
             cached_skbuild_dir = Path(info["skbuild_path"])
-            if cached_skbuild_dir != DIR:
+            if cached_skbuild_dir != skbuild_dir:
                 logger.info(
                     "New isolated environment {} -> {}, clearing cache",
                     cached_skbuild_dir,
-                    DIR,
+                    skbuild_dir,
                 )
                 stale = True
 
@@ -135,18 +195,101 @@ class CMaker:
                 self.build_dir.joinpath("CMakeCache.txt").unlink()
             shutil.rmtree(self.build_dir.joinpath("CMakeFiles"), ignore_errors=True)
 
-        with skbuild_info.open("w", encoding="utf-8") as f:
-            json.dump(self._info_dict(), f, indent=2)
+        _write_if_changed(skbuild_info, json.dumps(self._info_dict(), indent=2))
+
+    def _setup_stable_paths(self) -> None:
+        """
+        Point symlinks inside the build directory to the source directory and
+        the (possibly isolated) environment, so CMake only ever sees paths that
+        don't change when pip unpacks the SDist or creates the environment
+        somewhere else.
+        """
+        roots = {
+            "source": self.source_dir.resolve(),
+            "skbuild-site-packages": DIR.parent,
+            "site-packages": Path(sysconfig.get_path("purelib")).resolve(),
+        }
+        stable_dir = self.build_dir.resolve() / ".skbuild-stable"
+        stable_dir.mkdir(exist_ok=True)
+
+        relocated = False
+        for name, target in roots.items():
+            if target in self.stable_paths:
+                continue
+            link = stable_dir / name
+            if link.is_symlink() and Path(os.readlink(link)) != target:
+                logger.info(
+                    "Relocating {} from {} to {}", name, os.readlink(link), target
+                )
+                link.unlink()
+                relocated = relocated or name == "source"
+            if not link.is_symlink():
+                link.symlink_to(target, target_is_directory=True)
+            self.stable_paths[target] = link
+
+        self._check_source_contents(stable_dir, relocated=relocated)
+
+    def _check_source_contents(self, stable_dir: Path, *, relocated: bool) -> None:
+        """
+        Clean the build directory if the source directory moved and its
+        contents changed. The build tool only compares times, and SDists
+        normalize them, so a changed file can look older than its object file.
+        """
+        manifest_file = stable_dir / "source-manifest.json"
+        previous: dict[str, list[Any]] | None = None
+        with contextlib.suppress(OSError, ValueError):
+            previous = json.loads(manifest_file.read_text(encoding="utf-8"))
+
+        # Times from another directory say nothing about the contents
+        manifest = _source_manifest(
+            self.source_dir.resolve(),
+            exclude=self.build_dir.resolve(),
+            previous={} if relocated else previous or {},
+        )
+
+        def hashes(files: Mapping[str, list[Any]]) -> dict[str, str]:
+            return {rel: entry[2] for rel, entry in files.items()}
+
+        if relocated and (previous is None or hashes(previous) != hashes(manifest)):
+            logger.info("Relocated source files changed, cleaning the build directory")
+            for path in self.build_dir.iterdir():
+                if path.name in KEEP_ON_CLEAN:
+                    continue
+                if path.is_dir() and not path.is_symlink():
+                    shutil.rmtree(path)
+                else:
+                    path.unlink()
+
+        _write_if_changed(manifest_file, json.dumps(manifest))
+
+    def stable_path(self, path: Path) -> Path:
+        """
+        Rewrite a path through the stable symlinks if it is inside one of the
+        relocatable directories. Other paths (and all paths if not
+        relocatable) are returned unchanged.
+        """
+        if not self.stable_paths:
+            return path
+        resolved = Path(path).resolve()
+        build_dir = self.build_dir.resolve()
+        if resolved == build_dir or build_dir in resolved.parents:
+            return path
+
+        # Most specific first, a venv might be inside the source directory
+        for target in sorted(self.stable_paths, key=lambda p: -len(p.parts)):
+            if resolved == target or target in resolved.parents:
+                return self.stable_paths[target] / resolved.relative_to(target)
+        return path
 
     def _info_dict(self) -> dict[str, str]:
         """
         Produce an information dict about the current run that can be stored in a json file.
         """
         return {
-            "source_dir": os.fspath(self.source_dir.resolve()),
+            "source_dir": os.fspath(self.stable_path(self.source_dir.resolve())),
             "build_dir": os.fspath(self.build_dir.resolve()),
             "cmake_path": os.fspath(self.cmake),
-            "skbuild_path": os.fspath(DIR),
+            "skbuild_path": os.fspath(self.stable_path(DIR)),
             "skbuild_version": __version__,
             "python_executable": sys.executable,
         }
@@ -154,31 +297,31 @@ class CMaker:
     def init_cache(
         self, cache_settings: Mapping[str, str | os.PathLike[str] | bool]
     ) -> None:
-        with self.init_cache_file.open("w", encoding="utf-8") as f:
+        with io.StringIO() as f:
             for key, value in cache_settings.items():
                 if isinstance(value, bool):
                     str_value = "ON" if value else "OFF"
                     f.write(f'set({key} {str_value} CACHE BOOL "" FORCE)\n')
                 elif isinstance(value, os.PathLike):
                     # Convert to CMake's internal path format
-                    str_value = str(value).replace("\\", "/")
+                    str_value = str(self.stable_path(Path(value))).replace("\\", "/")
                     f.write(f'set({key} [===[{str_value}]===] CACHE PATH "" FORCE)\n')
                 else:
                     f.write(f'set({key} [===[{value}]===] CACHE STRING "" FORCE)\n')
 
             if self.module_dirs:
                 # Convert to CMake's internal path format, otherwise this breaks try_compile on Windows
-                module_dirs_str = ";".join(map(str, self.module_dirs)).replace(
-                    "\\", "/"
-                )
+                module_dirs_str = ";".join(
+                    map(str, map(self.stable_path, self.module_dirs))
+                ).replace("\\", "/")
                 f.write(
                     f'set(CMAKE_MODULE_PATH [===[{module_dirs_str}]===] CACHE PATH "" FORCE)\n'
                 )
 
             if self.prefix_dirs:
-                prefix_dirs_str = ";".join(map(str, self.prefix_dirs)).replace(
-                    "\\", "/"
-                )
+                prefix_dirs_str = ";".join(
+                    map(str, map(self.stable_path, self.prefix_dirs))
+                ).replace("\\", "/")
                 f.write(
                     f'set(CMAKE_PREFIX_PATH [===[{prefix_dirs_str}]===] CACHE PATH "" FORCE)\n'
                 )
@@ -186,7 +329,9 @@ class CMaker:
 
             if self.prefix_roots:
                 for pkg, path_list in self.prefix_roots.items():
-                    paths_str = ";".join(map(str, path_list)).replace("\\", "/")
+                    paths_str = ";".join(
+                        map(str, map(self.stable_path, path_list))
+                    ).replace("\\", "/")
                     f.write(
                         f'set({pkg}_ROOT [===[{paths_str}]===] CACHE PATH "" FORCE)\n'
                     )
@@ -195,7 +340,9 @@ class CMaker:
                         f'set({pkg.upper()}_ROOT [===[{paths_str}]===] CACHE PATH "" FORCE)\n'
                     )
 
-        contents = self.init_cache_file.read_text(encoding="utf-8").strip()
+            contents = f.getvalue()
+
+        _write_if_changed(self.init_cache_file, contents)
         logger.debug(
             "{}:\n{}",
             self.init_cache_file,
@@ -216,7 +363,7 @@ class CMaker:
                 str_value = "ON" if value else "OFF"
                 yield f"-D{key}:BOOL={str_value}"
             elif isinstance(value, os.PathLike):
-                str_value = str(value).replace("\\", "/")
+                str_value = str(self.stable_path(Path(value))).replace("\\", "/")
                 yield f"-D{key}:PATH={str_value}"
             else:
                 yield f"-D{key}={value}"
@@ -247,22 +394,56 @@ class CMaker:
         if self.single_config and self.build_type:
             all_args.insert(2, f"-DCMAKE_BUILD_TYPE:STRING={self.build_type}")
 
+        cached_gen = self._read_cache().get("CMAKE_GENERATOR")
+        if gen and cached_gen and gen != cached_gen:
+            msg = f"The build directory {self.build_dir} was configured with the {cached_gen} generator, not {gen}; remove it or use another build-dir"
+            if self.extra_build_types:
+                msg += " (cmake.extra-build-types needs a multi-config generator)"
+            elif cached_gen == "Ninja Multi-Config":
+                msg += " (it was configured for cmake.extra-build-types)"
+            raise CMakeConfigError(msg)
+
+        if self.extra_build_types:
+            if self.single_config:
+                msg = f"Extra build types need a multi-config generator, not {gen or 'the default generator'}"
+                raise CMakeConfigError(msg)
+            build_types = ";".join(self.build_types)
+            all_args.insert(2, f"-DCMAKE_CONFIGURATION_TYPES:STRING={build_types}")
+            if gen == "Ninja Multi-Config":
+                # Building without --config builds every configuration
+                all_args[3:3] = [
+                    f"-DCMAKE_DEFAULT_BUILD_TYPE:STRING={self.build_type}",
+                    "-DCMAKE_CROSS_CONFIGS:STRING=all",
+                    "-DCMAKE_DEFAULT_CONFIGS:STRING=all",
+                ]
+
         try:
             Run(env=self.env).live(self.cmake, *all_args)
         except subprocess.CalledProcessError:
             msg = "CMake configuration failed"
             raise FailedLiveProcessError(msg) from None
 
+    @property
+    def build_types(self) -> list[str]:
+        """
+        All the configurations that are built: the build type, then the extra
+        build types.
+        """
+        return list(dict.fromkeys([self.build_type, *self.extra_build_types]))
+
     def _compute_build_args(
         self,
         *,
         verbose: bool,
+        build_type: str | None = None,
     ) -> Generator[str, None, None]:
         if verbose:
             yield "-v"
-        if self.build_type and not self.single_config:
+        if build_type is None:
+            build_type = self.build_type
+        if build_type and not self.single_config:
             yield "--config"
-            yield self.build_type
+            yield build_type
 
     def build(
         self,
@@ -270,18 +451,125 @@ class CMaker:
         *,
         targets: Sequence[str] = (),
         verbose: bool = False,
+        pass_fds: Sequence[int] = (),
     ) -> None:
-        local_args = list(self._compute_build_args(verbose=verbose))
-        if not targets:
-            self._build(*local_args, *build_args)
-            return
+        build_types: list[str | None]
+        if not self.extra_build_types:
+            build_types = [self.build_type]
+        elif self._read_cache().get("CMAKE_GENERATOR") == "Ninja Multi-Config":
+            # One build of every configuration, so they are compiled in parallel
+            build_types = [""]
+        else:
+            build_types = list(self.build_types)
+
+        for build_type in build_types:
+            local_args = list(
+                self._compute_build_args(verbose=verbose, build_type=build_type)
+            )
+            if not targets:
+                self._build(*local_args, *build_args, pass_fds=pass_fds)
+                continue
+
+            for target in targets:
+                self._build(
+                    *local_args, "--target", target, *build_args, pass_fds=pass_fds
+                )
+
+    def _read_cache(self) -> dict[str, str]:
+        """
+        Read the entries of the CMakeCache.txt in the build directory (empty if
+        not configured yet).
+        """
+        try:
+            text = self.build_dir.joinpath("CMakeCache.txt").read_text(encoding="utf-8")
+        except OSError:
+            return {}
+        cache: dict[str, str] = {}
+        for line in text.splitlines():
+            if not line or line.startswith(("#", "//")) or "=" not in line:
+                continue
+            key, value = line.split("=", 1)
+            cache[key.split(":", 1)[0]] = value
+        return cache
+
+    def _ninja_command(self, args: Sequence[str]) -> list[str] | None:
+        """
+        The Ninja command equivalent to ``cmake --build`` with ``args``, or None
+        if ``cmake --build`` should be used. This skips CMake's startup on
+        no-op rebuilds. It's only used if this CMake generated the build
+        directory for Ninja after the last cache change, and all arguments can
+        be translated. Ninja still reruns CMake itself if a CMakeLists.txt (or
+        the cache) changes, just like it does when run by ``cmake --build``.
+        """
+        cache = self._read_cache()
+        if cache.get("CMAKE_GENERATOR") != "Ninja":
+            return None
+
+        ninja = cache.get("CMAKE_MAKE_PROGRAM", "")
+        try:
+            if self.build_dir.joinpath("build.ninja").stat().st_mtime_ns < (
+                self.build_dir.joinpath("CMakeCache.txt").stat().st_mtime_ns
+            ):
+                return None
+            if not ninja or not Path(ninja).is_file():
+                return None
+            cmake_command = cache.get("CMAKE_COMMAND", "")
+            if not cmake_command or not Path(cmake_command).samefile(self.cmake):
+                return None
+        except OSError:
+            return None
+
+        verbose = "VERBOSE" in self.env or cache.get(
+            "CMAKE_VERBOSE_MAKEFILE", ""
+        ).upper() in {"1", "ON", "YES", "TRUE", "Y"}
+        parallel = self.env.get("CMAKE_BUILD_PARALLEL_LEVEL", "")
+        targets: list[str] = []
+        native: list[str] = []
+
+        i = 0
+        while i < len(args):
+            arg = args[i]
+            if arg in {"-v", "--verbose"}:
+                verbose = True
+            elif arg in {"-t", "--target"} and i + 1 < len(args):
+                i += 1
+                targets.append(args[i])
+            elif arg in {"-j", "--parallel"}:
+                parallel = ""
+                if i + 1 < len(args) and args[i + 1].isdigit():
+                    i += 1
+                    parallel = args[i]
+            elif arg.startswith("-j") and arg[2:].isdigit():
+                parallel = arg[2:]
+            elif arg == "--":
+                native = list(args[i + 1 :])
+                break
+            else:
+                return None
+            i += 1
+
+        if parallel and not parallel.isdigit():
+            return None
 
-        for target in targets:
-            self._build(*local_args, "--target", target, *build_args)
+        cmd = [ninja]
+        if parallel:
+            cmd.append(f"-j{parallel}")
+        if verbose:
+            cmd.append("-v")
+        return [*cmd, *native, *targets]
 
-    def _build(self, *args: str) -> None:
+    def _build(self, *args: str, pass_fds: Sequence[int] = ()) -> None:
+        ninja_cmd = self._ninja_command(args)
         try:
-            Run(env=self.env).live(self.cmake, "--build", self.build_dir, *args)
+            if ninja_cmd is not None:
+                logger.debug("Build directory is up to date, running Ninja directly")
+                Run(env=self.env, cwd=self.build_dir, pass_fds=tuple(pass_fds)).live(
+                    *ninja_cmd
+                )
+            else:
+                Run(env=self.env, pass_fds=tuple(pass_fds)).live(
+                    self.cmake, "--build", self.build_dir, *args
+                )
         except subprocess.CalledProcessError:
             msg = "CMake build failed"
             raise FailedLiveProcessError(msg) from None
@@ -292,10 +580,17 @@ class CMaker:
         *,
         strip: bool = False,
         components: Sequence[str] = (),
+        build_type: str | None = None,
     ) -> None:
+        """
+        Install the build (the ``build_type`` configuration of a multi-config
+        build, the build type by default).
+        """
         opts = ["--prefix", str(prefix)] if prefix else []
-        if not self.single_config and self.build_type:
-            opts += ["--config", self.build_type]
+        if build_type is None:
+            build_type = self.build_type
+        if not self.single_config and build_type:
+            opts += ["--config", build_type]
         if strip:
             opts.append("--strip")
 
@@ -303,10 +598,60 @@ class CMaker:
             self._install(opts)
             return
 
-        for comp in components:
-            opts_with_comp = [*opts, "--component", comp]
+        if len(components) == 1:
+            (comp,) = components
             logger.info("Installing component {}", comp)
-            self._install(opts_with_comp)
+            start = time.perf_counter()
+            self._install([*opts, "--component", comp])
+            logger.info(
+                "Installed component {} in {:.2f}s", comp, time.perf_counter() - start
+            )
+            return
+
+        # Components install to disjoint sets of files (each writes its own
+        # install_manifest_<component>.txt), so they can run concurrently. The
+        # output is captured and replayed in order to keep the log readable.
+        max_workers = min(len(components), os.cpu_count() or 1)
+        logger.info(
+            "Installing components {} using {} workers", components, max_workers
+        )
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [
+                pool.submit(self._install_component, opts, comp) for comp in components
+            ]
+
+        failed = False
+        for comp, future in zip(components, futures):
+            result, duration = future.result()
+            sys.stdout.write(result.stdout or "")
+            sys.stderr.write(result.stderr or "")
+            sys.stdout.flush()
+            if result.returncode:
+                logger.error("Installing component {} failed", comp)
+                failed = True
+            else:
+                logger.info("Installed component {} in {:.2f}s", comp, duration)
+
+        if failed:
+            msg = "CMake install failed"
+            raise FailedLiveProcessError(msg)
+
+    def installed_files(self, components: Sequence[str] = ()) -> list[Path]:
+        """
+        The files the last install wrote, from the install manifests CMake
+        leaves in the build directory.
+        """
+        manifests = (
+            [f"install_manifest_{comp}.txt" for comp in components]
+            if components
+            else ["install_manifest.txt"]
+        )
+        files: list[Path] = []
+        for manifest in manifests:
+            with contextlib.suppress(OSError):
+                text = self.build_dir.joinpath(manifest).read_text(encoding="utf-8")
+                files.extend(Path(line) for line in text.splitlines() if line)
+        return files
 
     def _install(self, opts: Sequence[str]) -> None:
         try:
@@ -319,3 +664,26 @@ class CMaker:
         except subprocess.CalledProcessError:
             msg = "CMake install failed"
             raise FailedLiveProcessError(msg) from None
+
+    def _install_component(
+        self, opts: Sequence[str], comp: str
+    ) -> tuple[subprocess.CompletedProcess[str], float]:
+        """
+        Install a single component, capturing the output. Returns the
+        completed process (which may have failed) and the time taken.
+        """
+        start = time.perf_counter()
+        try:
+            result = Run(env=self.env).capture(
+                self.cmake,
+                "--install",
+                self.build_dir,
+                *opts,
+                "--component",
+                comp,
+            )
+        except subprocess.CalledProcessError as err:
+            result = subprocess.CompletedProcess(
+                err.cmd, err.returncode, err.stdout, err.stderr
+            )
+        return result, time.perf_counter() - start
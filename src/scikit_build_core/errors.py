@@ -13,6 +13,7 @@ __all__ = [
     "CMakeVersionError",
     "FailedLiveProcessError",
     "FailedProcessError",
+    "InterpreterNotFoundError",
     "NinjaNotFoundError",
     "NinjaVersionError",
     "NotFoundError",
@@ -48,6 +49,12 @@ class NinjaNotFoundError(NotFoundError):
     """
 
 
+class InterpreterNotFoundError(NotFoundError):
+    """
+    Raised when a Python interpreter to build for is not found or can't be run.
+    """
+
+
 class FailedProcessError(Exception):
     """
     Exception raised when an call fails.
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import contextlib
 import copy
 import importlib.metadata
 import os
@@ -19,11 +20,13 @@ from scikit_build_core.settings.skbuild_model import ScikitBuildSettings
 
 from .._logging import logger, rich_print
 from ..build._init import setup_logging
+from ..builder.build_lock import lock_build_dir
 from ..builder.builder import Builder, archs_to_tags, get_archs
 from ..builder.get_requires import GetRequires
 from ..builder.wheel_tag import WheelTag
 from ..cmake import CMake, CMaker
 from ..format import pyproject_format
+from ..hooks import BuildHooks
 from ..settings.skbuild_read_settings import SettingsReader
 
 __all__ = ["ScikitBuildHook"]
@@ -39,6 +42,7 @@ class ScikitBuildHook(BuildHookInterface):  # type: ignore[type-arg]
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
         self.__tmp_dir: Path | None = None
+        self.__build_lock = contextlib.ExitStack()
 
     def _read_config(self) -> SettingsReader:
         config_dict = copy.deepcopy(self.config)
@@ -126,11 +130,14 @@ class ScikitBuildHook(BuildHookInterface):  # type: ignore[type-arg]
             raise
 
     def _initialize(self, *, build_data: dict[str, Any]) -> None:
-        settings_reader = self._read_config()
-        settings = settings_reader.settings
-        state = settings_reader.state
+        hooks = BuildHooks.load(self.target_name)
+        with hooks.phase("settings"):
+            settings_reader = self._read_config()
+            settings = settings_reader.settings
+            state = settings_reader.state
 
-        self._validate(settings_reader)
+            self._validate(settings_reader)
+            hooks.settings = settings
 
         if state == "sdist":
             build_data["artifacts"].append("CMakeLists.txt")  # Needs full list, etc.
@@ -207,12 +214,18 @@ class ScikitBuildHook(BuildHookInterface):  # type: ignore[type-arg]
             source_dir=settings.cmake.source_dir,
             build_dir=build_dir,
             build_type=settings.cmake.build_type,
+            relocatable=settings.build.relocatable,
         )
 
         builder = Builder(
             settings=settings,
             config=config,
         )
+        hooks.build_dir = build_dir
+
+        # Other builds can use the same build directory at the same time
+        if settings.build_dir:
+            self.__build_lock.enter_context(lock_build_dir(build_dir))
 
         rich_print("{green}***", "{bold}Configuring CMake...")
         # Setting the install prefix because some libs hardcode CMAKE_INSTALL_PREFIX
@@ -223,12 +236,13 @@ class ScikitBuildHook(BuildHookInterface):  # type: ignore[type-arg]
         }
         cache_entries["SKBUILD_STATE"] = state
         cache_entries["SKBUILD_HATCHLING"] = importlib.metadata.version("hatchling")
-        builder.configure(
-            defines=defines,
-            cache_entries=cache_entries,
-            name=self.build_config.builder.metadata.name,
-            version=Version(self.build_config.builder.metadata.version),
-        )
+        with hooks.phase("configure"):
+            builder.configure(
+                defines=defines,
+                cache_entries=cache_entries,
+                name=self.build_config.builder.metadata.name,
+                version=Version(self.build_config.builder.metadata.version),
+            )
 
         default_gen = (
             "MSVC"
@@ -241,10 +255,13 @@ class ScikitBuildHook(BuildHookInterface):  # type: ignore[type-arg]
             f"{{bold}}Building project with {{blue}}{generator}{{default}}...",
         )
         build_args: list[str] = []
-        builder.build(build_args=build_args)
+        with hooks.phase("build"):
+            builder.build(build_args=build_args)
 
         rich_print("{green}***", "{bold}Installing project into wheel...")
-        builder.install(install_dir)
+        with hooks.phase("install", files=builder.installed_files):
+            builder.install(install_dir)
+        self.__build_lock.close()
 
         files = list(wheel_dirs["headers"].iterdir())
         if files:
@@ -296,6 +313,7 @@ class ScikitBuildHook(BuildHookInterface):  # type: ignore[type-arg]
         return super().finalize(version, build_data, artifact_path)
 
     def _cleanup(self) -> None:
+        self.__build_lock.close()
         if self.__tmp_dir:
             shutil.rmtree(self.__tmp_dir, ignore_errors=True)
             self.__tmp_dir = None
@@ -0,0 +1,163 @@
+"""
+Hooks let other packages follow a build, for telemetry, caching or uploading
+artifacts. A hook is a callable taking a :class:`HookEvent`, registered in the
+``scikit_build.hooks`` entry point group of any installed package:
+
+.. code-block:: toml
+
+    [project.entry-points."scikit_build.hooks"]
+    my_hook = "my_package.hooks:on_build_event"
+
+It is called before and after each phase of the build, also when the phase
+fails. An exception raised by a hook fails the build.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import dataclasses
+import functools
+import time
+from typing import TYPE_CHECKING, Literal
+
+from ._compat.importlib import metadata
+from ._logging import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Generator, Iterable, Mapping, Sequence
+    from pathlib import Path
+
+    from .settings.skbuild_model import ScikitBuildSettings
+
+__all__ = [
+    "HOOKS_GROUP",
+    "BuildHooks",
+    "HookEvent",
+    "Phase",
+]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+HOOKS_GROUP = "scikit_build.hooks"
+
+Phase = Literal["settings", "configure", "build", "install", "package"]
+
+
+@dataclasses.dataclass(frozen=True)
+class HookEvent:
+    """
+    Passed to the hooks before and after each phase.
+    """
+
+    #: The phase, in the order they run. Not every build runs every phase
+    #: (an SDist doesn't build anything, the hatch plugin leaves packaging to
+    #: hatchling, and a build reused from the artifact cache only packages).
+    phase: Phase
+
+    #: Whether the phase is about to start or has finished.
+    when: Literal["before", "after"]
+
+    #: What is being built, like ``"wheel"``, ``"sdist"`` or ``"editable"``.
+    state: str
+
+    #: The settings; None until they are read.
+    settings: ScikitBuildSettings | None
+
+    #: The CMake build directory; None until it is known.
+    build_dir: Path | None
+
+    #: The time in seconds each finished phase took.
+    timings: Mapping[str, float]
+
+    #: The files the phase produced (``"after"`` events only): the installed
+    #: files for ``"install"`` and the archive for ``"package"``.
+    files: Sequence[Path]
+
+    #: True for the ``"after"`` event of a phase that raised an error; the
+    #: build stops after it.
+    failed: bool = False
+
+
+@functools.lru_cache(maxsize=None)
+def _load_hooks() -> tuple[Callable[[HookEvent], None], ...]:
+    hooks = []
+    for ep in metadata.entry_points(group=HOOKS_GROUP):
+        logger.debug("Loading build hook {}", ep.name)
+        hooks.append(ep.load())
+    return tuple(hooks)
+
+
+@dataclasses.dataclass
+class BuildHooks:
+    """
+    Calls the hooks for one build. The phases cost nothing beyond a function
+    call if no hooks are registered.
+    """
+
+    hooks: Sequence[Callable[[HookEvent], None]]
+    state: str
+    settings: ScikitBuildSettings | None = None
+    build_dir: Path | None = None
+    timings: dict[str, float] = dataclasses.field(default_factory=dict)
+
+    @classmethod
+    def load(cls, state: str) -> BuildHooks:
+        """
+        Get the hooks registered by the installed packages.
+        """
+        return cls(_load_hooks(), state)
+
+    def __bool__(self) -> bool:
+        return bool(self.hooks)
+
+    @contextlib.contextmanager
+    def phase(
+        self,
+        phase: Phase,
+        *,
+        files: Callable[[], Iterable[Path]] | None = None,
+    ) -> Generator[None, None, None]:
+        """
+        Run the hooks around the block. ``files`` is only called, after the
+        block, if there are hooks. If the block raises, the "after" event is
+        still sent, marked as failed and without files.
+        """
+        if not self.hooks:
+            yield
+            return
+
+        self._call(phase, "before", ())
+        start = time.perf_counter()
+        failed = True
+        try:
+            yield
+            failed = False
+        finally:
+            self.timings[phase] = time.perf_counter() - start
+            if failed:
+                self._call(phase, "after", (), failed=True)
+        self._call(phase, "after", tuple(files()) if files is not None else ())
+
+    def _call(
+        self,
+        phase: Phase,
+        when: Literal["before", "after"],
+        files: Sequence[Path],
+        *,
+        failed: bool = False,
+    ) -> None:
+        event = HookEvent(
+            phase=phase,
+            when=when,
+            state=self.state,
+            settings=self.settings,
+            build_dir=self.build_dir,
+            timings=dict(self.timings),
+            files=files,
+            failed=failed,
+        )
+        for hook in self.hooks:
+            hook(event)
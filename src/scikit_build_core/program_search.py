@@ -22,8 +22,10 @@ if TYPE_CHECKING:
 __all__ = [
     "Program",
     "best_program",
+    "cache_probes",
     "get_cmake_program",
     "get_cmake_programs",
+    "get_ninja_program",
     "get_ninja_programs",
 ]
 
@@ -41,6 +43,32 @@ class Program(NamedTuple):
     version: Version | None
 
 
+# Programs already probed, keyed by path, modification time, and size. Only
+# used once enabled by cache_probes (the build server does this).
+_probe_cache: dict[tuple[str, int, int], Program] | None = None
+
+
+def cache_probes() -> None:
+    """
+    Remember the version of each program probed, until the program changes.
+    Used by long-running processes that search for the same programs many
+    times.
+    """
+    global _probe_cache  # noqa: PLW0603
+    if _probe_cache is None:
+        _probe_cache = {}
+
+
+def _probe_key(path: Path) -> tuple[str, int, int] | None:
+    if _probe_cache is None:
+        return None
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (str(path), stat.st_mtime_ns, stat.st_size)
+
+
 def _get_cmake_path(*, module: bool = True) -> Generator[Path, None, None]:
     """
     Get the path to CMake.
@@ -83,6 +111,19 @@ def get_cmake_program(cmake_path: Path) -> Program:
     Get the Program (with version) for CMake given a path. The version will be
     None if it cannot be determined.
     """
+    key = _probe_key(cmake_path)
+    if _probe_cache is not None and key in _probe_cache:
+        program = _probe_cache[key]
+        logger.info("CMake version (cached): {}", program.version)
+        return program
+
+    program = _get_cmake_program(cmake_path)
+    if _probe_cache is not None and key is not None and program.version is not None:
+        _probe_cache[key] = program
+    return program
+
+
+def _get_cmake_program(cmake_path: Path) -> Program:
     try:
         result = Run(timeout=TIMEOUT).capture(cmake_path, "-E", "capabilities")
         try:
@@ -138,24 +179,39 @@ def get_ninja_programs(*, module: bool = True) -> Generator[Program, None, None]
     yielded first.
     """
     for ninja_path in _get_ninja_path(module=module):
-        try:
-            result = Run(timeout=TIMEOUT).capture(ninja_path, "--version")
-        except (
-            subprocess.CalledProcessError,
-            PermissionError,
-            subprocess.TimeoutExpired,
-        ):
-            yield Program(ninja_path, None)
-            continue
+        yield get_ninja_program(ninja_path)
 
-        try:
-            version = Version(".".join(result.stdout.strip().split(".")[:3]))
-        except ValueError:
-            yield Program(ninja_path, None)
-            continue
 
-        logger.info("Ninja version: {}", version)
-        yield Program(ninja_path, version)
+def get_ninja_program(ninja_path: Path) -> Program:
+    """
+    Get the Program (with version) for Ninja given a path. The version will be
+    None if it cannot be determined.
+    """
+    key = _probe_key(ninja_path)
+    if _probe_cache is not None and key in _probe_cache:
+        program = _probe_cache[key]
+        logger.info("Ninja version (cached): {}", program.version)
+        return program
+
+    try:
+        result = Run(timeout=TIMEOUT).capture(ninja_path, "--version")
+    except (
+        subprocess.CalledProcessError,
+        PermissionError,
+        subprocess.TimeoutExpired,
+    ):
+        return Program(ninja_path, None)
+
+    try:
+        version = Version(".".join(result.stdout.strip().split(".")[:3]))
+    except ValueError:
+        return Program(ninja_path, None)
+
+    logger.info("Ninja version: {}", version)
+    program = Program(ninja_path, version)
+    if _probe_cache is not None and key is not None:
+        _probe_cache[key] = program
+    return program
 
 
 def get_make_programs() -> Generator[Path, None, None]:
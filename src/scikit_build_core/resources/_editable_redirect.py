@@ -163,6 +163,48 @@ class ScikitBuildRedirectingFinder(importlib.abc.MetaPathFinder):
             )
         return None
 
+    def _build_command(self, env: dict[str, str]) -> list[str]:
+        """
+        Run Ninja directly if the build directory was generated for Ninja after
+        the last cache change, skipping the startup of ``cmake --build``; Ninja
+        reruns CMake itself if needed.
+        """
+        assert self.path
+        cmake_build = ["cmake", "--build", ".", *self.build_options]
+        cache_file = os.path.join(self.path, "CMakeCache.txt")
+        try:
+            with open(cache_file, encoding="utf-8") as f:
+                cache = dict(
+                    line.rstrip("\n").split("=", 1)
+                    for line in f
+                    if line.startswith(("CMAKE_GENERATOR:", "CMAKE_MAKE_PROGRAM:"))
+                )
+            generated = os.path.getmtime(os.path.join(self.path, "build.ninja"))
+            if generated < os.path.getmtime(cache_file):
+                return cmake_build
+        except (OSError, ValueError):
+            return cmake_build
+
+        ninja = next(
+            (v for k, v in cache.items() if k.startswith("CMAKE_MAKE_PROGRAM:")), ""
+        )
+        if cache.get("CMAKE_GENERATOR:INTERNAL") != "Ninja" or not os.path.isfile(
+            ninja
+        ):
+            return cmake_build
+        if any(opt != "-v" for opt in self.build_options):
+            return cmake_build
+
+        cmd = [ninja]
+        parallel = env.get("CMAKE_BUILD_PARALLEL_LEVEL", "")
+        if parallel.isdigit():
+            cmd.append(f"-j{parallel}")
+        elif parallel:
+            return cmake_build
+        if self.build_options or "VERBOSE" in env:
+            cmd.append("-v")
+        return cmd
+
     def rebuild(self) -> None:
         # Don't rebuild if not set to a local path
         if not self.path:
@@ -181,13 +223,15 @@ class ScikitBuildRedirectingFinder(importlib.abc.MetaPathFinder):
         if verbose:
             print(f"Running cmake --build & --install in {self.path}")  # noqa: T201
 
-        lock = FileLockIfUnix(os.path.join(self.path, "editable_rebuild.lock"))
+        # Same lock file as builder/build_lock.py, so a rebuild on import and
+        # a pip build sharing this build directory wait for each other
+        lock = FileLockIfUnix(os.path.join(self.path, ".skbuild-lock"))
 
         try:
             lock.acquire()
 
             result = subprocess.run(
-                ["cmake", "--build", ".", *self.build_options],
+                self._build_command(env),
                 cwd=self.path,
                 stdout=sys.stderr if verbose else subprocess.PIPE,
                 env=env,
@@ -0,0 +1,86 @@
+"""
+Print what a build needs to know about this interpreter, as JSON. Run by the
+interpreter being described, so this only uses the standard library.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+import sys
+import sysconfig
+
+__all__ = ["interpreter_info"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+def _library() -> str | None:
+    """
+    The Python library, like ``get_python_library`` finds it (without the
+    cross-compiling support).
+    """
+    if sys.platform.startswith("win"):
+        ft = "t" if sysconfig.get_config_var("Py_GIL_DISABLED") else ""
+        lib = os.path.join(
+            sys.base_prefix, "libs", f"python3{sys.version_info[1]}{ft}.lib"
+        )
+        return lib if os.path.isfile(lib) else None
+
+    libdir: str | None = sysconfig.get_config_var("LIBDIR")
+    masd = sysconfig.get_config_var("multiarchsubdir")
+    if libdir and masd and sysconfig.get_config_var("MULTIARCH"):
+        libdir_masd = os.path.join(libdir, masd.lstrip(os.sep))
+        if os.path.isdir(libdir_masd):
+            libdir = libdir_masd
+    for name in ("LDLIBRARY", "LIBRARY"):
+        value: str | None = sysconfig.get_config_var(name)
+        if libdir and value and os.path.isfile(os.path.join(libdir, value)):
+            return os.path.join(libdir, value)
+    return None
+
+
+def _sabi_library() -> str | None:
+    if not sys.platform.startswith("win"):
+        return None
+    lib = os.path.join(sys.base_prefix, "libs", "python3.lib")
+    return lib if os.path.isfile(lib) else None
+
+
+def _numpy_include_dir() -> str | None:
+    try:
+        spec = importlib.util.find_spec("numpy")
+    except (ImportError, ValueError):
+        return None
+    if spec is None or not spec.submodule_search_locations:
+        return None
+    for location in spec.submodule_search_locations:
+        for core in ("_core", "core"):
+            include_dir = os.path.join(location, core, "include")
+            if os.path.isfile(os.path.join(include_dir, "numpy", "arrayobject.h")):
+                return include_dir
+    return None
+
+
+def interpreter_info() -> dict[str, object]:
+    return {
+        "executable": sys.executable,
+        "prefix": sys.prefix,
+        "implementation": sys.implementation.name,
+        "version": list(sys.version_info[:3]),
+        "abiflags": getattr(sys, "abiflags", ""),
+        "free_threaded": bool(sysconfig.get_config_var("Py_GIL_DISABLED")),
+        "include_dir": sysconfig.get_path("include"),
+        "numpy_include_dir": _numpy_include_dir(),
+        "ext_suffix": sysconfig.get_config_var("EXT_SUFFIX") or "",
+        "library": _library(),
+        "sabi_library": _sabi_library(),
+        "platform": sysconfig.get_platform(),
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(interpreter_info()))  # noqa: T201
@@ -0,0 +1,98 @@
+# Dependency provider for scikit-build-core's search.fetchcontent-cache setting.
+#
+# FetchContent sources are populated once into a shared cache directory keyed
+# by the declared details (so a new tag or URL is fetched again), and every
+# build uses them through FETCHCONTENT_SOURCE_DIR_<uppercaseName>. The
+# dependencies are still configured and built in each build directory.
+#
+# Set by scikit-build-core:
+#   SKBUILD_FETCHCONTENT_CACHE         the cache directory
+#   SKBUILD_FETCHCONTENT_DISCONNECTED  fail instead of populating missing entries
+
+include_guard(GLOBAL)
+
+function(_skbuild_fetchcontent_provider method dep_name)
+  string(TOUPPER "${dep_name}" dep_upper)
+  string(TOLOWER "${dep_name}" dep_lower)
+
+  # FetchContent_Declare always records the (default) directories, which are
+  # inside the build directory and not part of the content
+  cmake_parse_arguments(PARSE_ARGV 2 arg "" "SOURCE_DIR;BINARY_DIR;SUBBUILD_DIR"
+                        "")
+  set(details ${arg_UNPARSED_ARGUMENTS})
+
+  # Leave custom source directories and find_package-first dependencies to
+  # FetchContent
+  if(NOT "${FETCHCONTENT_BASE_DIR}" STREQUAL "")
+    set(default_source_dir "${FETCHCONTENT_BASE_DIR}/${dep_lower}-src")
+  else()
+    set(default_source_dir "${CMAKE_BINARY_DIR}/_deps/${dep_lower}-src")
+  endif()
+  if((DEFINED arg_SOURCE_DIR AND NOT arg_SOURCE_DIR STREQUAL default_source_dir)
+     OR "FIND_PACKAGE_ARGS" IN_LIST details
+     OR FETCHCONTENT_TRY_FIND_PACKAGE_MODE STREQUAL "ALWAYS")
+    return()
+  endif()
+
+  string(SHA256 key "${details}")
+  string(SUBSTRING "${key}" 0 16 key)
+  set(entry "${SKBUILD_FETCHCONTENT_CACHE}/${dep_lower}-${key}")
+
+  file(MAKE_DIRECTORY "${SKBUILD_FETCHCONTENT_CACHE}")
+  file(
+    LOCK "${entry}.lock"
+    GUARD FUNCTION
+    TIMEOUT 600
+    RESULT_VARIABLE lock_result)
+  if(NOT lock_result EQUAL 0)
+    message(FATAL_ERROR "Could not lock ${entry}.lock: ${lock_result}")
+  endif()
+
+  if(NOT EXISTS "${entry}/.skbuild-populated")
+    if(SKBUILD_FETCHCONTENT_DISCONNECTED)
+      message(
+        FATAL_ERROR
+          "${dep_name} is not in the FetchContent cache ${SKBUILD_FETCHCONTENT_CACHE}"
+          " and search.fetchcontent-disconnected is set")
+    endif()
+
+    # These FetchContent_Declare options are not population options
+    set(populate_args ${details})
+    list(REMOVE_ITEM populate_args EXCLUDE_FROM_ALL SYSTEM OVERRIDE_FIND_PACKAGE)
+
+    message(STATUS "Populating ${dep_name} in the FetchContent cache")
+    file(REMOVE_RECURSE "${entry}")
+    include(FetchContent)
+    FetchContent_Populate(
+      skbuild_${dep_lower}
+      QUIET
+      SOURCE_DIR "${entry}/src"
+      SUBBUILD_DIR "${CMAKE_BINARY_DIR}/_deps/${dep_lower}-skbuild-subbuild"
+      BINARY_DIR "${CMAKE_BINARY_DIR}/_deps/${dep_lower}-skbuild-unused"
+      ${populate_args})
+    file(TOUCH "${entry}/.skbuild-populated")
+  endif()
+
+  message(STATUS "Using ${dep_name} from the FetchContent cache: ${entry}/src")
+  set(FETCHCONTENT_SOURCE_DIR_${dep_upper}
+      "${entry}/src"
+      PARENT_SCOPE)
+endfunction()
+
+# FetchContent stores the source directory given by the provider in the cache,
+# where it would hide changed details on the next configure; drop those
+get_cmake_property(_skbuild_cache_vars CACHE_VARIABLES)
+foreach(_skbuild_var IN LISTS _skbuild_cache_vars)
+  if(_skbuild_var MATCHES "^FETCHCONTENT_SOURCE_DIR_")
+    string(FIND "${${_skbuild_var}}" "${SKBUILD_FETCHCONTENT_CACHE}/" _skbuild_pos)
+    if(_skbuild_pos EQUAL 0)
+      unset(${_skbuild_var} CACHE)
+    endif()
+  endif()
+endforeach()
+unset(_skbuild_cache_vars)
+unset(_skbuild_var)
+unset(_skbuild_pos)
+
+cmake_language(SET_DEPENDENCY_PROVIDER _skbuild_fetchcontent_provider
+               SUPPORTED_METHODS FETCHCONTENT_MAKEAVAILABLE_SERIAL)
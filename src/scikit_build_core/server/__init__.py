@@ -0,0 +1,391 @@
+"""
+A local build server that keeps the backend warm between PEP 517 hook calls.
+
+Each hook normally runs in a fresh Python process, which has to import the
+backend and probe CMake and Ninja before it can start. The server does this
+once, then forks a worker for each hook call it is sent. Start it with
+``python -m scikit_build_core.server``; the backend hooks delegate to it when
+it is running, and run in process when it isn't (or can't serve them).
+"""
+
+from __future__ import annotations
+
+import argparse
+import array
+import contextlib
+import importlib
+import json
+import os
+import socket
+import sys
+import tempfile
+import time
+import traceback
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .. import __version__
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+    from typing import NoReturn
+
+__all__ = ["default_socket_path", "delegate", "get_socket_path", "main", "serve"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+SERVER_ENV = "SKBUILD_SERVER"
+
+HOOKS = (
+    "build_editable",
+    "build_sdist",
+    "build_wheel",
+    "get_requires_for_build_editable",
+    "get_requires_for_build_sdist",
+    "get_requires_for_build_wheel",
+    "prepare_metadata_for_build_editable",
+    "prepare_metadata_for_build_wheel",
+)
+
+# How long to wait for the server to accept a connection before building in
+# process instead
+CONNECT_TIMEOUT = 1.0
+
+# How often the server checks for finished workers and the idle timeout
+POLL_INTERVAL = 1.0
+
+# Set in the workers, so they don't delegate to the server again
+_worker = False
+
+
+def default_socket_path() -> Path:
+    """
+    The socket the server listens on by default, private to the current user.
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return Path(runtime_dir) / f"scikit-build-core-{os.getuid()}.sock"
+
+
+def get_socket_path() -> Path | None:
+    """
+    The socket to use, from ``SKBUILD_SERVER`` if set. Returns None if the
+    server is disabled (``SKBUILD_SERVER=0``) or not supported on this
+    platform.
+    """
+    if sys.platform.startswith("win"):
+        return None
+    value = os.environ.get(SERVER_ENV)
+    if value == "0":
+        return None
+    return Path(value) if value else default_socket_path()
+
+
+def _compatibility() -> dict[str, str]:
+    """
+    The server runs builds with its own copy of scikit-build-core and its
+    own interpreter, so these have to match the client's.
+    """
+    return {
+        "scikit-build-core": __version__,
+        "python": sys.version,
+        "executable": sys.executable,
+        "prefix": sys.prefix,
+    }
+
+
+def _send(sock: socket.socket, data: Any, *, fds: Sequence[int] = ()) -> None:
+    if fds:
+        # File descriptors are passed with a single byte of data
+        sock.sendmsg(
+            [b"\0"], [(socket.SOL_SOCKET, socket.SCM_RIGHTS, array.array("i", fds))]
+        )
+    sock.sendall(json.dumps(data).encode("utf-8") + b"\n")
+
+
+def _recv_fds(sock: socket.socket, count: int) -> list[int]:
+    fds = array.array("i")
+    _, ancdata, _, _ = sock.recvmsg(1, socket.CMSG_SPACE(count * fds.itemsize))
+    for level, kind, data in ancdata:
+        if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+            fds.frombytes(data[: len(data) - (len(data) % fds.itemsize)])
+    return list(fds)
+
+
+def _read(sock: socket.socket) -> Any:
+    with sock.makefile("rb") as f:
+        line = f.readline()
+    return json.loads(line) if line else None
+
+
+def _is_own_socket(path: Path) -> bool:
+    try:
+        stat = path.stat()
+    except OSError:
+        return False
+    return stat.st_uid == os.getuid() and path.is_socket()
+
+
+def delegate(hook: str, *args: Any) -> Any:
+    """
+    Run a backend hook on the build server, with this process's working
+    directory, environment, ``sys.path``, and output. Returns None if there
+    is no server that can run it, in which case the hook should run in
+    process. Hooks never return None themselves.
+    """
+    if _worker:
+        return None
+    socket_path = get_socket_path()
+    if socket_path is None or not _is_own_socket(socket_path):
+        return None
+
+    request = {
+        "hook": hook,
+        "args": args,
+        "cwd": str(Path.cwd()),
+        "env": dict(os.environ),
+        "sys_path": sys.path,
+        "compatibility": _compatibility(),
+    }
+    sys.stdout.flush()
+    sys.stderr.flush()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(os.fspath(socket_path))
+            sock.settimeout(None)
+            _send(sock, request, fds=(1, 2))
+            response = _read(sock)
+    except OSError:
+        return None
+
+    # A server that can't run this build, or a worker that died
+    if response is None or response["status"] == "incompatible":
+        return None
+    if response["status"] == "exit":
+        raise SystemExit(response["code"])
+    return response["result"]
+
+
+def _check(request: Any) -> str | None:
+    """
+    Returns the reason this server can't run a request, or None if it can.
+    """
+    if not isinstance(request, dict) or request.get("hook") not in HOOKS:
+        return "invalid request"
+    mismatched = [
+        key
+        for key, value in _compatibility().items()
+        if request["compatibility"].get(key) != value
+    ]
+    if mismatched:
+        return "different " + ", ".join(mismatched)
+    return None
+
+
+def _run_worker(
+    conn: socket.socket, fds: Sequence[int], request: Any, *, build_cache: bool
+) -> NoReturn:
+    """
+    Run a hook in a forked worker, as if it was running in the client.
+    """
+    global _worker  # noqa: PLW0603
+    _worker = True
+
+    try:
+        os.dup2(fds[0], 1)
+        os.dup2(fds[1], 2)
+        os.chdir(request["cwd"])
+        os.environ.clear()
+        os.environ.update(request["env"])
+        if build_cache:
+            os.environ.setdefault("SKBUILD_BUILD_CACHE_ENABLED", "true")
+        sys.path[:] = request["sys_path"]
+
+        from .. import build
+
+        # The hooks available depend on the project
+        importlib.reload(build)
+        result = getattr(build, request["hook"])(*request["args"])
+        response: dict[str, Any] = {"status": "ok", "result": result}
+    except SystemExit as err:
+        if err.code is None or isinstance(err.code, int):
+            code = err.code or 0
+        else:
+            print(err.code, file=sys.stderr)  # noqa: T201
+            code = 1
+        response = {"status": "exit", "code": code}
+    except BaseException:  # noqa: BLE001
+        traceback.print_exc()
+        response = {"status": "exit", "code": 1}
+
+    sys.stdout.flush()
+    sys.stderr.flush()
+    try:
+        _send(conn, response)
+    except OSError:
+        os._exit(1)
+    os._exit(0)
+
+
+def _handle(
+    listener: socket.socket, conn: socket.socket, *, build_cache: bool
+) -> int | None:
+    """
+    Handle a connection, returning the PID of the worker started for it.
+    """
+    from .._logging import rich_print
+    from .._shutil import ResourceLog, Run
+
+    fds = _recv_fds(conn, 2)
+    try:
+        request = _read(conn) if len(fds) == 2 else {}
+        reason = _check(request)
+        if reason is not None:
+            rich_print("{yellow}Refused request:{normal} {reason}", reason=reason)
+            _send(conn, {"status": "incompatible", "reason": reason})
+            return None
+
+        rich_print(
+            "{bold}{hook}{normal} in {cwd}", hook=request["hook"], cwd=request["cwd"]
+        )
+        # Don't keep the commands run for earlier requests
+        Run.resource_log = ResourceLog()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            listener.close()
+            _run_worker(conn, fds, request, build_cache=build_cache)
+        return pid
+    finally:
+        for fd in fds:
+            os.close(fd)
+
+
+def _accept(listener: socket.socket) -> socket.socket | None:
+    try:
+        conn, _ = listener.accept()
+    except socket.timeout:
+        return None
+    return conn
+
+
+def _reap(workers: set[int]) -> None:
+    for pid in list(workers):
+        done, _ = os.waitpid(pid, os.WNOHANG)
+        if done:
+            workers.discard(pid)
+
+
+def _warm_up() -> None:
+    """
+    Import the backend and probe the programs each build looks for, so the
+    workers start with them.
+    """
+    from ..build import sdist, wheel  # noqa: F401
+    from ..builder import get_requires  # noqa: F401
+    from ..program_search import cache_probes, get_cmake_programs, get_ninja_programs
+
+    cache_probes()
+    list(get_cmake_programs())
+    list(get_ninja_programs())
+
+
+def serve(
+    socket_path: Path,
+    *,
+    idle_timeout: float | None = None,
+    build_cache: bool = False,
+) -> None:
+    """
+    Serve hook calls on a Unix socket until interrupted, or until no hooks
+    have run for ``idle_timeout`` seconds. If ``build_cache`` is set, builds
+    use the build cache unless they set ``build-cache.enabled`` themselves,
+    so each project's configured build directory is reused across calls.
+    """
+    from .._logging import rich_print
+
+    if _is_own_socket(socket_path):
+        with contextlib.suppress(OSError), socket.socket(socket.AF_UNIX) as sock:
+            sock.connect(os.fspath(socket_path))
+            msg = f"A build server is already listening on {socket_path}"
+            raise SystemExit(msg)
+        # Left behind by a server that didn't exit cleanly
+        socket_path.unlink()
+
+    _warm_up()
+
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    workers: set[int] = set()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+        umask = os.umask(0o077)
+        try:
+            listener.bind(os.fspath(socket_path))
+        finally:
+            os.umask(umask)
+        listener.listen()
+        listener.settimeout(POLL_INTERVAL)
+        rich_print(
+            "{bold}Build server listening on{normal} {socket_path}",
+            socket_path=socket_path,
+        )
+
+        last_active = time.monotonic()
+        try:
+            while True:
+                _reap(workers)
+                if workers:
+                    last_active = time.monotonic()
+                elif idle_timeout and time.monotonic() - last_active > idle_timeout:
+                    rich_print("Build server idle, exiting")
+                    break
+
+                conn = _accept(listener)
+                if conn is None:
+                    continue
+                last_active = time.monotonic()
+                with conn:
+                    pid = _handle(listener, conn, build_cache=build_cache)
+                if pid is not None:
+                    workers.add(pid)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            socket_path.unlink(missing_ok=True)
+            for pid in workers:
+                os.waitpid(pid, 0)
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m scikit_build_core.server",
+        description="Serve build backend hook calls from a warm process",
+    )
+    parser.add_argument(
+        "--socket",
+        type=Path,
+        default=None,
+        help=f"Socket to listen on (default: ${SERVER_ENV}, or one in the user's runtime or temporary directory)",
+    )
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Exit after no builds have run for this long",
+    )
+    parser.add_argument(
+        "--build-cache",
+        action="store_true",
+        help="Reuse each project's build directory, unless it disables the build cache",
+    )
+    args = parser.parse_args(None if argv is None else list(argv))
+
+    socket_path = args.socket or get_socket_path()
+    if socket_path is None:
+        msg = "The build server is not supported on this platform or is disabled"
+        raise SystemExit(msg)
+    serve(socket_path, idle_timeout=args.idle_timeout, build_cache=args.build_cache)
@@ -9,6 +9,7 @@ from .._compat.typing import Annotated
 
 __all__ = [
     "BackportSettings",
+    "BuildCacheSettings",
     "BuildSettings",
     "CMakeSettings",
     "CMakeSettingsDefine",
@@ -92,6 +93,16 @@ class CMakeSettings:
     "", etc.
     """
 
+    extra_build_types: List[str] = dataclasses.field(default_factory=list)
+    """
+    More build types to build from the same configure, like ``["Debug"]``.
+    This uses a multi-config generator (Ninja Multi-Config instead of Ninja),
+    and the configurations are compiled together. A wheel is made for each
+    extra build type, in a subdirectory of the wheel directory named after
+    it (like ``debug/``). Only for wheels, not editable installs. pip only
+    keeps the main wheel; use ``python -m build`` to keep the others.
+    """
+
     source_dir: Path = Path()
     """
     The source directory to use when building the project. Currently only
@@ -103,6 +114,14 @@ class CMakeSettings:
     DEPRECATED in 0.10; use build.targets instead.
     """
 
+    profile: bool = False
+    """
+    Profile the CMake configure step and print the slowest commands in the
+    project's files and the slowest CMake files afterwards. The raw trace is
+    kept in the build directory, and can be opened in a trace viewer. Requires
+    CMake 3.18+.
+    """
+
 
 @dataclasses.dataclass
 class SearchSettings:
@@ -111,6 +130,20 @@ class SearchSettings:
     Add the python build environment site_packages folder to the CMake prefix paths.
     """
 
+    fetchcontent_cache: bool = False
+    """
+    Populate FetchContent dependencies once into a shared cache in the user
+    cache directory, keyed by their declared details, instead of in every
+    build directory. The dependencies are still built in the build directory.
+    Uses a dependency provider, so requires CMake 3.24+.
+    """
+
+    fetchcontent_disconnected: bool = False
+    """
+    Never download FetchContent dependencies; fail if one is not in the cache
+    yet. Requires ``search.fetchcontent-cache``.
+    """
+
 
 @dataclasses.dataclass
 class NinjaSettings:
@@ -286,6 +319,61 @@ class BuildSettings:
     Verbose printout when building.
     """
 
+    parallel: str = ""
+    """
+    The number of parallel build jobs. Empty (the default) uses the generator
+    default, unless ``CMAKE_BUILD_PARALLEL_LEVEL`` is set. Can be an integer,
+    "auto" to compute the jobs from the available CPUs (respecting affinity
+    and cgroup quotas) and memory (assuming 1G per job), or a memory size per
+    job like "2G" to use instead of 1G in the "auto" computation. Inside a
+    parent parallel build that provides a make jobserver (``MAKEFLAGS``), the
+    build joins it, or takes at most this many jobs from it.
+    """
+
+    compiler_launcher: str = ""
+    """
+    A compiler launcher like ``ccache`` or ``sccache`` to set as
+    ``CMAKE_<LANG>_COMPILER_LAUNCHER`` for C, CXX, CUDA, and Fortran. "auto"
+    uses ccache or sccache if found on the PATH. The cache is kept per project
+    in the user cache directory, and the hits and misses are printed after the
+    build.
+    """
+
+    report: bool = False
+    """
+    Print a report after Ninja builds with the slowest build steps, an
+    estimate of the critical path, and the effective parallelism. A history
+    is kept in the build directory to flag steps that got slower than in the
+    previous build. Also prints the wall time, CPU time and peak memory of
+    each CMake command run, and the peak memory of the Python process. Run
+    ``python -m scikit_build_core.build ninja-report BUILD_DIR`` to see the
+    report of a build directory again.
+    """
+
+    report_json: str = ""
+    """
+    Also write the build report as JSON to this path (relative to the project
+    directory). Requires ``build.report``.
+    """
+
+    relocatable: bool = False
+    """
+    Keep a persistent build directory valid when the source directory or the
+    isolated build environment moves, as it does on every pip build from an
+    SDist. CMake is pointed at stable symlinks inside the build directory
+    instead, so the CMake cache and object files are reused. If the files of
+    a moved source directory changed, the build directory is cleaned. Not
+    supported on Windows.
+    """
+
+    toolchain_cache: bool = False
+    """
+    Cache CMake's compiler detection (compiler identification and ABI checks)
+    in the user cache directory, and reuse it in fresh build directories. The
+    cache is keyed by the CMake version, generator, and compiler settings from
+    the environment and CMake defines; it's not used if a compiler changed.
+    """
+
     requires: List[str] = dataclasses.field(default_factory=list)
     """
     Additional ``build-system.requires``. Intended to be used in combination
@@ -293,6 +381,54 @@ class BuildSettings:
     """
 
 
+@dataclasses.dataclass
+class BuildCacheSettings:
+    enabled: bool = False
+    """
+    Use a managed, persistent build directory in the user cache when
+    ``build-dir`` is not set, making repeated builds incremental. Entries are
+    keyed by the project directory, wheel tag, build type, and the configure
+    inputs; editable and regular builds share an entry. Builds from an
+    unpacked SDist run in a new directory each time, so they only reuse an
+    entry with ``build.relocatable``. Use ``python -m scikit_build_core.build
+    cache`` to list or prune entries.
+    """
+
+    max_size: str = "10G"
+    """
+    The total size of the build cache. The least recently used entries are
+    removed after a build to stay within this size.
+    """
+
+    root: str = ""
+    """
+    The directory to hold the build cache. Defaults to
+    ``scikit-build-core/build`` in the user cache directory.
+    """
+
+    artifacts: bool = False
+    """
+    Reuse the wheel from an earlier build with the same fingerprint (see
+    ``python -m scikit_build_core.build fingerprint``) instead of configuring
+    and building. Editable builds reuse the installed files instead; not
+    supported with ``editable.rebuild`` or the inplace mode. Use ``python -m
+    scikit_build_core.build cache --artifacts`` to list, verify, or prune
+    entries.
+    """
+
+    artifacts_max_size: str = "5G"
+    """
+    The total size of the artifact cache. The least recently used entries are
+    removed after a build is stored to stay within this size.
+    """
+
+    artifacts_root: str = ""
+    """
+    The directory to hold the artifact cache. Defaults to
+    ``scikit-build-core/artifacts`` in the user cache directory.
+    """
+
+
 @dataclasses.dataclass
 class InstallSettings:
     components: List[str] = dataclasses.field(default_factory=list)
@@ -306,6 +442,18 @@ class InstallSettings:
     0.5+ (0.5-0.10.5 also incorrectly set this for debug builds).
     """
 
+    mode: Literal["copy", "symlink", "hardlink"] = "copy"
+    """
+    How files are installed into the wheel staging directory. "symlink" sets
+    ``CMAKE_INSTALL_MODE`` so installed files link to the build directory
+    instead of being copied, and "hardlink" then replaces those links with
+    hard links (or copies across filesystems). Requires CMake 3.22+. CMake
+    skips RPATH changes and stripping for linked files, so if the install
+    would do either, files are copied instead, keeping the wheel contents the
+    same as "copy". Set ``install.strip = false`` to link binaries in release
+    builds.
+    """
+
 
 @dataclasses.dataclass
 class GenerateSettings:
@@ -361,6 +509,9 @@ class ScikitBuildSettings:
     backport: BackportSettings = dataclasses.field(default_factory=BackportSettings)
     editable: EditableSettings = dataclasses.field(default_factory=EditableSettings)
     build: BuildSettings = dataclasses.field(default_factory=BuildSettings)
+    build_cache: BuildCacheSettings = dataclasses.field(
+        default_factory=BuildCacheSettings
+    )
     install: InstallSettings = dataclasses.field(default_factory=InstallSettings)
     generate: List[GenerateSettings] = dataclasses.field(default_factory=list)
     messages: MessagesSettings = dataclasses.field(default_factory=MessagesSettings)
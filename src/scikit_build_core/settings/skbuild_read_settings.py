@@ -13,6 +13,7 @@ from packaging.version import Version
 from .. import __version__
 from .._compat import tomllib
 from .._logging import logger, rich_error, rich_print, rich_warning
+from ..builder.parallel import parse_size
 from ..errors import CMakeConfigError
 from .auto_cmake_version import find_min_cmake_version
 from .auto_requires import get_min_requires
@@ -222,6 +223,17 @@ class SettingsReader:
             if not self.settings.build_dir:
                 rich_error("editable mode with rebuild requires build-dir")
 
+        parallel = self.settings.build.parallel.strip()
+        if parallel and not parallel.isdigit() and parallel.lower() != "auto":
+            try:
+                parse_size(parallel)
+            except ValueError:
+                rich_error(
+                    "build.parallel must be empty, a number of jobs, 'auto', or "
+                    "the memory used by one job like '2G', not {parallel!r}",
+                    parallel=parallel,
+                )
+
         install_policy = (
             self.settings.minimum_version is None
             or self.settings.minimum_version >= Version("0.5")
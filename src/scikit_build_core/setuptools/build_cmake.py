@@ -14,6 +14,7 @@ from .._logging import LEVEL_VALUE, raw_logger
 from ..builder.builder import Builder, get_archs
 from ..builder.macos import normalize_macos_version
 from ..cmake import CMake, CMaker
+from ..hooks import BuildHooks
 from ..settings.skbuild_read_settings import SettingsReader
 
 if TYPE_CHECKING:
@@ -111,8 +112,11 @@ class BuildCMake(setuptools.Command):
         assert self.build_temp is not None
         assert self.plat_name is not None
 
-        settings = SettingsReader.from_file("pyproject.toml").settings
-        _validate_settings(settings)
+        hooks = BuildHooks.load("editable" if self.editable_mode else "wheel")
+        with hooks.phase("settings"):
+            settings = SettingsReader.from_file("pyproject.toml").settings
+            _validate_settings(settings)
+            hooks.settings = settings
 
         build_tmp_folder = Path(self.build_temp)
         build_temp = build_tmp_folder / "_skbuild"  # TODO: include python platform
@@ -142,12 +146,14 @@ class BuildCMake(setuptools.Command):
             source_dir=Path(source_dir),
             build_dir=build_temp,
             build_type=settings.cmake.build_type,
+            relocatable=settings.build.relocatable,
         )
 
         builder = Builder(
             settings=settings,
             config=config,
         )
+        hooks.build_dir = build_temp
 
         # Setuptools requires this be specified if there's a mismatch.
         if sys.platform.startswith("darwin"):
@@ -163,13 +169,14 @@ class BuildCMake(setuptools.Command):
         install_dir = Path(self.build_lib)
         defines = {"CMAKE_INSTALL_PREFIX": install_dir}
 
-        builder.configure(
-            name=dist.get_name(),
-            version=Version(dist.get_version()),
-            defines=defines,
-            limited_api=bool(limited_api),
-            configure_args=configure_args,
-        )
+        with hooks.phase("configure"):
+            builder.configure(
+                name=dist.get_name(),
+                version=Version(dist.get_version()),
+                defines=defines,
+                limited_api=bool(limited_api),
+                configure_args=configure_args,
+            )
 
         # Set CMAKE_BUILD_PARALLEL_LEVEL to control the parallel build level
         # across all generators.
@@ -180,8 +187,10 @@ class BuildCMake(setuptools.Command):
         if "CMAKE_BUILD_PARALLEL_LEVEL" not in builder.config.env and self.parallel:
             build_args.append(f"-j{self.parallel}")
 
-        builder.build(build_args=build_args)
-        builder.install(install_dir=install_dir)
+        with hooks.phase("build"):
+            builder.build(build_args=build_args)
+        with hooks.phase("install", files=builder.installed_files):
+            builder.install(install_dir=install_dir)
 
     # def "get_source_file"(self) -> list[str]:
     #    return ["CMakeLists.txt"]
@@ -0,0 +1,3 @@
+from ._module import square
+
+__all__ = ["square"]
@@ -0,0 +1 @@
+float square(float x) { return x * x; }
@@ -0,0 +1,24 @@
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+float square(float x);
+
+static PyObject *square_wrapper(PyObject *self, PyObject *args) {
+  float input, result;
+  if (!PyArg_ParseTuple(args, "f", &input)) {
+    return NULL;
+  }
+  result = square(input);
+  return PyFloat_FromDouble(result);
+}
+
+static PyMethodDef shared_core_methods[] = {
+    {"square", square_wrapper, METH_VARARGS, "Square function"},
+    {NULL, NULL, 0, NULL}};
+
+static struct PyModuleDef shared_core_module = {
+    PyModuleDef_HEAD_INIT, "_module", NULL, -1, shared_core_methods};
+
+PyMODINIT_FUNC PyInit__module(void) {
+  return PyModule_Create(&shared_core_module);
+}
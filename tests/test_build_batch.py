@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+import sys
+import time
+import zipfile
+from pathlib import Path
+
+import pytest
+
+import scikit_build_core.build.batch
+import scikit_build_core.program_search
+from scikit_build_core.build.__main__ import main
+from scikit_build_core.build.batch import _make_jobserver, _take_token, build_batch
+
+DIR = Path(__file__).parent.resolve()
+SIMPLEST = DIR / "packages/simplest_c"
+
+
+@pytest.fixture(autouse=True)
+def _probe_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Batches cache the probes for the rest of the process
+    monkeypatch.setattr(scikit_build_core.program_search, "_probe_cache", None)
+
+
+@pytest.mark.skipif(sys.platform.startswith("win"), reason="Needs a pipe jobserver")
+def test_jobserver_tokens():
+    with _make_jobserver(3) as (jobserver, makeflags):
+        read_fd, write_fd = jobserver.pass_fds
+        assert makeflags == f"-j3 --jobserver-auth={read_fd},{write_fd}"
+        first = _take_token(jobserver)
+        second = _take_token(jobserver)
+        assert first is not None
+        assert second is not None
+        assert _take_token(jobserver) is None
+
+        first.close()
+        third = _take_token(jobserver)
+        assert third is not None
+        second.close()
+        third.close()
+
+
+@pytest.mark.skipif(sys.platform.startswith("win"), reason="Needs a pipe jobserver")
+@pytest.mark.skipif(not shutil.which("make"), reason="Needs make")
+def test_jobserver_make(tmp_path: Path):
+    # Any GNU make can join, not just 4.4+
+    tmp_path.joinpath("Makefile").write_text(
+        "all: a b\na b:\n\t@echo $@\n", encoding="utf-8"
+    )
+    with _make_jobserver(3) as (jobserver, makeflags):
+        result = subprocess.run(
+            ["make"],
+            cwd=tmp_path,
+            env={**os.environ, "MAKEFLAGS": makeflags},
+            pass_fds=jobserver.pass_fds,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+    assert result.returncode == 0, result.stderr
+    assert "jobserver" not in result.stderr
+
+
+def test_build_batch_duplicates(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    projects = [tmp_path / "one", tmp_path / "two"]
+    for project in projects:
+        shutil.copytree(
+            SIMPLEST, project, ignore=shutil.ignore_patterns("dist", "build")
+        )
+    monkeypatch.setattr(os, "fork", pytest.fail)
+
+    with pytest.raises(SystemExit):
+        build_batch(projects, tmp_path / "dist")
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="Needs fork")
+def test_build_batch_interrupted(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    project = tmp_path / "project"
+    shutil.copytree(SIMPLEST, project, ignore=shutil.ignore_patterns("dist", "build"))
+
+    def build_project(*_args: object, **_kwargs: object) -> str:
+        time.sleep(60)
+        return "never.whl"
+
+    pids = []
+    fork = os.fork
+
+    def record_fork() -> int:
+        pid = fork()
+        if pid:
+            pids.append(pid)
+        return pid
+
+    parent = os.getpid()
+    sleep = time.sleep
+
+    def interrupt(seconds: float) -> None:
+        if os.getpid() == parent:
+            raise KeyboardInterrupt
+        sleep(seconds)
+
+    monkeypatch.setattr(scikit_build_core.build.batch, "_warm_up", lambda: None)
+    monkeypatch.setattr(scikit_build_core.build.batch, "_build_project", build_project)
+    monkeypatch.setattr(os, "fork", record_fork)
+    monkeypatch.setattr(time, "sleep", interrupt)
+
+    start = time.perf_counter()
+    with pytest.raises(KeyboardInterrupt):
+        build_batch([project], tmp_path / "dist", jobs=1)
+    assert time.perf_counter() - start < 30
+
+    # The worker was stopped and reaped
+    assert len(pids) == 1
+    with pytest.raises(ChildProcessError):
+        os.waitpid(pids[0], os.WNOHANG)
+
+
+@pytest.mark.compile
+@pytest.mark.configure
+def test_build_batch(tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    projects = [tmp_path / "one", tmp_path / "two", tmp_path / "broken"]
+    for project in projects:
+        shutil.copytree(
+            SIMPLEST, project, ignore=shutil.ignore_patterns("dist", "build")
+        )
+    # The wheels of the projects must not have the same name
+    for project, version in zip(projects[1:], ["0.0.2", "0.0.3"]):
+        pyproject = project / "pyproject.toml"
+        pyproject.write_text(
+            pyproject.read_text(encoding="utf-8").replace("0.0.1", version),
+            encoding="utf-8",
+        )
+    cmakelists = projects[2] / "CMakeLists.txt"
+    cmakelists.write_text(
+        cmakelists.read_text(encoding="utf-8") + "\nnot_a_command(\n",
+        encoding="utf-8",
+    )
+
+    results = build_batch(
+        projects, tmp_path / "dist", jobs=2, log_dir=tmp_path / "logs"
+    )
+    out = capsys.readouterr().out
+
+    assert [result.project for result in results] == projects
+    assert [result.ok for result in results] == [True, True, False]
+    assert results[2].error == "exited with 1"
+    for result in results[:2]:
+        assert result.wheel is not None
+        with zipfile.ZipFile(tmp_path / "dist" / result.wheel) as zf:
+            assert any(name.startswith("simplest/_module") for name in zf.namelist())
+
+    # The end of the failed build's log is shown
+    assert "CMake configuration failed" in out
+    assert "Built 2 of 3 projects" in out
+    if sys.platform.startswith("win"):
+        return
+    assert results[2].log is not None
+    assert "CMake configuration failed" in results[2].log.read_text(encoding="utf-8")
+
+
+@pytest.mark.compile
+@pytest.mark.configure
+def test_build_batch_cli(tmp_path: Path):
+    project = tmp_path / "project"
+    shutil.copytree(SIMPLEST, project, ignore=shutil.ignore_patterns("dist", "build"))
+
+    dist = tmp_path / "dist"
+    main(["batch", str(project), "-w", str(dist), "-j", "1"])
+    assert len(list(dist.glob("*.whl"))) == 1
+
+    with pytest.raises(SystemExit):
+        main(["batch", str(project), str(tmp_path / "missing"), "-w", str(dist)])
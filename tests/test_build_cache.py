@@ -0,0 +1,348 @@
+from __future__ import annotations
+
+import json
+import shutil
+import zipfile
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+import scikit_build_core.hooks
+from scikit_build_core.build import (
+    build_editable,
+    build_wheel,
+    prepare_metadata_for_build_wheel,
+)
+from scikit_build_core.build.__main__ import main
+from scikit_build_core.build.fingerprint import get_fingerprint
+from scikit_build_core.builder.build_cache import (
+    ENTRY_INFO,
+    configure_fingerprint,
+    get_build_dir,
+    get_cache_root,
+    list_entries,
+    prune,
+    restore_artifact,
+    store_artifact,
+    verify_entry,
+)
+from scikit_build_core.builder.build_lock import lock_build_dir
+from scikit_build_core.settings.skbuild_model import ScikitBuildSettings
+
+if TYPE_CHECKING:
+    from scikit_build_core.hooks import HookEvent
+
+DIR = Path(__file__).parent.resolve()
+SIMPLEST = DIR / "packages/simplest_c"
+
+
+def make_entry(root: Path, name: str, size: int, last_used: float) -> Path:
+    build_dir = get_build_dir(
+        root,
+        name=name,
+        project_dir=root,
+        wheel_tag="py3-none-any",
+        build_type="Release",
+        state="wheel",
+        fingerprint="0",
+    )
+    build_dir.mkdir()
+    build_dir.joinpath("data.bin").write_bytes(b"0" * size)
+    info_file = build_dir.parent / ENTRY_INFO
+    info = json.loads(info_file.read_text(encoding="utf-8"))
+    info["last_used"] = last_used
+    info_file.write_text(json.dumps(info), encoding="utf-8")
+    return build_dir
+
+
+def test_cache_root(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr("sys.platform", "linux")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert get_cache_root() == tmp_path / "scikit-build-core/build"
+    assert get_cache_root(str(tmp_path / "other")) == tmp_path / "other"
+
+
+def test_get_build_dir_key(tmp_path: Path) -> None:
+    kwargs = {
+        "name": "proj",
+        "project_dir": tmp_path,
+        "wheel_tag": "cp312-cp312-linux_x86_64",
+        "build_type": "Release",
+        "state": "wheel",
+        "fingerprint": "abc",
+    }
+    build_dir = get_build_dir(tmp_path, **kwargs)
+    assert build_dir.parent.parent == tmp_path
+    assert build_dir.parent.name.startswith("proj-")
+    assert get_build_dir(tmp_path, **kwargs) == build_dir
+    assert get_build_dir(tmp_path, **{**kwargs, "build_type": "Debug"}) != build_dir
+    assert len(list_entries(tmp_path)) == 2
+
+    # Editable and regular builds share the build directory
+    assert get_build_dir(tmp_path, **{**kwargs, "state": "editable"}) == build_dir
+    (entry,) = (e for e in list_entries(tmp_path) if e.build_dir == build_dir)
+    assert entry.info["state"] == "editable"
+
+
+def test_configure_fingerprint() -> None:
+    settings = ScikitBuildSettings()
+    base = configure_fingerprint(settings, {})
+    assert configure_fingerprint(settings, {"UNRELATED": "1"}) == base
+    assert configure_fingerprint(settings, {"CMAKE_ARGS": "-DX=1"}) != base
+    settings.cmake.define["X"] = "1"  # type: ignore[assignment]
+    assert configure_fingerprint(settings, {}) != base
+
+
+def test_prune_lru(tmp_path: Path) -> None:
+    old = make_entry(tmp_path, "old", 1000, 1.0)
+    current = make_entry(tmp_path, "current", 1000, 2.0)
+    new = make_entry(tmp_path, "new", 1000, 3.0)
+
+    assert [e.build_dir for e in list_entries(tmp_path)] == [new, current, old]
+
+    removed = prune(tmp_path, 2500)
+    assert [e.build_dir for e in removed] == [old]
+    assert not old.exists()
+
+    removed = prune(tmp_path, 0, keep=[current])
+    assert [e.build_dir for e in removed] == [new]
+    assert current.exists()
+
+
+def test_prune_skips_locked(tmp_path: Path) -> None:
+    locked = make_entry(tmp_path, "locked", 1000, 1.0)
+    unlocked = make_entry(tmp_path, "unlocked", 1000, 2.0)
+
+    with lock_build_dir(locked):
+        removed = prune(tmp_path, 0)
+    assert [e.build_dir for e in removed] == [unlocked]
+    assert locked.exists()
+    assert not unlocked.exists()
+
+
+def test_cache_main(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    make_entry(tmp_path, "first", 10, 1.0)
+    make_entry(tmp_path, "second", 10, 2.0)
+
+    main(["cache", "--root", str(tmp_path), "list"])
+    out = capsys.readouterr().out
+    assert out.index("second") < out.index("first")
+    assert "py3-none-any" in out
+
+    main(["cache", "--root", str(tmp_path), "prune"])
+    assert "Removed 2 build cache entries" in capsys.readouterr().out
+    assert not list_entries(tmp_path)
+
+
+@pytest.mark.compile
+@pytest.mark.configure
+def test_build_cache_wheel(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    dist = tmp_path / "dist"
+    cache = tmp_path / "cache"
+    monkeypatch.chdir(SIMPLEST)
+    if Path("dist").is_dir():
+        shutil.rmtree("dist")
+
+    config = {"build-cache.enabled": "true", "build-cache.root": str(cache)}
+    build_wheel(str(dist), config_settings=config)
+    (entry,) = list_entries(cache)
+    assert entry.info["name"] == "simplest"
+    assert entry.info["state"] == "wheel"
+    assert entry.build_dir.joinpath("CMakeCache.txt").is_file()
+    first_used = entry.last_used
+
+    build_wheel(str(dist), config_settings=config)
+    (entry,) = list_entries(cache)
+    assert entry.last_used > first_used
+
+
+@pytest.mark.compile
+@pytest.mark.configure
+def test_build_cache_editable_shared(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capfd: pytest.CaptureFixture[str]
+) -> None:
+    cache = tmp_path / "cache"
+    monkeypatch.chdir(SIMPLEST)
+    if Path("dist").is_dir():
+        shutil.rmtree("dist")
+
+    config = {"build-cache.enabled": "true", "build-cache.root": str(cache)}
+    build_wheel(str(tmp_path / "dist1"), config_settings=config)
+    assert "Building C object" in capfd.readouterr().out
+
+    build_editable(str(tmp_path / "dist2"), config_settings=config)
+    build_wheel(str(tmp_path / "dist3"), config_settings=config)
+    assert "Building C object" not in capfd.readouterr().out
+    (entry,) = list_entries(cache)
+    assert entry.info["state"] == "wheel"
+
+
+def test_artifact_store_restore(tmp_path: Path) -> None:
+    root = tmp_path / "artifacts"
+    staged = tmp_path / "staged"
+    staged.joinpath("platlib/pkg").mkdir(parents=True)
+    staged.joinpath("platlib/pkg/_module.so").write_bytes(b"binary")
+    kwargs = {"name": "pkg", "state": "editable", "fingerprint": "0123456789abcdef0"}
+
+    assert restore_artifact(root, **kwargs) is None
+    store_artifact(root, staged, **kwargs)
+    artifact = restore_artifact(root, **kwargs)
+    assert artifact is not None
+    assert artifact.joinpath("platlib/pkg/_module.so").read_bytes() == b"binary"
+    assert restore_artifact(root, **{**kwargs, "state": "wheel"}) is None
+
+    (entry,) = list_entries(root)
+    assert not verify_entry(entry)
+
+    # A damaged entry is reported, and removed instead of being used
+    artifact.joinpath("platlib/pkg/_module.so").write_bytes(b"damaged")
+    assert verify_entry(entry) == ["platlib/pkg/_module.so"]
+    main(["cache", "--artifacts", "--root", str(root), "list"])
+    with pytest.raises(SystemExit):
+        main(["cache", "--artifacts", "--root", str(root), "verify"])
+    assert restore_artifact(root, **kwargs) is None
+    assert not list_entries(root)
+
+
+@pytest.mark.compile
+@pytest.mark.configure
+def test_artifact_cache_wheel(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capfd: pytest.CaptureFixture[str]
+) -> None:
+    cache = tmp_path / "cache"
+    monkeypatch.chdir(SIMPLEST)
+    if Path("dist").is_dir():
+        shutil.rmtree("dist")
+
+    config = {"build-cache.artifacts": "true", "build-cache.artifacts-root": str(cache)}
+    first = build_wheel(str(tmp_path / "dist1"), config_settings=config)
+    (entry,) = list_entries(cache)
+    assert entry.info["state"] == "wheel"
+    capfd.readouterr()
+
+    second = build_wheel(str(tmp_path / "dist2"), config_settings=config)
+    out = capfd.readouterr().out
+    assert "Reused cached" in out
+    assert "Configuring CMake" not in out
+    assert second == first
+    wheel = (tmp_path / "dist2" / second).read_bytes()
+    assert wheel == (tmp_path / "dist1" / first).read_bytes()
+
+    # A different input builds again
+    build_wheel(
+        str(tmp_path / "dist3"),
+        config_settings={**config, "cmake.define.UNUSED": "1"},
+    )
+    assert "Configuring CMake" in capfd.readouterr().out
+    assert len(list_entries(cache)) == 2
+
+
+@pytest.mark.compile
+@pytest.mark.configure
+def test_artifact_cache_metadata_directory(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capfd: pytest.CaptureFixture[str]
+) -> None:
+    cache = tmp_path / "cache"
+    monkeypatch.chdir(SIMPLEST)
+    if Path("dist").is_dir():
+        shutil.rmtree("dist")
+
+    config = {"build-cache.artifacts": "true", "build-cache.artifacts-root": str(cache)}
+    build_wheel(str(tmp_path / "dist1"), config_settings=config)
+    metadata = tmp_path / "metadata"
+    dist_info = metadata / prepare_metadata_for_build_wheel(str(metadata))
+    capfd.readouterr()
+
+    # Matching metadata can use the cached wheel
+    build_wheel(
+        str(tmp_path / "dist2"),
+        config_settings=config,
+        metadata_directory=str(dist_info),
+    )
+    assert "Reused cached" in capfd.readouterr().out
+
+    # Metadata that doesn't match gets the same check as a fresh build
+    with dist_info.joinpath("METADATA").open("a", encoding="utf-8") as f:
+        f.write("Keywords: changed\n")
+    with pytest.raises(AssertionError, match="Metadata mismatch in METADATA"):
+        build_wheel(
+            str(tmp_path / "dist3"),
+            config_settings=config,
+            metadata_directory=str(dist_info),
+        )
+    assert "Reused cached" not in capfd.readouterr().out
+
+
+@pytest.mark.compile
+@pytest.mark.configure
+def test_artifact_cache_matches_fingerprint(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache = tmp_path / "cache"
+    shutil.copytree(SIMPLEST, tmp_path / "src", ignore=shutil.ignore_patterns("dist"))
+    monkeypatch.chdir(tmp_path / "src")
+    with Path("pyproject.toml").open("a", encoding="utf-8") as f:
+        f.write(
+            "\n[[tool.scikit-build.generate]]\n"
+            'path = "src/simplest/_version.py"\n'
+            "template = \"version = '${version}'\"\n"
+            'location = "source"\n'
+        )
+    config = {"build-cache.artifacts": "true", "build-cache.artifacts-root": str(cache)}
+
+    # The key the docs point to is the one the build uses, before and after
+    # the generated file exists
+    before = get_fingerprint(config).hexdigest
+    build_wheel(str(tmp_path / "dist"), config_settings=config)
+    (entry,) = list_entries(cache)
+    assert entry.info["fingerprint"] == before == get_fingerprint(config).hexdigest
+
+
+@pytest.mark.compile
+@pytest.mark.configure
+def test_artifact_cache_hooks(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    events: list[HookEvent] = []
+    monkeypatch.setattr(
+        scikit_build_core.hooks, "_load_hooks", lambda: (events.append,)
+    )
+    cache = tmp_path / "cache"
+    shutil.copytree(SIMPLEST, tmp_path / "src", ignore=shutil.ignore_patterns("dist"))
+    monkeypatch.chdir(tmp_path / "src")
+    config = {"build-cache.artifacts": "true", "build-cache.artifacts-root": str(cache)}
+    build_wheel(str(tmp_path / "dist1"), config_settings=config)
+    events.clear()
+
+    wheel = build_wheel(str(tmp_path / "dist2"), config_settings=config)
+    assert [(e.phase, e.when) for e in events] == [
+        ("settings", "before"),
+        ("settings", "after"),
+        ("package", "before"),
+        ("package", "after"),
+    ]
+    assert events[-1].files == (tmp_path / "dist2" / wheel,)
+
+
+@pytest.mark.compile
+@pytest.mark.configure
+def test_artifact_cache_editable(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capfd: pytest.CaptureFixture[str]
+) -> None:
+    cache = tmp_path / "cache"
+    monkeypatch.chdir(SIMPLEST)
+    if Path("dist").is_dir():
+        shutil.rmtree("dist")
+
+    config = {"build-cache.artifacts": "true", "build-cache.artifacts-root": str(cache)}
+    first = build_editable(str(tmp_path / "dist1"), config_settings=config)
+    capfd.readouterr()
+
+    second = build_editable(str(tmp_path / "dist2"), config_settings=config)
+    out = capfd.readouterr().out
+    assert "Reusing cached installed files" in out
+    assert "Configuring CMake" not in out
+
+    with zipfile.ZipFile(tmp_path / "dist1" / first) as zf1, zipfile.ZipFile(
+        tmp_path / "dist2" / second
+    ) as zf2:
+        assert sorted(zf1.namelist()) == sorted(zf2.namelist())
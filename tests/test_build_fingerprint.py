@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from scikit_build_core.build.__main__ import _parse_config_settings, main
+from scikit_build_core.build.fingerprint import get_fingerprint
+
+DIR = Path(__file__).parent.resolve()
+SIMPLEST = DIR / "packages/simplest_c"
+
+
+@pytest.fixture
+def project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    src = tmp_path / "src"
+    shutil.copytree(SIMPLEST, src, ignore=shutil.ignore_patterns("dist", "build"))
+    monkeypatch.chdir(src)
+    for name in ("CMAKE_ARGS", "CC", "CXX", "FC"):
+        monkeypatch.delenv(name, raising=False)
+    return src
+
+
+def test_parse_config_settings():
+    assert _parse_config_settings(["a=1", "b=2", "a=3", "c="]) == {
+        "a": ["1", "3"],
+        "b": "2",
+        "c": "",
+    }
+
+
+def test_fingerprint_stable(project: Path):
+    fingerprint = get_fingerprint()
+    assert get_fingerprint() == fingerprint
+    assert len(fingerprint.hexdigest) == 64
+
+    # Ignored files and settings that don't change the wheel are not included
+    project.joinpath("build").mkdir()
+    project.joinpath("build/ignored.txt").write_text("ignored", encoding="utf-8")
+    assert get_fingerprint({"logging.level": "DEBUG"}) == fingerprint
+
+
+@pytest.mark.parametrize(
+    ("component", "change"),
+    [
+        ("sources", "source"),
+        ("settings", "setting"),
+        ("env", "env"),
+    ],
+)
+def test_fingerprint_changes(
+    project: Path, monkeypatch: pytest.MonkeyPatch, component: str, change: str
+):
+    fingerprint = get_fingerprint()
+    config_settings = {}
+    if change == "source":
+        module = project / "src/module.c"
+        module.write_text(module.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+    elif change == "setting":
+        config_settings["cmake.define.FOO"] = "1"
+    else:
+        monkeypatch.setenv("CMAKE_ARGS", "-DFOO=1")
+
+    changed = get_fingerprint(config_settings)
+    assert changed.hexdigest != fingerprint.hexdigest
+    assert [
+        name
+        for name, value in changed.components.items()
+        if fingerprint.components[name] != value
+    ] == [component]
+
+
+@pytest.mark.usefixtures("project")
+def test_fingerprint_cli(capsys: pytest.CaptureFixture[str]):
+    main(["fingerprint", "-C", "cmake.define.FOO=1", "--json"])
+    data = json.loads(capsys.readouterr().out)
+    expected = get_fingerprint({"cmake.define.FOO": "1"})
+    assert data["fingerprint"] == expected.hexdigest
+    assert data["components"] == expected.components
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import shutil
+import subprocess
+import sys
+import threading
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from scikit_build_core.builder.build_lock import lock_build_dir, try_lock_build_dir
+
+DIR = Path(__file__).parent.resolve()
+SIMPLEST = DIR / "packages/simplest_c"
+
+
+def test_lock_build_dir(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    build_dir = tmp_path / "build"
+    order: list[str] = []
+
+    def other_build() -> None:
+        with lock_build_dir(build_dir):
+            order.append("other")
+
+    with lock_build_dir(build_dir):
+        thread = threading.Thread(target=other_build)
+        thread.start()
+        thread.join(0.5)
+        assert thread.is_alive()
+        order.append("first")
+    thread.join()
+
+    assert order == ["first", "other"]
+    assert "Waiting for another build" in capsys.readouterr().out
+
+    # Released after an error too
+    with pytest.raises(RuntimeError), lock_build_dir(build_dir):
+        raise RuntimeError
+    with lock_build_dir(build_dir):
+        pass
+
+
+def test_lock_build_dir_removed(tmp_path: Path) -> None:
+    build_dir = tmp_path / "entry" / "build"
+    locked = threading.Event()
+    release = threading.Event()
+
+    def other_build() -> None:
+        with lock_build_dir(build_dir):
+            locked.set()
+            release.wait()
+
+    # A prune removes the directory while a build is waiting for it
+    with lock_build_dir(build_dir):
+        thread = threading.Thread(target=other_build)
+        thread.start()
+        thread.join(0.5)
+        shutil.rmtree(tmp_path / "entry")
+    try:
+        assert locked.wait(5)
+
+        # The waiting build holds a lock on the directory that exists now
+        assert build_dir.is_dir()
+        with try_lock_build_dir(build_dir) as taken:
+            assert not taken
+    finally:
+        release.set()
+        thread.join()
+
+
+@pytest.mark.compile
+@pytest.mark.configure
+def test_concurrent_builds(tmp_path: Path) -> None:
+    build_dir = tmp_path / "build"
+    code = (
+        "import sys; from scikit_build_core.build import build_wheel; "
+        "build_wheel(sys.argv[1], {'build-dir': sys.argv[2]})"
+    )
+    procs = [
+        subprocess.Popen(
+            [sys.executable, "-c", code, str(tmp_path / f"dist{i}"), str(build_dir)],
+            cwd=SIMPLEST,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+        )
+        for i in range(2)
+    ]
+    outputs = [proc.communicate()[0] for proc in procs]
+    assert [proc.returncode for proc in procs] == [0, 0], outputs
+
+    # The objects are compiled once, and each build gets a full wheel
+    assert sum(out.count("Building C object") for out in outputs) == 1
+    for i in range(2):
+        (wheel,) = (tmp_path / f"dist{i}").glob("*.whl")
+        with zipfile.ZipFile(wheel) as zf:
+            assert any(name.startswith("simplest/_module") for name in zf.namelist())
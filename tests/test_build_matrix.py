@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import dataclasses
+import shutil
+import sys
+import zipfile
+from pathlib import Path
+
+import packaging.tags
+import pytest
+
+from scikit_build_core.build.__main__ import main
+from scikit_build_core.build.matrix import build_matrix
+from scikit_build_core.builder.interpreter import Interpreter
+from scikit_build_core.builder.wheel_tag import WheelTag
+from scikit_build_core.errors import InterpreterNotFoundError
+
+DIR = Path(__file__).parent.resolve()
+SHARED_CORE = DIR / "packages/shared_core"
+
+
+def _other_interpreter() -> Interpreter | None:
+    """
+    Another CPython on the PATH, with a different minor version.
+    """
+    for minor in range(8, 15):
+        if minor == sys.version_info.minor:
+            continue
+        try:
+            interpreter = Interpreter.from_executable(f"python3.{minor}")
+        except InterpreterNotFoundError:
+            continue
+        if interpreter.implementation == "cpython" and not interpreter.free_threaded:
+            return interpreter
+    return None
+
+
+def test_interpreter_current():
+    interpreter = Interpreter.current()
+    assert interpreter.is_current
+    best_tag = next(iter(packaging.tags.sys_tags()))
+    assert interpreter.interpreter_tag == best_tag.interpreter
+    assert interpreter.abi_tag == best_tag.abi
+
+    probed = Interpreter.from_executable(sys.executable)
+    assert probed.is_current
+    assert probed.soabi == interpreter.soabi
+
+
+def test_interpreter_tags():
+    interpreter = dataclasses.replace(
+        Interpreter.current(),
+        implementation="cpython",
+        version=(3, 13, 0),
+        abiflags="t",
+        free_threaded=True,
+    )
+    assert not interpreter.is_current
+    assert interpreter.interpreter_tag == "cp313"
+    assert interpreter.abi_tag == "cp313t"
+
+    tag = WheelTag.compute_best([], "cp38", interpreter=interpreter)
+    assert tag.pyver == "cp313"
+    assert tag.abi == "cp313t"
+
+    pypy = dataclasses.replace(
+        interpreter,
+        implementation="pypy",
+        version=(3, 10, 14),
+        abiflags="",
+        free_threaded=False,
+        ext_suffix=".pypy310-pp73-x86_64-linux-gnu.so",
+    )
+    assert pypy.interpreter_tag == "pp310"
+    assert pypy.abi_tag == "pypy310_pp73"
+
+    cpython = dataclasses.replace(pypy, implementation="cpython", version=(3, 9, 1))
+    tag = WheelTag.compute_best([], "cp38", interpreter=cpython)
+    assert tag.pyver == "cp38"
+    assert tag.abi == "abi3"
+    tag = WheelTag.compute_best([], "cp310", interpreter=cpython)
+    assert tag.pyver == "cp39"
+    assert tag.abi == "cp39"
+
+
+def test_interpreter_not_found(tmp_path: Path):
+    with pytest.raises(InterpreterNotFoundError, match="Could not find"):
+        Interpreter.from_executable(tmp_path / "python")
+
+    broken = tmp_path / "python"
+    broken.write_text("#!/bin/sh\nexit 1\n", encoding="utf-8")
+    broken.chmod(0o755)
+    if not sys.platform.startswith("win"):
+        with pytest.raises(InterpreterNotFoundError, match="Could not run"):
+            Interpreter.from_executable(broken)
+
+
+@pytest.mark.compile
+@pytest.mark.configure
+def test_build_matrix(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capfd: pytest.CaptureFixture[str]
+):
+    other = _other_interpreter()
+    if other is None:
+        pytest.skip("Needs another CPython version on the PATH")
+
+    project = tmp_path / "project"
+    shutil.copytree(SHARED_CORE, project)
+    monkeypatch.chdir(project)
+
+    dist = tmp_path / "dist"
+    wheels = build_matrix(
+        dist,
+        [sys.executable, other.executable, sys.executable],
+        {"build.verbose": "true"},
+    )
+    out = capfd.readouterr().out
+
+    current = Interpreter.current()
+    assert wheels == [
+        f"shared_core-0.0.1-{current.interpreter_tag}-{current.abi_tag}-{WheelTag.compute_best([]).arch}.whl",
+        f"shared_core-0.0.1-{other.interpreter_tag}-{other.abi_tag}-{WheelTag.compute_best([]).arch}.whl",
+    ]
+    for wheel, interpreter in zip(wheels, [current, other]):
+        with zipfile.ZipFile(dist / wheel) as zf:
+            assert f"shared_core/_module{interpreter.ext_suffix}" in zf.namelist()
+
+    # The core library doesn't use Python, so it's only compiled once
+    assert out.count("core.dir/src/core.c.o -c") == 1
+    assert out.count("_module.dir/src/module.c.o -c") == 2
+    assert "makes the same wheel" in out
+
+
+@pytest.mark.compile
+@pytest.mark.configure
+def test_build_matrix_cli(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    project = tmp_path / "project"
+    shutil.copytree(SHARED_CORE, project)
+    monkeypatch.chdir(project)
+
+    dist = tmp_path / "dist"
+    main(["matrix", "-p", sys.executable, "-w", str(dist)])
+    assert len(list(dist.glob("*.whl"))) == 1
+
+    with pytest.raises(SystemExit):
+        main(["matrix", "-p", str(tmp_path / "missing"), "-w", str(dist)])
@@ -142,7 +142,10 @@ def test_build_tool_args():
     )
     tmpbuilder.build(["a"])
     config.build.assert_called_once_with(
-        build_args=["a", "--", "b"], targets=[], verbose=settings.build.verbose
+        build_args=["a", "--", "b"],
+        targets=[],
+        verbose=settings.build.verbose,
+        pass_fds=(),
     )
 
 
@@ -264,3 +267,92 @@ def test_wheel_tag_with_abi_darwin(monkeypatch):
 
     tags = WheelTag.compute_best(["x86_64"], py_api="py2.py3")
     assert str(tags) == "py2.py3-none-macosx_10_10_x86_64"
+
+
+def test_build_parallel(monkeypatch):
+    monkeypatch.setattr(
+        "scikit_build_core.builder.builder.get_parallel_level", lambda _: 3
+    )
+    config = unittest.mock.create_autospec(CMaker)
+    config.env = {}
+    settings = ScikitBuildSettings(build=BuildSettings(parallel="auto"))
+    tmpbuilder = Builder(
+        settings=settings,
+        config=typing.cast(CMaker, config),
+    )
+    tmpbuilder.build([])
+    assert config.env["CMAKE_BUILD_PARALLEL_LEVEL"] == "3"
+
+    config.env = {"CMAKE_BUILD_PARALLEL_LEVEL": "8"}
+    tmpbuilder.build([])
+    assert config.env["CMAKE_BUILD_PARALLEL_LEVEL"] == "8"
+
+
+def test_entry_point_search_path_no_import(tmp_path, monkeypatch):
+    site = tmp_path / "site"
+    for package in ("installed/cmake_dir", "editable"):
+        pkg = site / package
+        pkg.mkdir(parents=True)
+        pkg.joinpath("__init__.py").write_text("raise ImportError('imported')\n")
+    site.joinpath("installed/__init__.py").write_text("raise ImportError('imported')\n")
+
+    for name, entry_points, record in (
+        (
+            "installed",
+            (
+                "[cmake.module]\nskbuild_test = installed.cmake_dir\n"
+                "[cmake.root]\nSkbuildTestRoot = installed\n"
+            ),
+            "installed/__init__.py,,\ninstalled/cmake_dir/__init__.py,,\n",
+        ),
+        ("editable", "[cmake.prefix]\nskbuild_test = editable\n", ""),
+    ):
+        dist_info = site / f"{name}-1.0.dist-info"
+        dist_info.mkdir()
+        dist_info.joinpath("METADATA").write_text(
+            f"Metadata-Version: 2.1\nName: {name}\nVersion: 1.0\n"
+        )
+        dist_info.joinpath("entry_points.txt").write_text(entry_points)
+        if record:
+            dist_info.joinpath("RECORD").write_text(record)
+    monkeypatch.syspath_prepend(str(site))
+
+    builder = Builder(
+        settings=ScikitBuildSettings(),
+        config=typing.cast("CMaker", SimpleNamespace(env={})),
+    )
+    modules = builder._get_entry_point_search_path("cmake.module")
+    assert modules["skbuild_test"] == [site / "installed/cmake_dir"]
+    prefixes = builder._get_entry_point_search_path("cmake.prefix")
+    assert prefixes["skbuild_test"] == [site / "editable"]
+    roots = builder._get_entry_point_search_path("cmake.root")
+    assert roots["SkbuildTestRoot"] == [site / "installed"]
+    assert "installed" not in sys.modules
+    assert "editable" not in sys.modules
+
+
+def test_entry_point_search_path_new_install(tmp_path, monkeypatch):
+    site = tmp_path / "site"
+    site.mkdir()
+    monkeypatch.syspath_prepend(str(site))
+    builder = Builder(
+        settings=ScikitBuildSettings(),
+        config=typing.cast("CMaker", SimpleNamespace(env={})),
+    )
+    assert "skbuild_new" not in builder._get_entry_point_search_path("cmake.prefix")
+
+    # Installed while the process (like the build server) keeps running
+    site.joinpath("skbuild_new").mkdir()
+    dist_info = site / "skbuild_new-1.0.dist-info"
+    dist_info.mkdir()
+    dist_info.joinpath("METADATA").write_text(
+        "Metadata-Version: 2.1\nName: skbuild_new\nVersion: 1.0\n"
+    )
+    dist_info.joinpath("entry_points.txt").write_text(
+        "[cmake.prefix]\nskbuild_new = skbuild_new\n"
+    )
+    mtime = site.stat().st_mtime_ns + 1_000_000_000
+    os.utime(site, ns=(mtime, mtime))
+
+    prefixes = builder._get_entry_point_search_path("cmake.prefix")
+    assert prefixes["skbuild_new"] == [site / "skbuild_new"]
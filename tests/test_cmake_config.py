@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import dataclasses
+import json
 import os
 import shutil
 import sysconfig
@@ -12,8 +14,13 @@ from packaging.specifiers import SpecifierSet
 from packaging.version import Version
 
 from scikit_build_core.builder.builder import Builder
+from scikit_build_core.builder.interpreter import Interpreter
 from scikit_build_core.cmake import CMake, CMaker
-from scikit_build_core.errors import CMakeNotFoundError
+from scikit_build_core.errors import (
+    CMakeConfigError,
+    CMakeNotFoundError,
+    FailedLiveProcessError,
+)
 from scikit_build_core.settings.skbuild_read_settings import SettingsReader
 
 if TYPE_CHECKING:
@@ -204,6 +211,37 @@ def test_cmake_paths(
     assert len(fp.calls) == 2
 
 
+@pytest.mark.configure
+def test_interpreter_unsets_cache(tmp_path: Path):
+    source_dir = DIR / "packages" / "cmake_defines"
+    binary_dir = tmp_path / "build"
+    reader = SettingsReader.from_file(source_dir / "pyproject.toml")
+
+    other = dataclasses.replace(
+        Interpreter.current(),
+        prefix=str(tmp_path / "other"),
+        numpy_include_dir=str(tmp_path / "numpy"),
+        library=str(tmp_path / "libpython.so"),
+    )
+    without = dataclasses.replace(other, numpy_include_dir=None, library=None)
+
+    for interpreter in (other, without):
+        config = CMaker(
+            CMake.default_search(),
+            source_dir=source_dir,
+            build_dir=binary_dir,
+            build_type="Release",
+        )
+        Builder(reader.settings, config).configure(defines={}, interpreter=interpreter)
+
+    # The values of the previous interpreter are not kept
+    cache = (binary_dir / "CMakeCache.txt").read_text(encoding="utf-8")
+    assert "PYTHON_LIBRARY:STRING=PYTHON_LIBRARY-NOTFOUND" in cache
+    assert "Python_NumPy_INCLUDE_DIR:STRING=Python_NumPy_INCLUDE_DIR-NOTFOUND" in cache
+    assert str(tmp_path / "numpy") not in cache
+    assert str(tmp_path / "libpython.so") not in cache
+
+
 @pytest.mark.configure
 def test_cmake_defines(
     tmp_path: Path,
@@ -249,3 +287,256 @@ def test_get_cmake_via_envvar(monkeypatch: pytest.MonkeyPatch, fp):
     result = CMake.default_search(env=os.environ)
     assert result.cmake_path == cmake_path
     assert result.version == Version("3.20.0")
+
+
+@pytest.mark.parametrize("fail", [False, True])
+def test_install_components(tmp_path: Path, fp, fail: bool):
+    config = CMaker(
+        CMake(version=Version("3.15.0"), cmake_path=Path("cmake")),
+        source_dir=DIR / "packages/simple_pure",
+        build_dir=tmp_path / "build",
+        build_type="Release",
+    )
+    prefix = tmp_path / "prefix"
+    for comp in ("One", "Two", "Three"):
+        fp.register(
+            [
+                "cmake",
+                "--install",
+                os.fspath(config.build_dir),
+                "--prefix",
+                os.fspath(prefix),
+                "--component",
+                comp,
+            ],
+            stdout=f"-- Installing: {comp}\n",
+            returncode=1 if fail and comp == "Two" else 0,
+        )
+
+    if fail:
+        with pytest.raises(FailedLiveProcessError):
+            config.install(prefix, components=["One", "Two", "Three"])
+    else:
+        config.install(prefix, components=["One", "Two", "Three"])
+
+    assert len(fp.calls) == 3
+
+
+@pytest.mark.skipif(sysconfig.get_platform().startswith("win"), reason="needs symlinks")
+def test_relocatable_stable_paths(tmp_path: Path):
+    source_dir = tmp_path / "src"
+    shutil.copytree(DIR / "packages/simple_pure", source_dir)
+    config = CMaker(
+        CMake(version=Version("3.15.0"), cmake_path=Path("cmake")),
+        source_dir=source_dir,
+        build_dir=tmp_path / "build",
+        build_type="Release",
+        relocatable=True,
+    )
+    stable = (tmp_path / "build/.skbuild-stable").resolve()
+
+    assert config.source_dir == stable / "source"
+    assert config.stable_path(source_dir / "CMakeLists.txt") == (
+        stable / "source/CMakeLists.txt"
+    )
+    assert config.stable_path(tmp_path / "build/x") == tmp_path / "build/x"
+    assert config.stable_path(tmp_path / "other") == tmp_path / "other"
+
+    info = json.loads(
+        (tmp_path / "build/.skbuild-info.json").read_text(encoding="utf-8")
+    )
+    assert info["source_dir"] == str(stable / "source")
+    assert info["skbuild_path"].startswith(str(stable))
+
+
+def _fake_ninja_build_dir(tmp_path: Path) -> tuple[Path, Path]:
+    cmake_path = tmp_path / "bin/cmake"
+    ninja_path = tmp_path / "bin/ninja"
+    cmake_path.parent.mkdir()
+    cmake_path.touch()
+    ninja_path.touch()
+    build_dir = tmp_path / "build"
+    build_dir.mkdir()
+    build_dir.joinpath("CMakeCache.txt").write_text(
+        dedent(
+            f"""\
+            # This is the CMakeCache file.
+            //Program used to build from build.ninja files.
+            CMAKE_MAKE_PROGRAM:FILEPATH={ninja_path}
+            CMAKE_VERBOSE_MAKEFILE:BOOL=FALSE
+            CMAKE_COMMAND:INTERNAL={cmake_path}
+            CMAKE_GENERATOR:INTERNAL=Ninja
+            """
+        ),
+        encoding="utf-8",
+    )
+    build_dir.joinpath("build.ninja").touch()
+    return cmake_path, ninja_path
+
+
+@pytest.mark.parametrize(
+    ("build_args", "expected"),
+    [
+        ([], ["{ninja}", "-j4"]),
+        (["-v", "-j2", "--", "-k", "0"], ["{ninja}", "-j2", "-v", "-k", "0"]),
+        (["--parallel"], ["{ninja}"]),
+        (["--clean-first"], None),
+    ],
+)
+def test_build_ninja_direct(
+    tmp_path: Path, fp, build_args: list[str], expected: list[str] | None
+):
+    cmake_path, ninja_path = _fake_ninja_build_dir(tmp_path)
+    config = CMaker(
+        CMake(version=Version("3.15.0"), cmake_path=cmake_path),
+        source_dir=DIR / "packages/simple_pure",
+        build_dir=tmp_path / "build",
+        build_type="Release",
+    )
+    config.env = {"CMAKE_BUILD_PARALLEL_LEVEL": "4"}
+
+    if expected is None:
+        fp.register(
+            [cmake_path, "--build", config.build_dir, "--target", "all", *build_args]
+        )
+    else:
+        fp.register([*(a.format(ninja=ninja_path) for a in expected), "all"])
+    config.build(build_args, targets=["all"])
+    assert len(fp.calls) == 1
+
+
+@pytest.mark.parametrize("reason", ["cache", "generator", "cmake"])
+def test_build_ninja_direct_fallback(tmp_path: Path, fp, reason: str):
+    cmake_path, _ = _fake_ninja_build_dir(tmp_path)
+    build_dir = tmp_path / "build"
+    cache = build_dir / "CMakeCache.txt"
+    if reason == "cache":
+        # Cache changed after the last generate, CMake needs to regenerate
+        mtime = build_dir.joinpath("build.ninja").stat().st_mtime_ns
+        os.utime(cache, ns=(mtime + 10**9, mtime + 10**9))
+    elif reason == "generator":
+        cache.write_text(
+            cache.read_text(encoding="utf-8").replace("=Ninja", "=Unix Makefiles"),
+            encoding="utf-8",
+        )
+        build_dir.joinpath("build.ninja").touch()
+    else:
+        cmake_path = tmp_path / "bin/other-cmake"
+        cmake_path.touch()
+
+    config = CMaker(
+        CMake(version=Version("3.15.0"), cmake_path=cmake_path),
+        source_dir=DIR / "packages/simple_pure",
+        build_dir=build_dir,
+        build_type="Release",
+    )
+    config.env = {}
+
+    fp.register([cmake_path, "--build", build_dir, "-v"])
+    config.build(verbose=True)
+    assert len(fp.calls) == 1
+
+
+@pytest.mark.configure
+def test_cmake_extra_build_types(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, fp):
+    fp.register(
+        [fp.program("cmake"), "-E", "capabilities"],
+        stdout='{"version":{"string":"3.17.0"}}',
+    )
+    fp.register(
+        [fp.program("cmake3"), "-E", "capabilities"],
+        stdout='{"version":{"string":"3.17.0"}}',
+    )
+    monkeypatch.setenv("CMAKE_GENERATOR", "Ninja Multi-Config")
+
+    config = CMaker(
+        CMake.default_search(),
+        source_dir=DIR / "packages/simple_pure",
+        build_dir=tmp_path / "build",
+        build_type="Release",
+        extra_build_types=["Debug"],
+    )
+    assert config.build_types == ["Release", "Debug"]
+
+    cmd = [
+        f"-S{config.source_dir}",
+        f"-B{config.build_dir}",
+        "-DCMAKE_CONFIGURATION_TYPES:STRING=Release;Debug",
+        "-DCMAKE_DEFAULT_BUILD_TYPE:STRING=Release",
+        "-DCMAKE_CROSS_CONFIGS:STRING=all",
+        "-DCMAKE_DEFAULT_CONFIGS:STRING=all",
+    ]
+    fp.register([fp.program("cmake"), *cmd])
+    fp.register([fp.program("cmake3"), *cmd])
+    config.configure()
+    assert not config.single_config
+
+    # One build for all the configurations, then an install for each
+    config.build_dir.joinpath("CMakeCache.txt").write_text(
+        "CMAKE_GENERATOR:INTERNAL=Ninja Multi-Config\n", encoding="utf-8"
+    )
+    fp.register([fp.program("cmake"), "--build", config.build_dir])
+    fp.register([fp.program("cmake3"), "--build", config.build_dir])
+    config.build()
+
+    prefix = tmp_path / "prefix"
+    install = ["--install", config.build_dir, "--prefix", str(prefix)]
+    fp.register([fp.program("cmake"), *install, "--config", "Debug"])
+    fp.register([fp.program("cmake3"), *install, "--config", "Debug"])
+    config.install(prefix, build_type="Debug")
+    assert len(fp.calls) == 4
+
+
+@pytest.mark.configure
+def test_cmake_extra_build_types_single_config(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, fp
+):
+    fp.register(
+        [fp.program("cmake"), "-E", "capabilities"],
+        stdout='{"version":{"string":"3.17.0"}}',
+    )
+    fp.register(
+        [fp.program("cmake3"), "-E", "capabilities"],
+        stdout='{"version":{"string":"3.17.0"}}',
+    )
+    monkeypatch.setenv("CMAKE_GENERATOR", "Ninja")
+
+    config = CMaker(
+        CMake.default_search(),
+        source_dir=DIR / "packages/simple_pure",
+        build_dir=tmp_path / "build",
+        build_type="Release",
+        extra_build_types=["Debug"],
+    )
+    with pytest.raises(CMakeConfigError, match="multi-config generator, not Ninja"):
+        config.configure()
+
+
+@pytest.mark.configure
+def test_cmake_generator_mismatch(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, fp):
+    fp.register(
+        [fp.program("cmake"), "-E", "capabilities"],
+        stdout='{"version":{"string":"3.17.0"}}',
+    )
+    fp.register(
+        [fp.program("cmake3"), "-E", "capabilities"],
+        stdout='{"version":{"string":"3.17.0"}}',
+    )
+    monkeypatch.setenv("CMAKE_GENERATOR", "Ninja Multi-Config")
+    build_dir = tmp_path / "build"
+    build_dir.mkdir()
+    build_dir.joinpath("CMakeCache.txt").write_text(
+        "CMAKE_GENERATOR:INTERNAL=Ninja\n", encoding="utf-8"
+    )
+
+    config = CMaker(
+        CMake.default_search(),
+        source_dir=DIR / "packages/simple_pure",
+        build_dir=build_dir,
+        build_type="Release",
+        extra_build_types=["Debug"],
+    )
+    with pytest.raises(
+        CMakeConfigError, match="configured with the Ninja generator, not Ninja Multi"
+    ):
+        config.configure()
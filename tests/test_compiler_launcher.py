@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import json
+import typing
+import unittest.mock
+from pathlib import Path
+
+import pytest
+
+import scikit_build_core.builder.compiler_launcher
+from scikit_build_core.builder.builder import Builder
+from scikit_build_core.builder.compiler_launcher import (
+    CompilerLauncher,
+    get_compiler_launcher,
+)
+from scikit_build_core.cmake import CMaker
+from scikit_build_core.settings.skbuild_model import (
+    BuildSettings,
+    ScikitBuildSettings,
+)
+
+
+@pytest.fixture
+def which(monkeypatch: pytest.MonkeyPatch) -> None:
+    programs = {"sccache": "/opt/bin/sccache", "mylauncher": "/opt/bin/mylauncher"}
+    monkeypatch.setattr(
+        scikit_build_core.builder.compiler_launcher.shutil, "which", programs.get
+    )
+
+
+@pytest.mark.usefixtures("which")
+def test_get_compiler_launcher() -> None:
+    assert get_compiler_launcher("") is None
+    assert get_compiler_launcher("ccache") is None
+    assert get_compiler_launcher("auto") == CompilerLauncher(Path("/opt/bin/sccache"))
+    launcher = get_compiler_launcher("mylauncher")
+    assert launcher == CompilerLauncher(Path("/opt/bin/mylauncher"))
+    assert launcher.name == "mylauncher"
+
+
+def test_defines() -> None:
+    launcher = CompilerLauncher(Path("ccache"))
+    assert launcher.defines() == {
+        "CMAKE_C_COMPILER_LAUNCHER": "ccache",
+        "CMAKE_CXX_COMPILER_LAUNCHER": "ccache",
+        "CMAKE_CUDA_COMPILER_LAUNCHER": "ccache",
+        "CMAKE_Fortran_COMPILER_LAUNCHER": "ccache",
+    }
+
+
+def test_setup_env_ccache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("sys.platform", "linux")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    env: dict[str, str] = {}
+    CompilerLauncher(Path("ccache")).setup_env(
+        env,
+        name="my_proj",
+        source_dir=tmp_path / "src",
+        build_dir=tmp_path / "build",
+    )
+    assert env == {
+        "CCACHE_DIR": str(tmp_path / "cache/scikit-build-core/ccache/my_proj"),
+        "CCACHE_BASEDIR": str(tmp_path.resolve()),
+        "CCACHE_NOHASHDIR": "1",
+    }
+
+    env = {"CCACHE_DIR": "/mine", "CCACHE_HASHDIR": "1"}
+    CompilerLauncher(Path("ccache")).setup_env(
+        env,
+        name="my_proj",
+        source_dir=tmp_path / "src",
+        build_dir=tmp_path / "build",
+    )
+    assert env["CCACHE_DIR"] == "/mine"
+    assert "CCACHE_NOHASHDIR" not in env
+
+
+def test_setup_env_ccache_root(tmp_path: Path) -> None:
+    env: dict[str, str] = {}
+    CompilerLauncher(Path("ccache")).setup_env(
+        env,
+        name="my_proj",
+        source_dir=tmp_path / "src",
+        build_dir=Path(tmp_path.anchor) / "other-build",
+    )
+    # Only the root is shared, so absolute paths are kept
+    assert "CCACHE_BASEDIR" not in env
+    assert "CCACHE_DIR" in env
+
+
+def test_stats_ccache(fp) -> None:
+    fp.register(
+        ["ccache", "--print-stats"],
+        stdout="stats_updated_timestamp\t0\ndirect_cache_hit\t3\n"
+        "preprocessed_cache_hit\t1\ncache_miss\t2\n",
+    )
+    assert CompilerLauncher(Path("ccache")).get_stats({}) == (4, 2)
+
+
+def test_stats_sccache(fp) -> None:
+    stats = {
+        "stats": {
+            "cache_hits": {"counts": {"C/C++": 5, "CUDA": 1}},
+            "cache_misses": {"counts": {"C/C++": 2}},
+        }
+    }
+    fp.register(
+        ["sccache", "--show-stats", "--stats-format=json"], stdout=json.dumps(stats)
+    )
+    assert CompilerLauncher(Path("sccache")).get_stats({}) == (6, 2)
+
+
+def test_stats_failure(fp) -> None:
+    fp.register(["ccache", "--print-stats"], returncode=1)
+    assert CompilerLauncher(Path("ccache")).get_stats({}) is None
+
+
+def test_builder_prints_stats(
+    fp, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monkeypatch.delenv("MAKEFLAGS", raising=False)
+    lookups = []
+
+    def get_launcher(setting: str) -> CompilerLauncher:
+        lookups.append(setting)
+        return CompilerLauncher(Path("ccache"))
+
+    monkeypatch.setattr(
+        "scikit_build_core.builder.builder.get_compiler_launcher", get_launcher
+    )
+    fp.register(["ccache", "--print-stats"], stdout="direct_cache_hit\t1\n")
+    fp.register(
+        ["ccache", "--print-stats"], stdout="direct_cache_hit\t4\ncache_miss\t1\n"
+    )
+
+    config = unittest.mock.create_autospec(CMaker)
+    config.env = {}
+    settings = ScikitBuildSettings(build=BuildSettings(compiler_launcher="ccache"))
+    builder = Builder(settings=settings, config=typing.cast(CMaker, config))
+    assert builder.compiler_launcher == CompilerLauncher(Path("ccache"))
+    builder.build([])
+
+    assert "Compiler cache (ccache): 3 hits, 1 misses" in capsys.readouterr().out
+    assert lookups == ["ccache"]
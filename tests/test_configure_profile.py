@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+from packaging.version import Version
+
+from scikit_build_core.build import build_wheel
+from scikit_build_core.builder.configure_profile import PROFILE_FILE, read_profile
+from scikit_build_core.cmake import CMake
+
+DIR = Path(__file__).parent.resolve()
+SIMPLEST = DIR / "packages/simplest_c"
+
+
+def begin(ts: int, name: str, location: str, args: str = "") -> dict[str, object]:
+    return {
+        "ph": "B",
+        "ts": ts,
+        "name": name,
+        "args": {"functionArgs": args, "location": location},
+    }
+
+
+def end(ts: int) -> dict[str, object]:
+    return {"ph": "E", "ts": ts}
+
+
+def test_read_profile(tmp_path: Path):
+    source = tmp_path / "src"
+    source.mkdir()
+    lists = f"{source}/CMakeLists.txt"
+    module = "/cmake/Modules/FindThing.cmake"
+    events = [
+        begin(0, "project", f"{lists}:2", "example"),
+        end(20_000),
+        begin(20_000, "find_package", f"{lists}:3", "Thing"),
+        begin(21_000, "execute_process", f"{module}:10", "COMMAND ${THING}"),
+        end(71_000),
+        begin(71_000, "set", f"{module}:11"),
+        end(71_500),
+        end(80_000),
+        {
+            "ph": "X",
+            "ts": 80_000,
+            "dur": 15_000,
+            "name": "try_compile",
+            "args": {"location": f"{module}:12"},
+        },
+    ]
+    trace = tmp_path / "trace.json"
+    trace.write_text(json.dumps(events), encoding="utf-8")
+
+    profile = read_profile(trace)
+    assert profile is not None
+    assert len(profile.commands) == 5
+    assert profile.total_us == 95_000
+
+    commands = profile.slowest_commands(source)
+    assert [c.name for c in commands] == ["find_package", "project"]
+    assert commands[0].duration_us == 60_000
+    assert commands[0].self_us == 9_500
+    assert commands[0].location == f"{lists}:3"
+
+    assert profile.slowest_files() == [(module, 65_500), (lists, 29_500)]
+
+    data = profile.to_dict(source)
+    assert data["commands"][0] == {
+        "command": "find_package(Thing)",
+        "location": f"{lists}:3",
+        "ms": 60,
+    }
+
+
+def test_read_profile_missing(tmp_path: Path):
+    assert read_profile(tmp_path / "missing.json") is None
+    tmp_path.joinpath("broken.json").write_text("{", encoding="utf-8")
+    assert read_profile(tmp_path / "broken.json") is None
+
+
+@pytest.mark.compile
+@pytest.mark.configure
+def test_configure_profile(tmp_path, monkeypatch, capfd):
+    if CMake.default_search().version < Version("3.18"):
+        pytest.skip("Profiling requires CMake 3.18+")
+
+    build_dir = tmp_path / "build"
+    shutil.copytree(SIMPLEST, tmp_path / "src", ignore=shutil.ignore_patterns("dist"))
+    monkeypatch.chdir(tmp_path / "src")
+
+    build_wheel(
+        str(tmp_path / "dist"),
+        config_settings={"build-dir": str(build_dir), "cmake.profile": "true"},
+    )
+    out = capfd.readouterr().out
+    assert "Configure profile:" in out
+    assert "CMakeLists.txt:8  find_package(Python" in out
+    assert build_dir.joinpath(PROFILE_FILE).is_file()
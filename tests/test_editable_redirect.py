@@ -68,3 +68,33 @@ def test_editable_redirect():
         }
     )
     assert finder.pkgs == ["pkg", "pkg.subpkg"]
+
+
+def test_editable_rebuild_command(tmp_path: Path):
+    ninja = tmp_path / "ninja"
+    ninja.touch()
+    cache = tmp_path / "CMakeCache.txt"
+    cache.write_text(
+        f"CMAKE_MAKE_PROGRAM:FILEPATH={ninja}\nCMAKE_GENERATOR:INTERNAL=Ninja\n",
+        encoding="utf-8",
+    )
+    tmp_path.joinpath("build.ninja").touch()
+
+    finder = ScikitBuildRedirectingFinder(
+        known_source_files={},
+        known_wheel_files={},
+        path=str(tmp_path),
+        rebuild=True,
+        verbose=False,
+        build_options=["-v"],
+        install_options=[],
+        dir=str(Path("/sitepackages")),
+        install_dir="",
+    )
+
+    env = {"CMAKE_BUILD_PARALLEL_LEVEL": "3"}
+    assert finder._build_command(env) == [str(ninja), "-j3", "-v"]
+
+    # Needs regenerating, so let CMake handle it
+    tmp_path.joinpath("build.ninja").unlink()
+    assert finder._build_command(env) == ["cmake", "--build", ".", "-v"]
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import shutil
+import zipfile
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+import scikit_build_core.hooks
+from scikit_build_core.build import build_wheel
+
+if TYPE_CHECKING:
+    from scikit_build_core.hooks import HookEvent
+
+DIR = Path(__file__).parent.resolve()
+SHARED_CORE = DIR / "packages/shared_core"
+
+
+def _module(wheel: Path) -> bytes:
+    with zipfile.ZipFile(wheel) as zf:
+        (name,) = (n for n in zf.namelist() if n.startswith("shared_core/_module"))
+        return zf.read(name)
+
+
+@pytest.mark.compile
+@pytest.mark.configure
+def test_extra_build_types(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capfd: pytest.CaptureFixture[str],
+    caplog: pytest.LogCaptureFixture,
+):
+    monkeypatch.delenv("CMAKE_GENERATOR", raising=False)
+    events: list[HookEvent] = []
+    monkeypatch.setattr(
+        scikit_build_core.hooks, "_load_hooks", lambda: (events.append,)
+    )
+    project = tmp_path / "project"
+    shutil.copytree(SHARED_CORE, project)
+    monkeypatch.chdir(project)
+
+    dist = tmp_path / "dist"
+    wheel = build_wheel(
+        str(dist),
+        {"cmake.extra-build-types": ["Debug", "Release"], "build-dir": "build"},
+    )
+    out = capfd.readouterr().out
+
+    # A Debug wheel next to the Release one, from a single configure
+    assert sorted(p.relative_to(dist).as_posix() for p in dist.rglob("*.whl")) == [
+        f"debug/{wheel}",
+        wheel,
+    ]
+    assert out.count("Configuring CMake") == 1
+    assert out.count("Installing the Debug configuration") == 1
+    assert _module(dist / wheel) != _module(dist / "debug" / wheel)
+    assert (project / "build/Debug").is_dir()
+    assert (project / "build/Release").is_dir()
+
+    # The Debug configuration is installed with the install hooks too
+    installs = [(e.when, len(e.files)) for e in events if e.phase == "install"]
+    assert installs[0] == installs[2] == ("before", 0)
+    assert installs[1][0] == installs[3][0] == "after"
+    assert installs[1][1] == installs[3][1] > 0
+
+    # The wheel directory is temporary, like pip's
+    assert "only keeps the Release wheel" in caplog.text
+
+
+@pytest.mark.compile
+@pytest.mark.configure
+def test_extra_build_types_generate(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.delenv("CMAKE_GENERATOR", raising=False)
+    project = tmp_path / "project"
+    shutil.copytree(SHARED_CORE, project)
+    monkeypatch.chdir(project)
+    with Path("pyproject.toml").open("a", encoding="utf-8") as f:
+        f.write(
+            "\n[[tool.scikit-build.generate]]\n"
+            'path = "shared_core/_version.py"\n'
+            "template = \"version = '${version}'\\n\"\n"
+            'location = "install"\n'
+        )
+
+    dist = tmp_path / "dist"
+    wheel = build_wheel(str(dist), {"cmake.extra-build-types": ["Debug", "Release"]})
+
+    # Both wheels get the generated files
+    for path in (dist / wheel, dist / "debug" / wheel):
+        with zipfile.ZipFile(path) as zf:
+            assert zf.read("shared_core/_version.py") == b"version = '0.0.1'\n"
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import hashlib
+import tarfile
+import zipfile
+from textwrap import dedent
+from typing import TYPE_CHECKING
+
+import pytest
+from packaging.version import Version
+
+from scikit_build_core.build import build_wheel
+from scikit_build_core.cmake import CMake
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def make_dep_archive(tmp_path: Path, value: str) -> tuple[Path, str]:
+    dep = tmp_path / f"dep-{value}"
+    dep.mkdir()
+    dep.joinpath("CMakeLists.txt").write_text(
+        "cmake_minimum_required(VERSION 3.15)\nproject(dep LANGUAGES NONE)\n",
+        encoding="utf-8",
+    )
+    dep.joinpath("value.txt").write_text(value, encoding="utf-8")
+    archive = tmp_path / f"dep-{value}.tar.gz"
+    with tarfile.open(archive, "w:gz") as tf:
+        tf.add(dep, arcname="dep")
+    return archive, hashlib.sha256(archive.read_bytes()).hexdigest()
+
+
+@pytest.fixture
+def fetchcontent_project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    cmake = CMake.default_search()
+    if cmake.version < Version("3.24"):
+        pytest.skip("Dependency providers require CMake 3.24+")
+
+    monkeypatch.setattr(
+        "scikit_build_core.builder.builder.user_cache_dir", lambda: tmp_path / "cache"
+    )
+    project = tmp_path / "project"
+    project.mkdir()
+    project.joinpath("pyproject.toml").write_text(
+        dedent(
+            """\
+            [build-system]
+            requires = ["scikit-build-core"]
+            build-backend = "scikit_build_core.build"
+
+            [project]
+            name = "fetchcontent_example"
+            version = "0.1.0"
+
+            [tool.scikit-build]
+            wheel.packages = []
+            search.fetchcontent-cache = true
+            """
+        ),
+        encoding="utf-8",
+    )
+    project.joinpath("CMakeLists.txt").write_text(
+        dedent(
+            """\
+            cmake_minimum_required(VERSION 3.15)
+            project(${SKBUILD_PROJECT_NAME} LANGUAGES NONE)
+            include(FetchContent)
+            FetchContent_Declare(dep URL "${DEP_URL}" URL_HASH "SHA256=${DEP_HASH}")
+            FetchContent_MakeAvailable(dep)
+            install(FILES "${dep_SOURCE_DIR}/value.txt" DESTINATION .)
+            """
+        ),
+        encoding="utf-8",
+    )
+    monkeypatch.chdir(project)
+    return tmp_path
+
+
+def wheel_value(wheel_dir: Path) -> str:
+    (wheel,) = wheel_dir.glob("*.whl")
+    with zipfile.ZipFile(wheel) as zf:
+        return zf.read("value.txt").decode("utf-8")
+
+
+@pytest.mark.configure
+def test_fetchcontent_cache(fetchcontent_project: Path):
+    tmp_path = fetchcontent_project
+    archive, sha = make_dep_archive(tmp_path, "one")
+    config = {"cmake.define.DEP_URL": archive.as_posix(), "cmake.define.DEP_HASH": sha}
+
+    build_wheel(str(tmp_path / "dist1"), config_settings=config)
+    assert wheel_value(tmp_path / "dist1") == "one"
+    (entry,) = (
+        p
+        for p in (tmp_path / "cache/scikit-build-core/fetchcontent").iterdir()
+        if p.is_dir()
+    )
+    assert entry.joinpath("src/value.txt").read_text(encoding="utf-8") == "one"
+
+    # The cached sources are used, even if the archive is gone
+    archive.unlink()
+    build_wheel(
+        str(tmp_path / "dist2"),
+        config_settings={**config, "search.fetchcontent-disconnected": "true"},
+    )
+    assert wheel_value(tmp_path / "dist2") == "one"
+
+    # Changed details are populated again
+    archive, sha = make_dep_archive(tmp_path, "two")
+    config = {"cmake.define.DEP_URL": archive.as_posix(), "cmake.define.DEP_HASH": sha}
+    build_wheel(str(tmp_path / "dist3"), config_settings=config)
+    assert wheel_value(tmp_path / "dist3") == "two"
+
+
+@pytest.mark.configure
+def test_fetchcontent_disconnected_missing(fetchcontent_project: Path):
+    tmp_path = fetchcontent_project
+    archive, sha = make_dep_archive(tmp_path, "one")
+    config = {
+        "cmake.define.DEP_URL": archive.as_posix(),
+        "cmake.define.DEP_HASH": sha,
+        "search.fetchcontent-disconnected": "true",
+    }
+
+    with pytest.raises(SystemExit):
+        build_wheel(str(tmp_path / "dist"), config_settings=config)
+
+
+@pytest.mark.configure
+def test_fetchcontent_user_disconnected(fetchcontent_project: Path):
+    tmp_path = fetchcontent_project
+    archive, sha = make_dep_archive(tmp_path, "one")
+    config = {
+        "cmake.define.DEP_URL": archive.as_posix(),
+        "cmake.define.DEP_HASH": sha,
+        "build-dir": str(tmp_path / "build"),
+    }
+    build_wheel(
+        str(tmp_path / "dist1"),
+        config_settings={
+            **config,
+            "cmake.define.FETCHCONTENT_FULLY_DISCONNECTED": "ON",
+        },
+    )
+
+    # The user's own setting in the build directory is kept
+    build_wheel(str(tmp_path / "dist2"), config_settings=config)
+    cache = tmp_path.joinpath("build/CMakeCache.txt").read_text(encoding="utf-8")
+    assert "FETCHCONTENT_FULLY_DISCONNECTED:BOOL=ON" in cache
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+import scikit_build_core.hooks
+from scikit_build_core.build import build_sdist, build_wheel
+from scikit_build_core.hooks import BuildHooks, HookEvent
+
+DIR = Path(__file__).parent.resolve()
+SIMPLEST = DIR / "packages/simplest_c"
+
+
+@pytest.fixture
+def events(monkeypatch: pytest.MonkeyPatch) -> list[HookEvent]:
+    recorded: list[HookEvent] = []
+    monkeypatch.setattr(
+        scikit_build_core.hooks, "_load_hooks", lambda: (recorded.append,)
+    )
+    return recorded
+
+
+def test_load_hooks_from_entry_points(tmp_path, monkeypatch):
+    site = tmp_path / "site"
+    site.mkdir()
+    site.joinpath("skbuild_test_hooks.py").write_text(
+        "def hook(event):\n    pass\n", encoding="utf-8"
+    )
+    dist_info = site / "skbuild_test_hooks-1.0.dist-info"
+    dist_info.mkdir()
+    dist_info.joinpath("METADATA").write_text(
+        "Metadata-Version: 2.1\nName: skbuild_test_hooks\nVersion: 1.0\n",
+        encoding="utf-8",
+    )
+    dist_info.joinpath("entry_points.txt").write_text(
+        "[scikit_build.hooks]\ntest = skbuild_test_hooks:hook\n", encoding="utf-8"
+    )
+    monkeypatch.syspath_prepend(str(site))
+    scikit_build_core.hooks._load_hooks.cache_clear()
+    try:
+        hooks = BuildHooks.load("wheel")
+    finally:
+        scikit_build_core.hooks._load_hooks.cache_clear()
+
+    assert [hook.__module__ for hook in hooks.hooks] == ["skbuild_test_hooks"]
+
+
+def test_phase_without_hooks():
+    def files() -> list[Path]:
+        raise AssertionError
+
+    hooks = BuildHooks([], "wheel")
+    assert not hooks
+    with hooks.phase("install", files=files):
+        pass
+    assert hooks.timings == {}
+
+
+def test_phase_events(tmp_path):
+    events: list[HookEvent] = []
+    hooks = BuildHooks([events.append], "wheel", build_dir=tmp_path)
+
+    with hooks.phase("build"):
+        pass
+    with hooks.phase("install", files=lambda: [tmp_path / "file"]):
+        pass
+
+    assert [(e.phase, e.when) for e in events] == [
+        ("build", "before"),
+        ("build", "after"),
+        ("install", "before"),
+        ("install", "after"),
+    ]
+    assert events[1].files == ()
+    assert events[3].files == (tmp_path / "file",)
+    assert events[2].timings.keys() == {"build"}
+    assert events[3].timings.keys() == {"build", "install"}
+    assert all(e.build_dir == tmp_path for e in events)
+
+
+def test_phase_failed(tmp_path):
+    events: list[HookEvent] = []
+    hooks = BuildHooks([events.append], "wheel", build_dir=tmp_path)
+
+    def files() -> list[Path]:
+        raise AssertionError
+
+    with pytest.raises(RuntimeError), hooks.phase("build", files=files):
+        raise RuntimeError
+
+    assert [(e.phase, e.when, e.failed) for e in events] == [
+        ("build", "before", False),
+        ("build", "after", True),
+    ]
+    assert events[1].files == ()
+    assert events[1].timings.keys() == {"build"}
+
+
+def test_sdist_hooks(tmp_path, monkeypatch, events):
+    dist = tmp_path / "dist"
+    monkeypatch.chdir(SIMPLEST)
+
+    out = build_sdist(str(dist))
+
+    assert [(e.phase, e.when) for e in events] == [
+        ("settings", "before"),
+        ("settings", "after"),
+        ("package", "before"),
+        ("package", "after"),
+    ]
+    assert events[0].settings is None
+    assert events[1].settings is not None
+    assert events[-1].files == (dist / out,)
+    assert all(e.state == "sdist" for e in events)
+
+
+@pytest.mark.compile
+@pytest.mark.configure
+@pytest.mark.parametrize("component", [[], ["PythonModule", "Generated"]])
+def test_wheel_hooks(tmp_path, monkeypatch, events, component):
+    dist = tmp_path / "dist"
+    monkeypatch.chdir(SIMPLEST)
+    if Path("dist").is_dir():
+        shutil.rmtree("dist")
+
+    out = build_wheel(str(dist), config_settings={"install.components": component})
+
+    phases = ["settings", "configure", "build", "install", "package"]
+    assert [(e.phase, e.when) for e in events] == [
+        (phase, when) for phase in phases for when in ("before", "after")
+    ]
+    assert events[-1].timings.keys() == set(phases)
+    assert events[-1].files == (dist / out,)
+    assert events[2].build_dir is not None
+
+    installed = {f.name for f in events[7].files}
+    assert "generated.txt" in installed
+    assert any(name.startswith("_module") for name in installed)
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import os
+import sys
+import typing
+import unittest.mock
+from pathlib import Path
+
+import pytest
+
+from scikit_build_core.builder.builder import Builder
+from scikit_build_core.builder.jobserver import Jobserver, read_build_tool
+from scikit_build_core.cmake import CMaker
+from scikit_build_core.settings.skbuild_model import (
+    BuildSettings,
+    ScikitBuildSettings,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.platform.startswith("win"), reason="POSIX jobserver only"
+)
+
+
+@pytest.fixture
+def pipe() -> typing.Generator[tuple[int, int], None, None]:
+    read_fd, write_fd = os.pipe()
+    yield read_fd, write_fd
+    os.close(read_fd)
+    os.close(write_fd)
+
+
+def test_no_jobserver() -> None:
+    assert Jobserver.from_env({}) is None
+    assert Jobserver.from_env({"MAKEFLAGS": "-j4"}) is None
+    assert Jobserver.from_env({"MAKEFLAGS": "--jobserver-auth=weird"}) is None
+
+
+def test_jobserver_fds(pipe: tuple[int, int]) -> None:
+    read_fd, write_fd = pipe
+    jobserver = Jobserver.from_env(
+        {"MAKEFLAGS": f" -j4 --jobserver-auth={read_fd},{write_fd}"}
+    )
+    assert jobserver == Jobserver(fds=(read_fd, write_fd))
+    assert jobserver.pass_fds == (read_fd, write_fd)
+    assert jobserver.supports("Unix Makefiles", None)
+    assert not jobserver.supports("Ninja", Path("ninja"))
+
+    legacy = Jobserver.from_env({"MAKEFLAGS": f"--jobserver-fds={read_fd},{write_fd}"})
+    assert legacy == jobserver
+
+
+def test_jobserver_fds_closed() -> None:
+    read_fd, write_fd = os.pipe()
+    os.close(read_fd)
+    os.close(write_fd)
+    assert (
+        Jobserver.from_env({"MAKEFLAGS": f"--jobserver-auth={read_fd},{write_fd}"})
+        is None
+    )
+
+
+@pytest.mark.parametrize(("jobs", "granted"), [(1, 1), (2, 2), (8, 4)])
+def test_acquire_fds(pipe: tuple[int, int], jobs: int, granted: int) -> None:
+    read_fd, write_fd = pipe
+    os.write(write_fd, b"+++")
+    jobserver = Jobserver(fds=pipe)
+
+    with jobserver.acquire(jobs) as result:
+        assert result == granted
+
+    assert os.read(read_fd, 10) == b"+++"
+
+
+@pytest.mark.parametrize("reopen", [True, False], ids=["reopen", "shared"])
+def test_acquire_fds_empty(
+    pipe: tuple[int, int], monkeypatch: pytest.MonkeyPatch, reopen: bool
+) -> None:
+    read_fd, _ = pipe
+    if not reopen:
+        real_open = os.open
+
+        def no_proc(path: str, *args: int) -> int:
+            if str(path).startswith("/proc/"):
+                raise OSError(path)
+            return real_open(path, *args)
+
+        monkeypatch.setattr(os, "open", no_proc)
+
+    # No free tokens: must not wait for one, and must leave the shared pipe
+    # blocking for the other clients
+    jobserver = Jobserver(fds=pipe)
+    with jobserver.acquire(4) as result:
+        assert result == 1
+    assert os.get_blocking(read_fd)
+
+
+def test_acquire_fifo(tmp_path: Path) -> None:
+    fifo = tmp_path / "jobserver"
+    os.mkfifo(fifo)
+    jobserver = Jobserver.from_env({"MAKEFLAGS": f"-j3 --jobserver-auth=fifo:{fifo}"})
+    assert jobserver == Jobserver(fifo=fifo)
+    assert jobserver.pass_fds == ()
+
+    # Keep the fifo open like make does, with two free tokens
+    holder = os.open(fifo, os.O_RDWR | os.O_NONBLOCK)
+    try:
+        os.write(holder, b"ab")
+        with jobserver.acquire(8) as result:
+            assert result == 3
+        assert sorted(os.read(holder, 10)) == sorted(b"ab")
+    finally:
+        os.close(holder)
+
+
+@pytest.mark.parametrize(("version", "supported"), [("4.3", False), ("4.4.1", True)])
+def test_jobserver_fifo_make(tmp_path: Path, version: str, supported: bool) -> None:
+    make = tmp_path / "make"
+    make.write_text(f"#!/bin/sh\necho 'GNU Make {version}'\n", encoding="utf-8")
+    make.chmod(0o755)
+    jobserver = Jobserver(fifo=tmp_path / "jobserver")
+
+    # Older make fails on the fifo style, so the build gets its own -j
+    assert jobserver.supports("Unix Makefiles", make) == supported
+    assert not jobserver.supports("Unix Makefiles", None)
+    assert not jobserver.supports("Unix Makefiles", tmp_path / "missing")
+
+
+def test_read_build_tool(tmp_path: Path) -> None:
+    assert read_build_tool(tmp_path) == ("", None)
+
+    tmp_path.joinpath("CMakeCache.txt").write_text(
+        "CMAKE_MAKE_PROGRAM:FILEPATH=/usr/bin/ninja\nCMAKE_GENERATOR:INTERNAL=Ninja\n",
+        encoding="utf-8",
+    )
+    assert read_build_tool(tmp_path) == ("Ninja", Path("/usr/bin/ninja"))
+
+
+def test_builder_jobserver_broker(
+    tmp_path: Path, pipe: tuple[int, int], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    read_fd, write_fd = pipe
+    os.write(write_fd, b"++")
+    monkeypatch.setenv("MAKEFLAGS", f"--jobserver-auth={read_fd},{write_fd}")
+    tmp_path.joinpath("CMakeCache.txt").write_text(
+        "CMAKE_GENERATOR:INTERNAL=Xcode\n", encoding="utf-8"
+    )
+
+    levels = []
+    config = unittest.mock.create_autospec(CMaker)
+    config.env = {}
+    config.build_dir = tmp_path
+    config.build.side_effect = lambda **_: levels.append(
+        config.env["CMAKE_BUILD_PARALLEL_LEVEL"]
+    )
+    settings = ScikitBuildSettings(build=BuildSettings(parallel="2"))
+    builder = Builder(settings=settings, config=typing.cast(CMaker, config))
+
+    builder.build([])
+    assert levels == ["2"]
+    assert config.build.call_args.kwargs["pass_fds"] == ()
+    assert "CMAKE_BUILD_PARALLEL_LEVEL" not in config.env
+    assert os.read(read_fd, 10) == b"++"
+
+
+def test_builder_jobserver_native(
+    tmp_path: Path, pipe: tuple[int, int], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("MAKEFLAGS", "--jobserver-auth={},{}".format(*pipe))
+    tmp_path.joinpath("CMakeCache.txt").write_text(
+        "CMAKE_GENERATOR:INTERNAL=Unix Makefiles\n", encoding="utf-8"
+    )
+
+    config = unittest.mock.create_autospec(CMaker)
+    config.env = {}
+    config.build_dir = tmp_path
+    settings = ScikitBuildSettings(build=BuildSettings(parallel="auto"))
+    builder = Builder(settings=settings, config=typing.cast(CMaker, config))
+
+    builder.build([])
+    assert config.build.call_args.kwargs["pass_fds"] == pipe
+    assert "CMAKE_BUILD_PARALLEL_LEVEL" not in config.env
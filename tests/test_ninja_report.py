@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from scikit_build_core.build import build_wheel
+from scikit_build_core.build.__main__ import main
+from scikit_build_core.builder.ninja_report import (
+    HISTORY_FILE,
+    analyze,
+    ninja_log_offset,
+    read_ninja_log,
+)
+
+DIR = Path(__file__).parent.resolve()
+SIMPLEST = DIR / "packages/simplest_c"
+
+LOG = """\
+# ninja log v5
+0\t1000\t0\ta.o\t1
+1000\t2000\t0\tc.o\t3
+0\t3000\t0\tb.o\t2
+3000\t4000\t0\tlib.so\t4
+3000\t4000\t0\tlib.so.1\t4
+"""
+
+
+def write_log(build_dir: Path, text: str, *, append: bool = False) -> None:
+    with build_dir.joinpath(".ninja_log").open("a" if append else "w") as f:
+        f.write(text)
+
+
+def test_read_ninja_log(tmp_path: Path) -> None:
+    write_log(tmp_path, LOG)
+    edges = read_ninja_log(tmp_path)
+    assert [e.output for e in edges] == ["a.o", "c.o", "b.o", "lib.so"]
+    assert [e.duration for e in edges] == [1000, 1000, 3000, 1000]
+
+
+def test_read_ninja_log_last_run(tmp_path: Path) -> None:
+    write_log(tmp_path, LOG)
+    offset = ninja_log_offset(tmp_path)
+    write_log(tmp_path, "0\t500\t0\tc.o\t3\n500\t900\t0\tlib.so\t4\n", append=True)
+
+    assert [e.output for e in read_ninja_log(tmp_path, offset)] == ["c.o", "lib.so"]
+    # Without an offset, only the last run is used
+    assert [e.output for e in read_ninja_log(tmp_path)] == ["c.o", "lib.so"]
+    # Offsets past the end (recompacted log) also fall back to the last run
+    assert len(read_ninja_log(tmp_path, 10**6)) == 2
+
+
+def test_analyze(tmp_path: Path) -> None:
+    write_log(tmp_path, LOG)
+    report = analyze(tmp_path, top=2)
+    assert report is not None
+    data = report.to_dict()
+    assert data["edges"] == 4
+    assert data["wall_ms"] == 4000
+    assert data["total_ms"] == 6000
+    assert data["parallelism"] == 1.5
+    assert data["critical_path"] == ["b.o", "lib.so"]
+    assert data["critical_path_ms"] == 4000
+    assert data["slowest"] == [
+        {"output": "b.o", "ms": 3000},
+        {"output": "a.o", "ms": 1000},
+    ]
+    assert data["regressions"] == []
+
+    (entry,) = json.loads(tmp_path.joinpath(HISTORY_FILE).read_text())
+    assert entry["wall_ms"] == 4000
+    assert entry["edges"]["b.o"] == 3000
+
+
+def test_analyze_regression(tmp_path: Path) -> None:
+    write_log(tmp_path, LOG)
+    analyze(tmp_path)
+    offset = ninja_log_offset(tmp_path)
+    write_log(tmp_path, "0\t7000\t0\tb.o\t2\n7000\t7100\t0\tlib.so\t4\n", append=True)
+
+    report = analyze(tmp_path, offset)
+    assert report is not None
+    assert report.regressions == [
+        {"output": "<total>", "ms": 7100, "previous_ms": 4000},
+        {"output": "b.o", "ms": 7000, "previous_ms": 3000},
+    ]
+    assert len(json.loads(tmp_path.joinpath(HISTORY_FILE).read_text())) == 2
+
+
+def test_analyze_no_log(tmp_path: Path) -> None:
+    assert analyze(tmp_path) is None
+
+
+def test_print_braces(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    write_log(tmp_path, LOG.replace("a.o", "{a}.o").replace("b.o", "b}.o"))
+    analyze(tmp_path)
+    offset = ninja_log_offset(tmp_path)
+    write_log(tmp_path, "0\t7000\t0\tb}.o\t2\n7000\t8000\t0\t{a}.o\t1\n", append=True)
+
+    report = analyze(tmp_path, offset)
+    assert report is not None
+    report.print()
+    out = capsys.readouterr().out
+    assert "{a}.o" in out
+    assert "b}.o 3.00s -> 7.00s" in out
+
+
+def test_ninja_report_main(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    write_log(tmp_path, LOG)
+    main(["ninja-report", str(tmp_path), "--top", "1", "--json"])
+    data = json.loads(capsys.readouterr().out)
+    assert data["slowest"] == [{"output": "b.o", "ms": 3000}]
+    # The history is only updated by builds
+    assert not tmp_path.joinpath(HISTORY_FILE).exists()
+
+    main(["ninja-report", str(tmp_path)])
+    assert "b.o" in capsys.readouterr().out
+
+    with pytest.raises(SystemExit):
+        main(["ninja-report", str(tmp_path / "missing")])
+
+
+@pytest.mark.compile
+@pytest.mark.configure
+def test_build_report(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    if shutil.which("ninja") is None:
+        pytest.skip("Ninja needed")
+    monkeypatch.setenv("CMAKE_GENERATOR", "Ninja")
+    monkeypatch.chdir(SIMPLEST)
+    report_json = tmp_path / "report.json"
+    build_wheel(
+        str(tmp_path / "dist"),
+        config_settings={
+            "build.report": "true",
+            "build.report-json": str(report_json),
+        },
+    )
+
+    assert "Build report:" in capsys.readouterr().out
+    data = json.loads(report_json.read_text())
+    assert any("module.c" in s["output"] for s in data["slowest"])
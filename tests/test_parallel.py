@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+import scikit_build_core.builder.parallel
+from scikit_build_core.builder.parallel import (
+    get_available_memory,
+    get_cpu_count,
+    get_parallel_level,
+    parse_size,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.mark.parametrize(
+    ("value", "answer"),
+    [
+        ("1024", 1024),
+        ("2K", 2048),
+        ("512M", 512 * 1024**2),
+        ("1.5G", 3 * 1024**3 // 2),
+        ("2GB", 2 * 1024**3),
+        ("2 GiB", 2 * 1024**3),
+    ],
+)
+def test_parse_size(value: str, answer: int) -> None:
+    assert parse_size(value) == answer
+
+
+def test_parse_size_invalid() -> None:
+    with pytest.raises(ValueError, match="Invalid size"):
+        parse_size("lots")
+
+
+@pytest.fixture
+def fake_cgroup(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    cgroup_root = tmp_path / "cgroup"
+    job_dir = cgroup_root / "job"
+    job_dir.mkdir(parents=True)
+    job_dir.joinpath("cpu.max").write_text("300000 100000\n")
+    job_dir.joinpath("memory.max").write_text(f"{8 * 1024**3}\n")
+    job_dir.joinpath("memory.current").write_text(f"{2 * 1024**3}\n")
+    cgroup_root.joinpath("cpu.max").write_text("max 100000\n")
+
+    proc_cgroup = tmp_path / "proc_cgroup"
+    proc_cgroup.write_text("0::/job\n")
+    meminfo = tmp_path / "meminfo"
+    meminfo.write_text(
+        f"MemTotal: {64 * 1024**2} kB\nMemAvailable: {32 * 1024**2} kB\n"
+    )
+
+    monkeypatch.setattr(scikit_build_core.builder.parallel, "CGROUP_ROOT", cgroup_root)
+    monkeypatch.setattr(
+        scikit_build_core.builder.parallel, "PROC_SELF_CGROUP", proc_cgroup
+    )
+    monkeypatch.setattr(scikit_build_core.builder.parallel, "PROC_MEMINFO", meminfo)
+    monkeypatch.setattr("sys.platform", "linux")
+    monkeypatch.setattr("os.sched_getaffinity", lambda _: set(range(16)), raising=False)
+    return cgroup_root
+
+
+def test_cgroup_limits(fake_cgroup: Path) -> None:
+    assert get_cpu_count() == 3
+    assert get_available_memory() == 6 * 1024**3
+
+    fake_cgroup.joinpath("job/memory.max").write_text("max\n")
+    assert get_available_memory() == 32 * 1024**3
+
+
+@pytest.mark.usefixtures("fake_cgroup")
+@pytest.mark.parametrize(
+    ("setting", "answer"),
+    [("", None), ("7", 7), ("0", 1), ("auto", 3), ("4G", 1), ("3G", 2)],
+)
+def test_get_parallel_level(setting: str, answer: int | None) -> None:
+    assert get_parallel_level(setting) == answer
@@ -1,5 +1,8 @@
+import sys
 from pathlib import Path
 
+import pytest
+
 from scikit_build_core.build._scripts import process_script_dir
 
 
@@ -56,3 +59,24 @@ def test_script_dir(tmp_path: Path) -> None:
         script_7.read_text(encoding="utf-8")
         == "#!/usr/bin/env other\n\nprint('hello world')"
     )
+
+
+@pytest.mark.skipif(sys.platform.startswith("win"), reason="Needs symlinks")
+def test_script_dir_linked(tmp_path: Path) -> None:
+    source = tmp_path / "source"
+    source.write_text("#!/usr/bin/env python3\n\nprint('hello world')")
+    source.chmod(0o755)
+    script_dir = tmp_path / "scripts"
+    script_dir.mkdir()
+    script = script_dir / "script"
+    script.symlink_to(source)
+
+    process_script_dir(script_dir)
+
+    assert not script.is_symlink()
+    assert script.read_text(encoding="utf-8") == "#!python\n\nprint('hello world')"
+    assert script.stat().st_mode & 0o777 == 0o755
+    assert (
+        source.read_text(encoding="utf-8")
+        == "#!/usr/bin/env python3\n\nprint('hello world')"
+    )
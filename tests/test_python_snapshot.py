@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from scikit_build_core.builder.python_snapshot import (
+    SNAPSHOT_FILE,
+    PythonSnapshot,
+    get_python_snapshot,
+)
+from scikit_build_core.builder.sysconfig import get_numpy_include_dir
+from scikit_build_core.cmake import CMake
+from scikit_build_core.resources import find_python
+
+
+@pytest.mark.parametrize("core", ["_core", "core"])
+def test_numpy_include_dir_without_import(tmp_path, monkeypatch, core):
+    numpy = tmp_path / "numpy"
+    numpy.mkdir()
+    numpy.joinpath("__init__.py").write_text("raise ImportError('imported')\n")
+    include_dir = numpy / core / "include"
+    include_dir.joinpath("numpy").mkdir(parents=True)
+    include_dir.joinpath("numpy/arrayobject.h").touch()
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "numpy", raising=False)
+
+    assert get_numpy_include_dir() == include_dir
+    assert "numpy" not in sys.modules
+
+
+def test_snapshot_cached(tmp_path):
+    snapshot = get_python_snapshot(tmp_path)
+    assert snapshot.executable == sys.executable
+    assert snapshot.version == tuple(sys.version_info[:3])
+
+    # The stored snapshot is used while the key matches
+    snapshot_file = tmp_path / SNAPSHOT_FILE
+    data = json.loads(snapshot_file.read_text(encoding="utf-8"))
+    data["snapshot"]["soabi"] = "stored"
+    snapshot_file.write_text(json.dumps(data), encoding="utf-8")
+    assert get_python_snapshot(tmp_path).soabi == "stored"
+
+    data["key"]["stat"] = [0, 0]
+    snapshot_file.write_text(json.dumps(data), encoding="utf-8")
+    assert get_python_snapshot(tmp_path) == snapshot
+
+
+@pytest.mark.configure
+def test_snapshot_matches_find_python(tmp_path):
+    snapshot = PythonSnapshot.compute()
+    if snapshot.interpreter_properties is None:
+        pytest.skip("Interpreter properties are not seeded for this interpreter")
+
+    tmp_path.joinpath("CMakeLists.txt").write_text(
+        "cmake_minimum_required(VERSION 3.15)\n"
+        "project(snapshot LANGUAGES NONE)\n"
+        "find_package(Python COMPONENTS Interpreter REQUIRED)\n",
+        encoding="utf-8",
+    )
+    cmake = CMake.default_search()
+    fp_dir = Path(find_python.__file__).parent.resolve()
+    subprocess.run(
+        [
+            str(cmake.cmake_path),
+            "-S",
+            str(tmp_path),
+            "-B",
+            str(tmp_path / "build"),
+            f"-DPython_EXECUTABLE={sys.executable}",
+            f"-DCMAKE_MODULE_PATH={fp_dir.as_posix()}",
+        ],
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+    cache = tmp_path.joinpath("build/CMakeCache.txt").read_text(encoding="utf-8")
+    prefix = "_Python_INTERPRETER_PROPERTIES:INTERNAL="
+    (line,) = (line for line in cache.splitlines() if line.startswith(prefix))
+    assert line[len(prefix) :] == snapshot.interpreter_properties
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import os
+import signal
+import subprocess
+import sys
+import time
+import zipfile
+from pathlib import Path
+
+import pytest
+
+import scikit_build_core.program_search
+from scikit_build_core.program_search import get_ninja_program
+from scikit_build_core.server import _check, _compatibility, delegate
+
+DIR = Path(__file__).parent.resolve()
+SIMPLEST = DIR / "packages/simplest_c"
+
+pytestmark = pytest.mark.skipif(
+    sys.platform.startswith("win"), reason="Unix sockets and fork required"
+)
+
+
+def test_delegate_without_server(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("SKBUILD_SERVER", str(tmp_path / "missing.sock"))
+    assert delegate("build_wheel", str(tmp_path)) is None
+
+    # Not a socket
+    tmp_path.joinpath("file.sock").touch()
+    monkeypatch.setenv("SKBUILD_SERVER", str(tmp_path / "file.sock"))
+    assert delegate("build_wheel", str(tmp_path)) is None
+
+    monkeypatch.setenv("SKBUILD_SERVER", "0")
+    assert delegate("build_wheel", str(tmp_path)) is None
+
+
+def test_check_request():
+    request = {"hook": "build_wheel", "compatibility": _compatibility()}
+    assert _check(request) is None
+    assert _check({**request, "hook": "os.system"}) == "invalid request"
+    assert _check(None) == "invalid request"
+
+    other = {**_compatibility(), "scikit-build-core": "0.0.1"}
+    assert _check({**request, "compatibility": other}) == "different scikit-build-core"
+
+
+def test_probe_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, fp):
+    ninja = tmp_path / "ninja"
+    ninja.touch()
+    fp.register([ninja, "--version"], stdout="1.11.1", occurrences=4)
+    monkeypatch.setattr(scikit_build_core.program_search, "_probe_cache", None)
+
+    assert get_ninja_program(ninja).version is not None
+    assert get_ninja_program(ninja).version is not None
+    assert fp.call_count([ninja, "--version"]) == 2
+
+    monkeypatch.setattr(scikit_build_core.program_search, "_probe_cache", {})
+    assert get_ninja_program(ninja).version is not None
+    assert get_ninja_program(ninja).version is not None
+    assert fp.call_count([ninja, "--version"]) == 3
+
+    # Probed again if the program changes
+    ninja.write_text("changed", encoding="utf-8")
+    assert get_ninja_program(ninja).version is not None
+    assert fp.call_count([ninja, "--version"]) == 4
+
+
+@pytest.mark.compile
+@pytest.mark.configure
+def test_server_build(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    socket_path = tmp_path / "server.sock"
+    monkeypatch.setenv("SKBUILD_SERVER", str(socket_path))
+    server = subprocess.Popen(
+        [sys.executable, "-m", "scikit_build_core.server", "--idle-timeout", "60"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+    try:
+        for _ in range(100):
+            if socket_path.exists() or server.poll() is not None:
+                break
+            time.sleep(0.1)
+        assert socket_path.is_socket()
+
+        code = (
+            "import sys; from scikit_build_core.build import build_wheel; "
+            "print('WHEEL', build_wheel(sys.argv[1]))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code, str(tmp_path / "dist")],
+            cwd=SIMPLEST,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        (wheel,) = (tmp_path / "dist").glob("*.whl")
+        assert f"WHEEL {wheel.name}" in result.stdout
+        # The worker writes to the client's output
+        assert "Created" in result.stdout
+        with zipfile.ZipFile(wheel) as zf:
+            assert any(name.startswith("simplest/_module") for name in zf.namelist())
+
+        # Errors exit the client, not the server
+        failed = subprocess.run(
+            [sys.executable, "-c", code, str(tmp_path / "dist")],
+            cwd=SIMPLEST,
+            env={**os.environ, "SKBUILD_CMAKE_VERSION": ">=99"},
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        assert failed.returncode != 0
+        assert "Could not find CMake" in failed.stderr
+        assert server.poll() is None
+    finally:
+        server.send_signal(signal.SIGINT)
+        output = server.communicate(timeout=60)[0]
+
+    assert output.count("build_wheel in") == 2
+    assert not socket_path.exists()
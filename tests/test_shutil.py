@@ -1,16 +1,25 @@
 from __future__ import annotations
 
+import os
 import shutil
 import stat
+import subprocess
 import sys
-from typing import TYPE_CHECKING
+from pathlib import Path
 
 import pytest
 
-from scikit_build_core._shutil import _fix_all_permissions
+from scikit_build_core._shutil import (
+    ResourceLog,
+    Run,
+    _fix_all_permissions,
+    _hardlink_symlinks,
+    _unlink_if_linked,
+    _write_if_changed,
+)
+from scikit_build_core.build import prepare_metadata_for_build_wheel
 
-if TYPE_CHECKING:
-    from pathlib import Path
+DIR = Path(__file__).parent.resolve()
 
 
 def _make_dir_with_ro(tmp_path: Path) -> Path:
@@ -48,3 +57,100 @@ def test_broken_all_permissions(make_dir_with_ro: Path) -> None:
 def test_fix_all_permissions(make_dir_with_ro: Path) -> None:
     _fix_all_permissions(str(make_dir_with_ro))
     shutil.rmtree(make_dir_with_ro)
+
+
+@pytest.mark.skipif(sys.platform.startswith("win"), reason="Needs symlinks")
+def test_hardlink_symlinks(tmp_path: Path) -> None:
+    source = tmp_path / "source"
+    source.mkdir()
+    source.joinpath("file.txt").write_text("hello")
+    install = tmp_path / "install"
+    install.joinpath("nested").mkdir(parents=True)
+    link = install / "nested" / "file.txt"
+    link.symlink_to(source / "file.txt")
+    install.joinpath("dir").symlink_to(source)
+
+    _hardlink_symlinks(install)
+
+    assert not link.is_symlink()
+    assert link.read_text() == "hello"
+    assert link.stat().st_ino == source.joinpath("file.txt").stat().st_ino
+    # Directory links are left alone
+    assert install.joinpath("dir").is_symlink()
+    assert [p.name for p in install.joinpath("nested").iterdir()] == ["file.txt"]
+
+
+@pytest.mark.skipif(sys.platform.startswith("win"), reason="Needs symlinks")
+def test_unlink_if_linked(tmp_path: Path) -> None:
+    original = tmp_path / "original.txt"
+    original.write_text("original")
+    plain = tmp_path / "plain.txt"
+    plain.write_text("plain")
+    symlink = tmp_path / "symlink.txt"
+    symlink.symlink_to(original)
+    hardlink = tmp_path / "hardlink.txt"
+    os.link(original, hardlink)
+
+    _unlink_if_linked(plain)
+    _unlink_if_linked(symlink)
+    _unlink_if_linked(hardlink)
+    assert plain.exists()
+    assert not symlink.exists()
+    assert not hardlink.exists()
+    assert original.read_text() == "original"
+
+
+def test_write_if_changed(tmp_path: Path) -> None:
+    path = tmp_path / "file.txt"
+    assert _write_if_changed(path, "one")
+    os.utime(path, ns=(0, 0))
+
+    assert not _write_if_changed(path, "one")
+    assert path.stat().st_mtime_ns == 0
+
+    assert _write_if_changed(path, "two")
+    assert path.read_text(encoding="utf-8") == "two"
+    assert path.stat().st_mtime_ns != 0
+
+
+def test_run_resource_log(monkeypatch: pytest.MonkeyPatch, capsys) -> None:
+    resource_log = ResourceLog()
+    monkeypatch.setattr(Run, "resource_log", resource_log)
+    code = "x = bytearray(200 * 2**20); import time; time.sleep(0.1)"
+
+    with resource_log.track_phase("build"):
+        Run().capture(sys.executable, "-c", code)
+    with pytest.raises(subprocess.CalledProcessError):
+        Run().capture(sys.executable, "-c", "raise SystemExit(1)")
+
+    first, failed = resource_log.processes
+    assert first.command == f"{Path(sys.executable).name} -c"
+    assert first.phase == "build"
+    assert first.wall >= 0.1
+    assert failed.phase == ""
+    if sys.platform.startswith("win"):
+        assert first.user is None
+        assert first.peak_rss is None
+    else:
+        assert first.user is not None
+        assert first.sys is not None
+        assert first.peak_rss is None or first.peak_rss >= 200 * 2**20
+        assert resource_log.python_peak_rss["build"] > 0
+
+    resource_log.print_summary()
+    assert "Resource usage" in capsys.readouterr().out
+
+
+def test_resource_log_per_build(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    old_log = ResourceLog()
+    monkeypatch.setattr(Run, "resource_log", old_log)
+    Run().capture(sys.executable, "-c", "pass")
+    monkeypatch.chdir(DIR / "packages/simplest_c")
+
+    # A long-lived process (build server, batch builder) runs many builds
+    prepare_metadata_for_build_wheel(str(tmp_path))
+    assert Run.resource_log is not old_log
+    assert len(old_log.processes) == 1
+    assert old_log.processes[0] not in Run.resource_log.processes
@@ -1,4 +1,8 @@
+import os
+import re
 import shutil
+import subprocess
+import sys
 import tarfile
 import zipfile
 from pathlib import Path
@@ -11,6 +15,7 @@ from pathutils import contained
 
 DIR = Path(__file__).parent.resolve()
 SIMPLEST = DIR / "packages/simplest_c"
+INSTALL_RPATH = DIR / "packages/install_rpath"
 
 
 def test_pep517_sdist(tmp_path, monkeypatch):
@@ -158,3 +163,182 @@ def test_pep517_wheel_incexl(tmp_path, monkeypatch, virtualenv):
         "from simplest import square; print(square(2))",
     )
     assert version == "4.0"
+
+
+@pytest.mark.compile
+@pytest.mark.configure
+@pytest.mark.skipif(
+    sys.platform.startswith("win"), reason="Relocatable builds need symlinks"
+)
+def test_relocatable_build_dir(tmp_path, monkeypatch):
+    build_dir = tmp_path / "build"
+    config = {"build-dir": str(build_dir), "build.relocatable": "true"}
+
+    # Simulates pip unpacking the SDist to a new directory each time
+    shutil.copytree(SIMPLEST, tmp_path / "src1", ignore=shutil.ignore_patterns("dist"))
+    monkeypatch.chdir(tmp_path / "src1")
+    build_wheel(str(tmp_path / "dist1"), config_settings=config)
+    (obj,) = build_dir.glob("**/module.c.o")
+    mtime = obj.stat().st_mtime_ns
+
+    shutil.copytree(SIMPLEST, tmp_path / "src2", ignore=shutil.ignore_patterns("dist"))
+    monkeypatch.chdir(tmp_path / "src2")
+    build_wheel(str(tmp_path / "dist2"), config_settings=config)
+
+    assert obj.stat().st_mtime_ns == mtime
+    assert (build_dir / ".skbuild-stable/source").resolve() == tmp_path / "src2"
+    (wheel,) = (tmp_path / "dist2").glob("simplest-0.0.1-*.whl")
+    with zipfile.ZipFile(wheel) as zf:
+        assert any(n.startswith("simplest/_module") for n in zf.namelist())
+
+
+@pytest.mark.compile
+@pytest.mark.configure
+@pytest.mark.skipif(
+    sys.platform.startswith("win"), reason="Relocatable builds need symlinks"
+)
+def test_relocatable_changed_source(tmp_path, monkeypatch):
+    build_dir = tmp_path / "build"
+    config = {"build-dir": str(build_dir), "build.relocatable": "true"}
+
+    def module_binary(dist: Path) -> bytes:
+        (wheel,) = dist.glob("simplest-0.0.1-*.whl")
+        with zipfile.ZipFile(wheel) as zf:
+            (name,) = (
+                n
+                for n in zf.namelist()
+                if n.startswith("simplest/_module") and not n.endswith(".pyi")
+            )
+            return zf.read(name)
+
+    shutil.copytree(SIMPLEST, tmp_path / "src1", ignore=shutil.ignore_patterns("dist"))
+    monkeypatch.chdir(tmp_path / "src1")
+    build_wheel(str(tmp_path / "dist1"), config_settings=config)
+
+    # A new SDist with a changed file, with the same (normalized) time
+    shutil.copytree(SIMPLEST, tmp_path / "src2", ignore=shutil.ignore_patterns("dist"))
+    module = tmp_path / "src2/src/module.c"
+    stat = module.stat()
+    module.write_text(
+        module.read_text(encoding="utf-8").replace("x * x", "x * x + 1"),
+        encoding="utf-8",
+    )
+    os.utime(module, ns=(stat.st_atime_ns, 0))
+    monkeypatch.chdir(tmp_path / "src2")
+    build_wheel(str(tmp_path / "dist2"), config_settings=config)
+
+    assert module_binary(tmp_path / "dist1") != module_binary(tmp_path / "dist2")
+
+
+@pytest.mark.compile
+@pytest.mark.configure
+@pytest.mark.skipif(sys.platform.startswith("win"), reason="Needs symlinks")
+@pytest.mark.parametrize("mode", ["symlink", "hardlink"])
+def test_install_mode(tmp_path, monkeypatch, mode):
+    build_dir = tmp_path / "build"
+    shutil.copytree(SIMPLEST, tmp_path / "src", ignore=shutil.ignore_patterns("dist"))
+    monkeypatch.chdir(tmp_path / "src")
+
+    contents = {}
+    for install_mode in ("copy", mode):
+        dist = tmp_path / f"dist-{install_mode}"
+        config = {
+            "build-dir": str(build_dir),
+            "install.mode": install_mode,
+            "install.strip": "false",
+        }
+        wheel = dist / build_wheel(str(dist), config_settings=config)
+        with zipfile.ZipFile(wheel) as zf:
+            contents[install_mode] = {
+                n: zf.read(n) for n in zf.namelist() if ".dist-info/" not in n
+            }
+
+    assert contents[mode] == contents["copy"]
+    assert any(n.startswith("simplest/_module") for n in contents[mode])
+    # The build directory outputs are still there after the staging dir is gone
+    assert list(build_dir.glob("_module*"))
+
+
+def _runpath(binary: Path) -> str:
+    dynamic = subprocess.run(
+        ["readelf", "-d", str(binary)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    match = re.search(r"\((?:RUNPATH|RPATH)\)\s+Library r\w*path: \[(.*)\]", dynamic)
+    return match.group(1) if match else ""
+
+
+@pytest.mark.compile
+@pytest.mark.configure
+@pytest.mark.skipif(
+    not sys.platform.startswith("linux") or not shutil.which("readelf"),
+    reason="Reads ELF RUNPATHs",
+)
+@pytest.mark.parametrize("mode", ["symlink", "hardlink"])
+def test_install_mode_rpath(tmp_path, monkeypatch, mode):
+    build_dir = tmp_path / "build"
+    shutil.copytree(INSTALL_RPATH, tmp_path / "src")
+    monkeypatch.chdir(tmp_path / "src")
+
+    runpaths = {}
+    for install_mode in ("copy", mode):
+        dist = tmp_path / f"dist-{install_mode}"
+        config = {
+            "build-dir": str(build_dir),
+            "install.mode": install_mode,
+            "install.strip": "false",
+        }
+        wheel = dist / build_wheel(str(dist), config_settings=config)
+        with zipfile.ZipFile(wheel) as zf:
+            (module,) = (n for n in zf.namelist() if "/_module" in n)
+            zf.extract(module, dist)
+        runpaths[install_mode] = _runpath(dist / module)
+
+    # CMake only sets the install RPATH on copies, linked modules would keep
+    # the build directory RPATH
+    assert runpaths[mode] == runpaths["copy"] == "$ORIGIN"
+
+
+@pytest.mark.compile
+@pytest.mark.configure
+def test_unchanged_rebuild(tmp_path, monkeypatch, capfd):
+    build_dir = tmp_path / "build"
+    src = tmp_path / "src"
+    shutil.copytree(SIMPLEST, src, ignore=shutil.ignore_patterns("dist"))
+    with src.joinpath("pyproject.toml").open("a", encoding="utf-8") as f:
+        f.write(
+            "\n[[tool.scikit-build.generate]]\n"
+            'path = "version.h"\n'
+            'template = "#define VERSION \\"${version}\\"\\n"\n'
+            'location = "build"\n'
+        )
+    with src.joinpath("CMakeLists.txt").open("a", encoding="utf-8") as f:
+        f.write(
+            "\ntarget_include_directories(_module PRIVATE ${CMAKE_CURRENT_BINARY_DIR})\n"
+        )
+    module_c = src / "src/module.c"
+    module_c.write_text(
+        '#include "version.h"\n' + module_c.read_text(encoding="utf-8"),
+        encoding="utf-8",
+    )
+    monkeypatch.chdir(src)
+    config = {"build-dir": str(build_dir)}
+
+    build_wheel(str(tmp_path / "dist1"), config_settings=config)
+    # CMakeInit.txt is not included, it contains the temporary wheel directories
+    generated = {
+        name: build_dir.joinpath(name).stat().st_mtime_ns
+        for name in ("version.h", ".skbuild-info.json")
+    }
+    (obj,) = build_dir.glob("**/module.c.o")
+    mtime = obj.stat().st_mtime_ns
+    capfd.readouterr()
+
+    build_wheel(str(tmp_path / "dist2"), config_settings=config)
+    out = capfd.readouterr().out
+    assert "Building C object" not in out
+    assert obj.stat().st_mtime_ns == mtime
+    for name, file_mtime in generated.items():
+        assert build_dir.joinpath(name).stat().st_mtime_ns == file_mtime, name
@@ -35,8 +35,21 @@ def test_skbuild_settings_default(tmp_path: Path):
     assert settings.cmake.args == []
     assert settings.cmake.define == {}
     assert not settings.build.verbose
+    assert settings.build.parallel == ""
+    assert not settings.search.fetchcontent_cache
+    assert not settings.search.fetchcontent_disconnected
+    assert settings.build.compiler_launcher == ""
+    assert not settings.build.toolchain_cache
+    assert not settings.build_cache.enabled
+    assert settings.build_cache.max_size == "10G"
+    assert settings.build_cache.root == ""
+    assert not settings.build_cache.artifacts
+    assert settings.build_cache.artifacts_max_size == "5G"
+    assert settings.build_cache.artifacts_root == ""
     assert settings.cmake.build_type == "Release"
+    assert settings.cmake.extra_build_types == []
     assert settings.cmake.source_dir == Path()
+    assert not settings.cmake.profile
     assert settings.build.targets == []
     assert settings.logging.level == "WARNING"
     assert settings.sdist.include == []
@@ -61,6 +74,7 @@ def test_skbuild_settings_default(tmp_path: Path):
     assert settings.build.tool_args == []
     assert settings.install.components == []
     assert settings.install.strip
+    assert settings.install.mode == "copy"
     assert settings.generate == []
     assert not settings.fail
     assert settings.messages.after_failure == ""
@@ -78,6 +92,7 @@ def test_skbuild_settings_envvar(tmp_path: Path, monkeypatch: pytest.MonkeyPatch
     monkeypatch.setenv("SKBUILD_CMAKE_ARGS", "-DFOO=BAR;-DBAR=FOO")
     monkeypatch.setenv("SKBUILD_CMAKE_DEFINE", "a=1;b=2")
     monkeypatch.setenv("SKBUILD_CMAKE_BUILD_TYPE", "Debug")
+    monkeypatch.setenv("SKBUILD_CMAKE_EXTRA_BUILD_TYPES", "Release;RelWithDebInfo")
     monkeypatch.setenv("SKBUILD_CMAKE_SOURCE_DIR", "a/b/c")
     monkeypatch.setenv("SKBUILD_LOGGING_LEVEL", "DEBUG")
     monkeypatch.setenv("SKBUILD_SDIST_INCLUDE", "a;b; c")
@@ -98,6 +113,7 @@ def test_skbuild_settings_envvar(tmp_path: Path, monkeypatch: pytest.MonkeyPatch
     monkeypatch.setenv("SKBUILD_EDITABLE_REBUILD", "True")
     monkeypatch.setenv("SKBUILD_EDITABLE_VERBOSE", "False")
     monkeypatch.setenv("SKBUILD_BUILD_VERBOSE", "TRUE")
+    monkeypatch.setenv("SKBUILD_BUILD_PARALLEL", "auto")
     monkeypatch.setenv("SKBUILD_BUILD_TARGETS", "a;b;c")
     monkeypatch.setenv("SKBUILD_BUILD_TOOL_ARGS", "a;b")
     monkeypatch.setenv("SKBUILD_INSTALL_COMPONENTS", "a;b;c")
@@ -124,6 +140,7 @@ def test_skbuild_settings_envvar(tmp_path: Path, monkeypatch: pytest.MonkeyPatch
     assert settings.cmake.args == ["-DFOO=BAR", "-DBAR=FOO"]
     assert settings.cmake.define == {"a": "1", "b": "2"}
     assert settings.cmake.build_type == "Debug"
+    assert settings.cmake.extra_build_types == ["Release", "RelWithDebInfo"]
     assert settings.cmake.source_dir == Path("a/b/c")
     assert not settings.ninja.make_fallback
     assert settings.logging.level == "DEBUG"
@@ -147,6 +164,7 @@ def test_skbuild_settings_envvar(tmp_path: Path, monkeypatch: pytest.MonkeyPatch
     assert settings.editable.rebuild
     assert not settings.editable.verbose
     assert settings.build.verbose
+    assert settings.build.parallel == "auto"
     assert settings.build.targets == ["a", "b", "c"]
     assert settings.build.tool_args == ["a", "b"]
     assert settings.install.components == ["a", "b", "c"]
@@ -175,6 +193,7 @@ def test_skbuild_settings_config_settings(
         "cmake.define.a": "1",
         "cmake.define.b": "2",
         "cmake.build-type": "Debug",
+        "cmake.extra-build-types": ["Release"],
         "cmake.source-dir": "a/b/c",
         "logging.level": "INFO",
         "sdist.include": ["a", "b", "c"],
@@ -219,6 +238,7 @@ def test_skbuild_settings_config_settings(
     assert settings.cmake.define == {"a": "1", "b": "2"}
     assert settings.build.verbose
     assert settings.cmake.build_type == "Debug"
+    assert settings.cmake.extra_build_types == ["Release"]
     assert settings.cmake.source_dir == Path("a/b/c")
     assert settings.logging.level == "INFO"
     assert settings.sdist.include == ["a", "b", "c"]
@@ -266,6 +286,7 @@ def test_skbuild_settings_pyproject_toml(
             cmake.args = ["-DFOO=BAR", "-DBAR=FOO"]
             cmake.define = {a = "1", b = "2"}
             cmake.build-type = "Debug"
+            cmake.extra-build-types = ["Release", "MinSizeRel"]
             cmake.source-dir = "a/b/c"
             logging.level = "ERROR"
             sdist.include = ["a", "b", "c"]
@@ -319,6 +340,7 @@ def test_skbuild_settings_pyproject_toml(
     assert settings.cmake.args == ["-DFOO=BAR", "-DBAR=FOO"]
     assert settings.cmake.define == {"a": "1", "b": "2"}
     assert settings.cmake.build_type == "Debug"
+    assert settings.cmake.extra_build_types == ["Release", "MinSizeRel"]
     assert settings.cmake.source_dir == Path("a/b/c")
     assert settings.logging.level == "ERROR"
     assert settings.sdist.include == ["a", "b", "c"]
@@ -765,3 +787,28 @@ def test_skbuild_settings_cmake_define_list():
         "NESTED_LIST": r"Apple;Lemon\;Lime;Banana",
         "ONE_LEVEL_LIST": "Foo;Bar;ExceptionallyLargeListEntryThatWouldOverflowTheLine;Baz",
     }
+
+
+@pytest.mark.parametrize("parallel", ["", "4", "auto", "AUTO", "2G", "512MiB"])
+def test_skbuild_settings_parallel_valid(tmp_path: Path, parallel: str):
+    pyproject_toml = tmp_path / "pyproject.toml"
+    pyproject_toml.write_text("", encoding="utf-8")
+
+    settings_reader = SettingsReader.from_file(
+        pyproject_toml, {"build.parallel": parallel}
+    )
+    assert settings_reader.settings.build.parallel == parallel
+
+
+def test_skbuild_settings_parallel_invalid(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+):
+    pyproject_toml = tmp_path / "pyproject.toml"
+    pyproject_toml.write_text("", encoding="utf-8")
+
+    with pytest.raises(SystemExit):
+        SettingsReader.from_file(pyproject_toml, {"build.parallel": "abc"})
+
+    ex = capsys.readouterr().out
+    assert "build.parallel" in ex
+    assert "'abc'" in ex
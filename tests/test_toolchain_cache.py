@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import json
+import re
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+from packaging.version import Version
+
+from scikit_build_core.build import build_wheel
+from scikit_build_core.builder.toolchain_cache import (
+    ENTRY_INFO,
+    compiler_checks_failed,
+    configure_log_offsets,
+    save_toolchain,
+    seed_toolchain,
+    toolchain_key,
+)
+from scikit_build_core.cmake import CMake
+
+DIR = Path(__file__).parent.resolve()
+SIMPLEST = DIR / "packages/simplest_c"
+
+
+def make_configured(tmp_path: Path) -> tuple[Path, Path]:
+    compiler = tmp_path / "bin/cc"
+    compiler.parent.mkdir()
+    compiler.write_text("compiler")
+    build_dir = tmp_path / "build"
+    platform_dir = build_dir / "CMakeFiles/3.25.1"
+    platform_dir.mkdir(parents=True)
+    platform_dir.joinpath("CMakeSystem.cmake").write_text('set(CMAKE_SYSTEM "Linux")\n')
+    platform_dir.joinpath("CMakeCCompiler.cmake").write_text(
+        f'set(CMAKE_C_COMPILER "{compiler}")\nset(CMAKE_C_COMPILER_ID "GNU")\n'
+    )
+    platform_dir.joinpath("CMakeDetermineCompilerABI_C.bin").write_bytes(b"0")
+    build_dir.joinpath("CMakeCache.txt").write_text(
+        f"CMAKE_C_COMPILER:FILEPATH={compiler}\n"
+        "CMAKE_STRIP:FILEPATH=/usr/bin/strip\n"
+        "CMAKE_EXECUTABLE_FORMAT:INTERNAL=ELF\n"
+        f"SOME_PROJECT_VAR:PATH={build_dir}\n"
+    )
+    return build_dir, compiler
+
+
+def test_toolchain_key():
+    cmake = CMake(version=Version("3.25.1"), cmake_path=Path("cmake"))
+
+    def key(**kwargs: object) -> str:
+        opts = {"generator": "Ninja", "env": {}, "defines": {}, "cmake_args": []}
+        opts.update(kwargs)
+        return toolchain_key(cmake, **opts)  # type: ignore[arg-type]
+
+    base = key()
+    assert key(env={"PATH": "/other"}) == base
+    assert key(defines={"CMAKE_INSTALL_PREFIX": "/opt/x"}) == base
+    assert key(cmake_args=["-DSOME_OPTION=ON"]) == base
+
+    assert key(generator="Unix Makefiles") != base
+    assert key(env={"CC": "clang"}) != base
+    assert key(env={"CFLAGS": "-O3"}) != base
+    assert key(defines={"CMAKE_C_FLAGS": "-O3"}) != base
+    assert key(cmake_args=["-DCMAKE_CXX_COMPILER:FILEPATH=clang++"]) != base
+    assert key(cmake_args=["-T", "ClangCL"]) != base
+    other_cmake = CMake(version=Version("3.26.0"), cmake_path=Path("cmake"))
+    assert (
+        toolchain_key(other_cmake, generator="Ninja", env={}, defines={}, cmake_args=[])
+        != base
+    )
+
+
+def test_save_and_seed(tmp_path: Path):
+    build_dir, compiler = make_configured(tmp_path)
+    entry = tmp_path / "cache/entry"
+    save_toolchain(build_dir, entry, version="3.25.1")
+
+    info = json.loads(entry.joinpath(ENTRY_INFO).read_text())
+    assert info["platform_dir"] == "3.25.1"
+    assert info["files"] == ["CMakeCCompiler.cmake", "CMakeSystem.cmake"]
+    assert list(info["compilers"]) == [str(compiler)]
+
+    env = {"PATH": ""}
+    new_build_dir = tmp_path / "new_build"
+    assert seed_toolchain(new_build_dir, entry, env=env)
+    seeded = new_build_dir / "CMakeFiles/3.25.1"
+    assert sorted(p.name for p in seeded.iterdir()) == info["files"]
+    cache = new_build_dir.joinpath("CMakeCache.txt").read_text()
+    assert "CMAKE_PLATFORM_INFO_INITIALIZED:INTERNAL=1" in cache
+    assert "CMAKE_STRIP:FILEPATH=/usr/bin/strip" in cache
+    assert "SOME_PROJECT_VAR" not in cache
+
+    # Never touches a configured build directory
+    assert not seed_toolchain(build_dir, entry, env=env)
+
+    # A changed compiler invalidates the entry
+    compiler.write_text("new compiler")
+    assert not seed_toolchain(tmp_path / "other_build", entry, env=env)
+    assert not entry.exists()
+
+
+def test_save_refers_to_build_dir(tmp_path: Path):
+    build_dir, _ = make_configured(tmp_path)
+    build_dir.joinpath("CMakeFiles/3.25.1/CMakeSystem.cmake").write_text(
+        f'include("{build_dir.resolve()}/toolchain.cmake")\n'
+    )
+    entry = tmp_path / "cache/entry"
+    save_toolchain(build_dir, entry, version="3.25.1")
+    assert not entry.exists()
+
+
+@pytest.mark.compile
+@pytest.mark.configure
+def test_toolchain_cache_build(tmp_path, monkeypatch, capfd):
+    toolchain_root = tmp_path / "toolchain"
+    monkeypatch.setattr(
+        "scikit_build_core.builder.builder.get_toolchain_root", lambda: toolchain_root
+    )
+    shutil.copytree(SIMPLEST, tmp_path / "src", ignore=shutil.ignore_patterns("dist"))
+    monkeypatch.chdir(tmp_path / "src")
+    config = {"build.toolchain-cache": "true"}
+
+    build_wheel(str(tmp_path / "dist1"), config_settings=config)
+    assert "compiler identification" in capfd.readouterr().out
+    (entry,) = toolchain_root.iterdir()
+
+    build_wheel(str(tmp_path / "dist2"), config_settings=config)
+    out = capfd.readouterr().out
+    assert "compiler identification" not in out
+    assert "Configure failed" not in out
+
+    (wheel,) = (tmp_path / "dist2").glob("simplest-0.0.1-*.whl")
+    assert wheel.stat().st_size > 0
+    assert entry.is_dir()
+
+
+@pytest.mark.compile
+@pytest.mark.configure
+@pytest.mark.skipif(sys.platform.startswith("win"), reason="Uses a shell script")
+def test_toolchain_cache_rejected(tmp_path, monkeypatch, capfd, caplog):
+    toolchain_root = tmp_path / "toolchain"
+    monkeypatch.setattr(
+        "scikit_build_core.builder.builder.get_toolchain_root", lambda: toolchain_root
+    )
+    shutil.copytree(SIMPLEST, tmp_path / "src", ignore=shutil.ignore_patterns("dist"))
+    monkeypatch.chdir(tmp_path / "src")
+    with Path("CMakeLists.txt").open("a", encoding="utf-8") as f:
+        f.write(
+            "include(CheckCSourceCompiles)\n"
+            'check_c_source_compiles("int main(void) { return 0; }" HAVE_CC)\n'
+            'if(NOT HAVE_CC)\n  message(FATAL_ERROR "no working compiler")\nendif()\n'
+        )
+    config = {"build.toolchain-cache": "true"}
+
+    build_wheel(str(tmp_path / "dist1"), config_settings=config)
+    (entry,) = toolchain_root.iterdir()
+
+    # Point the cached detection at a compiler that fails the project's
+    # checks, the configure falls back to a full detection
+    broken = tmp_path / "broken-cc"
+    broken.write_text("#!/bin/sh\nexit 1\n", encoding="utf-8")
+    broken.chmod(0o755)
+    for path in entry.glob("CMake*Compiler.cmake"):
+        text = path.read_text(encoding="utf-8")
+        text = re.sub(r'(set\(CMAKE_\w+_COMPILER ")[^"]*', rf"\g<1>{broken}", text)
+        text = re.sub(r"set\(CMAKE_\w+_(?:COMPILER_WORKS|ABI_COMPILED) .*", "", text)
+        path.write_text(text, encoding="utf-8")
+    info_file = entry / ENTRY_INFO
+    info = json.loads(info_file.read_text(encoding="utf-8"))
+    info["cache"] = [
+        re.sub(r"^(CMAKE_\w+_COMPILER:\w+=).*", rf"\g<1>{broken}", line)
+        for line in info["cache"]
+    ]
+    info_file.write_text(json.dumps(info), encoding="utf-8")
+    capfd.readouterr()
+
+    build_wheel(str(tmp_path / "dist2"), config_settings=config)
+    out = capfd.readouterr().out
+    assert "Configure failed compiler checks" in caplog.text
+    assert "compiler identification" in out
+    assert list((tmp_path / "dist2").glob("simplest-0.0.1-*.whl"))
+    # The broken entry was replaced
+    for path in entry.glob("CMake*Compiler.cmake"):
+        assert "broken" not in path.read_text(encoding="utf-8")
+
+
+def test_compiler_checks_failed(tmp_path: Path):
+    log = tmp_path / "CMakeFiles/CMakeConfigureLog.yaml"
+    log.parent.mkdir()
+    log.write_text("---\nevents:\n  -\n    buildResult:\n      exitCode: 1\n")
+    offsets = configure_log_offsets(tmp_path)
+    assert not compiler_checks_failed(tmp_path, offsets)
+
+    with log.open("a") as f:
+        f.write("  -\n    buildResult:\n      exitCode: 0\n")
+    assert not compiler_checks_failed(tmp_path, offsets)
+
+    with log.open("a") as f:
+        f.write("  -\n    buildResult:\n      exitCode: 1\n")
+    assert compiler_checks_failed(tmp_path, offsets)
+
+    error_log = tmp_path / "CMakeFiles/CMakeError.log"
+    error_log.write_text("Determining if the C compiler works failed\n")
+    assert compiler_checks_failed(tmp_path, {})
+
+
+@pytest.mark.compile
+@pytest.mark.configure
+def test_toolchain_cache_project_error(tmp_path, monkeypatch, caplog):
+    toolchain_root = tmp_path / "toolchain"
+    monkeypatch.setattr(
+        "scikit_build_core.builder.builder.get_toolchain_root", lambda: toolchain_root
+    )
+    shutil.copytree(SIMPLEST, tmp_path / "src", ignore=shutil.ignore_patterns("dist"))
+    monkeypatch.chdir(tmp_path / "src")
+    config = {"build.toolchain-cache": "true"}
+
+    build_wheel(str(tmp_path / "dist1"), config_settings=config)
+    (entry,) = toolchain_root.iterdir()
+
+    # An error in the project is not blamed on the cached toolchain
+    with Path("CMakeLists.txt").open("a", encoding="utf-8") as f:
+        f.write('message(FATAL_ERROR "project error")\n')
+
+    with pytest.raises(SystemExit):
+        build_wheel(str(tmp_path / "dist2"), config_settings=config)
+    assert "retrying" not in caplog.text
+    assert entry.is_dir()